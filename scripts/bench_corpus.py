@@ -0,0 +1,406 @@
+"""
+Replays a corpus of WAV files through the recorder and every transcription
+path, headlessly, and reports per path:
+  - real-time factor (wall time from first sample to final text / audio time)
+  - latency percentiles from the session traces (see src/core/tracing.py;
+    release is the end of the file, paste is when the final text is ready)
+  - ring overruns and samples dropped
+  - peak RSS of the process so far (a high-water mark, so it only grows)
+  - word error rate against reference transcripts
+
+Each file is played into AudioRecorder through ReplayInputStream, in real
+time (--speed 1) or as fast as the pipeline takes it (--speed 0), and then
+handled the way the app handles a dictation:
+  batch      recorded file uploaded to whisper-1 (plus speculative chunks), then refined
+  streaming  VAD segments transcribed by whisper-1, then refined
+  realtime   VAD segments over the realtime websocket (gpt-4o-transcribe)
+  local      the local Parakeet engine (needs sherpa-onnx and the downloaded model)
+
+References are <name>.txt next to <name>.wav; files without one count for
+everything but WER. The cloud paths talk to the stubs in
+fake_openai_server.py unless --live is given (then the configured API and
+key are used, for real speech corpora). Without a corpus directory a
+synthetic one of tone bursts is generated, which the stubs "transcribe"
+exactly, so WER there counts audio that was dropped or split.
+
+Compare runs with --baseline: the previous --output file's key metrics are
+printed next to this run's.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_corpus.py [corpus_dir] [--paths batch,streaming,realtime,local] \
+        [--speed 1] [--latency-ms 300] [--json] [--output results.json] [--baseline old.json]
+"""
+import argparse
+import contextlib
+import glob
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+
+from scripts.check_chunked_transcription import SAMPLE_RATE, synthetic_dictation
+from scripts.fake_openai_server import FakeOpenAIServer, FakeRealtimeServer, serve_websocket
+from src.config import current_config
+from src.core.ai import AIProcessor
+from src.core.encoder import choose_upload_encoding, encode_pcm16, read_pcm16
+from src.core.realtime import realtime_pool
+from src.core.recorder import AudioRecorder
+from src.core.replay import ReplayInputStream
+from src.core.resampler import resample_pcm16
+from src.core.tracing import latency_stats, tracer
+from src.core.transcription import BatchTranscription, StreamingTranscription, webrtcvad
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+PATHS = ("batch", "streaming", "realtime", "local")
+PATH_MODELS = {
+    "batch": "whisper-1",
+    "streaming": "whisper-1",
+    "realtime": "gpt-4o-transcribe",
+    "local": "local-parakeet",
+}
+# Stages shown in the summary table (all of them go to the JSON)
+SUMMARY_STAGES = ("release_to_first_text", "release_to_transcript", "release_to_paste")
+WORD_RE = re.compile(r"[\w']+")
+
+class EnergyVad:
+    """RMS threshold with webrtcvad's is_speech() signature, for machines without webrtcvad."""
+
+    def __init__(self, threshold: float = 0.02):
+        self.threshold = threshold * 32768
+
+    def is_speech(self, frame_bytes, sample_rate):
+        samples = np.frombuffer(frame_bytes, dtype=np.int16).astype(np.float32)
+        return bool(np.sqrt(np.mean(samples ** 2)) > self.threshold)
+
+def word_errors(reference: str, hypothesis: str):
+    """(substitutions + deletions + insertions, reference words) after lowercasing and dropping punctuation."""
+    ref = WORD_RE.findall(reference.lower())
+    hyp = WORD_RE.findall(hypothesis.lower())
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+    return row[-1], len(ref)
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def load_corpus(directory, limit=None):
+    """[(name, int16 samples at SAMPLE_RATE, reference or None)] for every WAV in directory."""
+    clips = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.wav")))[:limit]:
+        pcm, rate = read_pcm16(path)
+        if rate != SAMPLE_RATE:
+            pcm = resample_pcm16(pcm, rate, SAMPLE_RATE)
+        reference = None
+        ref_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(ref_path):
+            with open(ref_path) as f:
+                reference = f.read().strip()
+        clips.append((os.path.basename(path), np.frombuffer(pcm, dtype=np.int16), reference))
+    return clips
+
+def write_synthetic_corpus(directory, count, clip_s):
+    """Tone-burst dictations with pauses long enough for the VAD to close a segment after each word."""
+    pause_s = (current_config.vad_silence_ms / 1000 + 0.2, current_config.vad_silence_ms / 1000 + 0.8)
+    for i in range(count):
+        pcm, words = synthetic_dictation(clip_s / 60, seed=i, pause_s=pause_s)
+        _, data = encode_pcm16(pcm.tobytes(), SAMPLE_RATE, "wav")
+        with open(os.path.join(directory, f"synthetic_{i:02d}.wav"), "wb") as f:
+            f.write(data)
+        with open(os.path.join(directory, f"synthetic_{i:02d}.txt"), "w") as f:
+            f.write(" ".join(words) + "\n")
+
+def load_local_engine():
+    """Builds and warms the local engine, or returns (None, reason) if it can't run here."""
+    try:
+        from src.core.local_engine import LocalParakeetEngine
+        from src.core.model_manager import ModelManager
+    except Exception as e:
+        return None, f"import failed: {e}"
+    if not ModelManager.is_model_ready():
+        return None, "model not downloaded"
+    try:
+        engine = LocalParakeetEngine(
+            ModelManager.get_model_paths(),
+            incremental=current_config.local_incremental,
+            vad_aggressiveness=current_config.vad_aggressiveness,
+            num_threads=current_config.local_num_threads,
+            provider=current_config.local_provider,
+            decoding_method=current_config.local_decoding_method,
+            max_active_paths=current_config.local_max_active_paths,
+        )
+        engine.warm_up()
+    except Exception as e:
+        return None, str(e)
+    return engine, None
+
+def replay_recorder(samples, speed):
+    """An AudioRecorder playing samples, and a dict that gets the stream once it is opened."""
+    opened = {}
+    recorder = None
+
+    def open_stream(**kwargs):
+        # At full speed, hold blocks back instead of overrunning: throughput, not drops, is measured
+        can_write = (lambda n: recorder.ring.free() >= n) if speed <= 0 else None
+        stream = ReplayInputStream(samples, speed=speed, can_write=can_write, **kwargs)
+        opened["stream"] = stream
+        return stream
+
+    recorder = AudioRecorder(SAMPLE_RATE, stream_factory=open_stream)
+    return recorder, opened
+
+def mark_release(recorder, stream):
+    tracer.mark("release", at=stream.finished_at)
+    if recorder.ring.first_write_at is not None:
+        tracer.mark("first_audio", at=recorder.ring.first_write_at)
+
+def run_batch(samples, speed):
+    recorder, opened = replay_recorder(samples, speed)
+    speculative = AIProcessor().open_speculative(SAMPLE_RATE)
+    recorder.start(choose_upload_encoding(), on_frame=speculative.feed if speculative else None)
+    stream = opened["stream"]
+    stream.wait()
+    mark_release(recorder, stream)
+    audio_path = recorder.stop()
+    if not audio_path:
+        if speculative is not None:
+            speculative.cancel()
+        raise ValueError("No audio recorded.")
+    try:
+        text = BatchTranscription(audio_path, speculative).run(on_refine_delta=lambda _: tracer.mark("first_text"))
+    finally:
+        os.remove(audio_path)
+    return text, recorder.ring, stream
+
+def run_streaming(samples, speed, vad, local_engine=None):
+    recorder, opened = replay_recorder(samples, speed)
+    ring = recorder.start_streaming()
+    session = StreamingTranscription(
+        ring, SAMPLE_RATE,
+        vad_silence_ms=current_config.vad_silence_ms,
+        vad_aggressiveness=current_config.vad_aggressiveness,
+        local_engine=local_engine,
+        vad=vad,
+        on_partial=lambda finalized, live: tracer.mark("first_text"),
+    )
+    outcome = {}
+
+    def consume():
+        try:
+            outcome["text"] = session.run()
+        except Exception as e:
+            outcome["error"] = e
+
+    consumer = threading.Thread(target=consume, name="bench-consumer")
+    consumer.start()
+    stream = opened["stream"]
+    stream.wait()
+    mark_release(recorder, stream)
+    recorder.stop_streaming()
+    session.request_stop()
+    consumer.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["text"], ring, stream
+
+def run_clip(path_name, clip, args, vad, local_engine):
+    name, samples, reference = clip
+    trace = tracer.begin(path_name, PATH_MODELS[path_name])
+    row = {"path": path_name, "file": name, "audio_s": round(len(samples) / SAMPLE_RATE, 2)}
+    try:
+        if path_name == "batch":
+            text, ring, stream = run_batch(samples, args.speed)
+        else:
+            text, ring, stream = run_streaming(samples, args.speed, vad, local_engine)
+        tracer.mark("pasted")
+        trace.status = "ok" if text else "empty"
+        row.update({
+            "wall_s": round(time.perf_counter() - stream.started_at, 3),
+            "overruns": ring.overruns,
+            "dropped_samples": ring.dropped_samples,
+        })
+        if reference is not None:
+            row["errors"], row["ref_words"] = word_errors(reference, text)
+        row["text"] = text
+    except Exception as e:
+        trace.status = "error"
+        row["error"] = str(e)
+    row["trace"] = trace.to_record()
+    # Benchmark sessions stay out of the app's trace file
+    tracer.discard()
+    return row
+
+def summarize(rows):
+    ok = [r for r in rows if "error" not in r]
+    audio_s = sum(r["audio_s"] for r in ok)
+    ref_words = sum(r.get("ref_words", 0) for r in ok)
+    stats = latency_stats([r["trace"] for r in rows])
+    return {
+        "files": len(rows),
+        "failed": len(rows) - len(ok),
+        "audio_s": round(audio_s, 2),
+        "wall_s": round(sum(r["wall_s"] for r in ok), 3),
+        "rtf": round(sum(r["wall_s"] for r in ok) / audio_s, 3) if audio_s else None,
+        "wer": round(sum(r.get("errors", 0) for r in ok) / ref_words, 4) if ref_words else None,
+        "overruns": sum(r["overruns"] for r in ok),
+        "dropped_samples": sum(r["dropped_samples"] for r in ok),
+        "latency_ms": {s["stage"]: {k: s[k] for k in ("p50_ms", "p95_ms", "count")} for s in stats["stages"]},
+    }
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              timeout=5, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except Exception:
+        return None
+
+def print_report(result, baseline=None):
+    meta = result["meta"]
+    speed = f"{meta['speed']:g}x" if meta["speed"] else "max"
+    api = "live API" if meta["live"] else f"stubs at {meta['latency_ms']:g}ms"
+    print(f"Corpus: {meta['corpus']} ({meta['files']} files, {meta['audio_s']:.0f}s), speed {speed}, {api}, "
+          f"vad {meta['vad']}")
+    for path_name, skipped in meta["skipped"].items():
+        print(f"{path_name:>10}: skipped ({skipped})")
+    for path_name, s in result["paths"].items():
+        wer = "n/a" if s["wer"] is None else f"{s['wer']:.1%}"
+        print(f"{path_name:>10}: RTF {s['rtf']}, WER {wer}, overruns {s['overruns']} "
+              f"({s['dropped_samples']} samples dropped), peak RSS {s['peak_rss_mb']} MB, "
+              f"failed {s['failed']}/{s['files']}")
+        for stage in SUMMARY_STAGES:
+            latency = s["latency_ms"].get(stage)
+            if latency:
+                print(f"{'':>12}{stage:<24} p50 {latency['p50_ms']:8.1f}ms  p95 {latency['p95_ms']:8.1f}ms")
+        old = (baseline or {}).get("paths", {}).get(path_name)
+        if old:
+            old_p95 = old["latency_ms"].get("release_to_paste", {}).get("p95_ms")
+            new_p95 = s["latency_ms"].get("release_to_paste", {}).get("p95_ms")
+            print(f"{'':>12}baseline: RTF {old['rtf']} -> {s['rtf']}, WER {old['wer']} -> {s['wer']}, "
+                  f"paste p95 {old_p95} -> {new_p95}ms, peak RSS {old['peak_rss_mb']} -> {s['peak_rss_mb']} MB")
+    for row in result["files"]:
+        if "error" in row:
+            print(f"  {row['path']}/{row['file']}: {row['error']}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", help="directory of .wav files with optional .txt references")
+    parser.add_argument("--paths", default=",".join(PATHS), help="comma-separated subset of " + ", ".join(PATHS))
+    parser.add_argument("--speed", type=float, default=1, help="playback speed relative to real time (0 = max)")
+    parser.add_argument("--limit", type=int, help="only the first N files")
+    parser.add_argument("--synthetic", type=int, default=3, help="clips to generate when no corpus is given")
+    parser.add_argument("--clip-s", type=float, default=20, help="length of each generated clip")
+    parser.add_argument("--vad", choices=["webrtc", "energy"], default="webrtc" if webrtcvad else "energy")
+    parser.add_argument("--live", action="store_true", help="use the configured API instead of the stubs")
+    parser.add_argument("--latency-ms", type=float, default=300, help="stub latency per request")
+    parser.add_argument("--ms-per-audio-s", type=float, default=50, help="stub time per second of audio")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--verbose", action="store_true", help="show the app's debug output")
+    args = parser.parse_args()
+
+    paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+    unknown = set(paths) - set(PATHS)
+    if unknown:
+        parser.error(f"unknown path(s): {', '.join(sorted(unknown))}")
+    if args.vad == "webrtc" and webrtcvad is None:
+        parser.error("webrtcvad is not installed; use --vad energy")
+
+    # In-memory only; nothing here is saved to the user's config file
+    current_config.refine_cache_enabled = False
+    skipped = {}
+    servers = []
+    if not args.live:
+        server = FakeOpenAIServer(latency_ms=args.latency_ms, ms_per_audio_s=args.ms_per_audio_s).start()
+        servers.append(server)
+        current_config.openai_api_key = "sk-fake"
+        current_config.openai_base_url = server.base_url
+        if serve_websocket is not None:
+            realtime = FakeRealtimeServer(server).start()
+            servers.append(realtime)
+            current_config.realtime_url = realtime.url
+        elif "realtime" in paths:
+            skipped["realtime"] = "stub needs the websockets package"
+
+    tmpdir = None
+    corpus = args.corpus
+    if corpus is None:
+        tmpdir = tempfile.TemporaryDirectory(prefix="ghostflow_corpus_")
+        write_synthetic_corpus(tmpdir.name, args.synthetic, args.clip_s)
+        corpus = tmpdir.name
+    clips = load_corpus(corpus, args.limit)
+    if not clips:
+        parser.error(f"no .wav files in {corpus}")
+
+    vad = webrtcvad.Vad(current_config.vad_aggressiveness) if args.vad == "webrtc" else EnergyVad()
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(open(os.devnull, "w"))
+    result = {"paths": {}, "files": []}
+    with quiet:
+        for path_name in paths:
+            if path_name in skipped:
+                continue
+            local_engine = None
+            if path_name == "local":
+                local_engine, reason = load_local_engine()
+                if local_engine is None:
+                    skipped["local"] = reason
+                    continue
+            current_config.transcription_model = PATH_MODELS[path_name]
+            rows = [run_clip(path_name, clip, args, vad, local_engine) for clip in clips]
+            realtime_pool.close_all()
+            if local_engine is not None:
+                local_engine.close()
+            summary = summarize(rows)
+            summary["peak_rss_mb"] = peak_rss_mb()
+            result["paths"][path_name] = summary
+            result["files"].extend(rows)
+
+    result["meta"] = {
+        "corpus": args.corpus or f"synthetic ({args.synthetic} x {args.clip_s:g}s)",
+        "files": len(clips),
+        "audio_s": round(sum(len(c[1]) for c in clips) / SAMPLE_RATE, 2),
+        "speed": args.speed,
+        "live": args.live,
+        "latency_ms": None if args.live else args.latency_ms,
+        "vad": args.vad,
+        "skipped": skipped,
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": round(time.time()),
+    }
+    for server in servers:
+        server.shutdown()
+    if tmpdir is not None:
+        tmpdir.cleanup()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result, baseline)
+
+if __name__ == "__main__":
+    main()
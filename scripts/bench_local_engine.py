@@ -0,0 +1,76 @@
+"""
+Benchmarks LocalParakeetEngine runtime settings on a reference WAV and
+reports the real-time factor (decode time / audio length) of each, so the
+fastest configuration for this machine can be picked in Preferences.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_local_engine.py reference.wav \
+        [--threads 0,1,2,4,8] [--providers cpu,coreml] \
+        [--decoding greedy_search,modified_beam_search] [--beam 4] [--json]
+"""
+import argparse
+import json
+import wave
+import numpy as np
+
+from src.core.local_engine import SAMPLE_RATE, auto_num_threads, benchmark, physical_core_count
+from src.core.model_manager import ModelManager
+from src.core.resampler import resample_pcm16
+
+def read_wav_16k(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise SystemExit("Reference WAV must be 16-bit PCM.")
+        channels = wf.getnchannels()
+        rate = wf.getframerate()
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        pcm = pcm.reshape(-1, channels)[:, 0].copy()
+    pcm_bytes = resample_pcm16(pcm.tobytes(), rate, SAMPLE_RATE)
+    return np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+
+def csv(value, cast=str):
+    return [cast(v) for v in value.split(",") if v]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wav")
+    parser.add_argument("--threads", type=lambda v: csv(v, int), default=[0, 1, 2, 4, 8])
+    parser.add_argument("--providers", type=csv, default=["cpu"])
+    parser.add_argument("--decoding", type=csv, default=["greedy_search", "modified_beam_search"])
+    parser.add_argument("--beam", type=int, default=4, help="max_active_paths for beam search")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if not ModelManager.is_model_ready():
+        raise SystemExit("Local model is not downloaded yet. Select Parakeet in Ghost Flow first.")
+
+    samples = read_wav_16k(args.wav)
+    candidates = [
+        {"num_threads": t, "provider": p, "decoding_method": d, "max_active_paths": args.beam}
+        for p in args.providers for d in args.decoding for t in args.threads
+    ]
+    results = benchmark(ModelManager.get_model_paths(), samples, candidates)
+
+    if args.json:
+        print(json.dumps({
+            "audio_s": round(len(samples) / SAMPLE_RATE, 3),
+            "physical_cores": physical_core_count(),
+            "auto_threads": auto_num_threads(),
+            "results": results,
+        }, indent=2))
+        return
+
+    print(f"Audio: {len(samples) / SAMPLE_RATE:.1f}s   physical cores: {physical_core_count()}   "
+          f"auto threads: {auto_num_threads()}")
+    print(f"{'threads':>8} {'provider':>9} {'decoding':>22} {'load s':>7} {'decode s':>9} {'RTF':>7}")
+    for r in results:
+        threads = f"{r['num_threads']}" if r["num_threads"] else "auto"
+        print(f"{threads:>8} {r['provider']:>9} {r['decoding_method']:>22} "
+              f"{r['load_s']:7.2f} {r['decode_s']:9.3f} {r['rtf']:7.4f}")
+    best = results[0]
+    print(f"\nFastest: threads={best['num_threads'] or 'auto'}, provider={best['provider']}, "
+          f"decoding={best['decoding_method']} (RTF {best['rtf']})")
+
+if __name__ == "__main__":
+    main()
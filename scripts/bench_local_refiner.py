@@ -0,0 +1,145 @@
+"""
+Runs the local refiner's escalation policy over a set of raw transcripts and
+reports how many would skip the LLM, the local refine time, and the latency
+saved against an LLM round-trip of --llm-ms.
+
+Transcripts come from a text file (one raw Whisper transcript per line) or,
+by default, a small built-in sample of typical dictations.
+
+Before timing, RULE_CASES are run through local_refine and compared with
+their expected output; the script exits with status 1 if any differ.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_local_refiner.py [transcripts.txt] [--llm-ms 900] [--show] [--json]
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from collections import Counter
+
+from src.core.local_refiner import escalation_reason, local_refine
+
+SAMPLE_TRANSCRIPTS = [
+    "Sounds good.",
+    "Thanks, will do.",
+    "LGTM",
+    "Um, yeah, let's ship it.",
+    "Can you send me the link?",
+    "I'll be there in five minutes.",
+    "ok sounds good",
+    "Merged, thanks!",
+    "Let me check and get back to you.",
+    "Uh, I think that's fine.",
+    "What time is the meeting tomorrow?",
+    "Approved.",
+    "Yes, please go ahead with the migration.",
+    "Not today, maybe next week.",
+    "So the the thing is, I mean, we we should probably wait for the other team.",
+    "Hey, so I looked at the report and the numbers for March look off, can you double check them before Friday?",
+    "so what i want to do today is go through the backlog and then review the open pull requests",
+    "Sorry, no wait, I meant Tuesday, not Thursday.",
+    "Okay, so first of all thank you everyone for joining. Today we're going to cover the roadmap for next "
+    "quarter, the hiring plan, and then we'll leave some time at the end for questions.",
+    "Please add this to the notes for tomorrow.",
+]
+
+# (raw, expected local_refine output) for the rules that are easy to get wrong
+RULE_CASES = [
+    ("the plan is, um, good", "The plan is good."),
+    ("Um, yeah, let's ship it.", "Yeah, let's ship it."),
+    ("so, uh, i think it's fine", "So I think it's fine."),
+    ("that is it, um.", "That is it."),
+    ("Okay. Um, so we start", "Okay. So we start."),
+    ("hello world... ok", "Hello world... ok."),
+    ("done.. ok", "Done. Ok."),
+    ("wait!! really??", "Wait! Really?"),
+    ("hello ,world", "Hello, world."),
+    ("bring snacks, drinks, etc. for the team", "Bring snacks, drinks, etc. for the team."),
+    ("see the doc, e.g. the intro", "See the doc, e.g. the intro."),
+    ("is it i.e. the same", "Is it i.e. the same?"),
+    ("what time is it", "What time is it?"),
+    ("can you send me the link", "Can you send me the link?"),
+    ("okay. how does that sound", "Okay. How does that sound?"),
+    ("what i want is a break", "What I want is a break."),
+    ("will do", "Will do."),
+    ("do it now", "Do it now."),
+    ("i think i'm done and i'll send it", "I think I'm done and I'll send it."),
+]
+
+def check_rules():
+    """RULE_CASES whose output differs from the expected text, as (raw, expected, actual)."""
+    failures = []
+    for raw, expected in RULE_CASES:
+        # No user dictionary, so the result only depends on the rules
+        actual = local_refine(raw, replacements={})
+        if actual != expected:
+            failures.append((raw, expected, actual))
+    return failures
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("transcripts", nargs="?", help="file with one raw transcript per line")
+    parser.add_argument("--llm-ms", type=float, default=900, help="typical refine round-trip to compare against")
+    parser.add_argument("--repeat", type=int, default=1000, help="timing iterations per transcript")
+    parser.add_argument("--show", action="store_true", help="print each transcript and its local result")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    failures = check_rules()
+    for raw, expected, actual in failures:
+        print(f"Rule check failed: {raw!r}\n    expected {expected!r}\n    got      {actual!r}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    if not args.json:
+        print(f"Rule checks: {len(RULE_CASES)} passed")
+
+    if args.transcripts:
+        with open(args.transcripts) as f:
+            transcripts = [line.strip() for line in f if line.strip()]
+    else:
+        transcripts = SAMPLE_TRANSCRIPTS
+
+    reasons = Counter()
+    local_us = []
+    rows = []
+    for text in transcripts:
+        reason = escalation_reason(text)
+        reasons[reason.split(":")[0] if reason else "local"] += 1
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            escalation_reason(text)
+            result = local_refine(text)
+        per_call_us = (time.perf_counter() - start) / args.repeat * 1e6
+        if reason is None:
+            local_us.append(per_call_us)
+        rows.append({"raw": text, "escalation": reason, "local": result, "us": round(per_call_us, 1)})
+
+    handled = reasons["local"]
+    summary = {
+        "transcripts": len(transcripts),
+        "handled_locally": handled,
+        "local_share": round(handled / len(transcripts), 3),
+        "escalations": {k: v for k, v in reasons.items() if k != "local"},
+        "local_median_us": round(statistics.median(local_us), 1) if local_us else None,
+        "saved_ms_per_dictation": round(handled / len(transcripts) * args.llm_ms, 1),
+    }
+
+    if args.json:
+        print(json.dumps({"summary": summary, "transcripts": rows if args.show else None}, indent=2))
+        return
+
+    if args.show:
+        for row in rows:
+            where = f"LLM ({row['escalation']})" if row["escalation"] else "local"
+            print(f"[{where}] {row['raw']!r}\n    -> {row['local']!r}  ({row['us']:.0f}us)")
+        print()
+    print(f"Transcripts: {summary['transcripts']}")
+    print(f"Handled locally: {handled} ({summary['local_share']:.0%}), "
+          f"median {summary['local_median_us']}us per transcript")
+    print(f"Escalated: {', '.join(f'{k}: {v}' for k, v in summary['escalations'].items()) or 'none'}")
+    print(f"Average latency saved at {args.llm_ms:.0f}ms per LLM call: {summary['saved_ms_per_dictation']:.0f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Overlay renderer comparison: memory and update latency of the native
+(QPainter) overlay vs. the web (QWebEngineView) overlay. Each renderer runs
+in a fresh process that creates only the overlay, the way GhostApp does.
+
+    memory    RSS of the process plus its children (QtWebEngineProcess
+              renderer/GPU/zygote for web) once the overlay is showing,
+              minus the same process's RSS just after QApplication started.
+    latency   One partial transcript update at a time, growing by a word
+              each: from pushing the state until the overlay has painted it.
+              Native: set_state() -> paintEvent. Web: the JSON payload
+              through QWebChannel -> React render -> next animation frame ->
+              ack back through the channel.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_overlay.py [--renderers native,web] [--updates 200]
+        [--offscreen] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from src.core.tracing import percentile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = "so I was thinking we could move the weekly sync to thursday afternoon and keep the notes short".split()
+
+def tree_rss_mb(pid):
+    """RSS of pid and all its descendants, via ps (Linux and macOS)."""
+    out = subprocess.run(["ps", "-A", "-o", "pid=,ppid=,rss="], capture_output=True, text=True).stdout
+    rss, children = {}, {}
+    for line in out.splitlines():
+        p, pp, r = (int(v) for v in line.split())
+        rss[p] = r
+        children.setdefault(pp, []).append(p)
+    total, stack = 0, [pid]
+    while stack:
+        p = stack.pop()
+        total += rss.get(p, 0)
+        stack.extend(children.get(p, []))
+    return total / 1024
+
+class StubApp:
+    """The GhostApp attributes UIBridge reads."""
+    permissions_granted = True
+    main_window = None
+
+    def on_settings_changed(self):
+        pass
+
+def run_child(renderer, updates, timeout):
+    """Runs in the child process; reports JSON on stdout."""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+
+    app = QApplication(sys.argv[:1])
+    app.processEvents()
+    baseline_mb = tree_rss_mb(os.getpid())
+    result = {"renderer": renderer, "baseline_mb": baseline_mb}
+    latencies = []
+    texts = [" ".join(WORDS[:i % len(WORDS) + 1]) for i in range(updates)]
+
+    if renderer == "native":
+        from src.gui.native_overlay import NativeOverlay
+        overlay = NativeOverlay(width=340, height=80)
+        painted = overlay.painted
+
+        def push(i):
+            overlay.set_state("listening", texts[i])
+    else:
+        from src.gui.bridge import UIBridge
+        from src.gui.web_window import WebWindow
+        bridge = UIBridge(StubApp())
+        overlay = WebWindow(bridge, mode="overlay", width=340, height=80)
+        painted = bridge.overlay_painted
+
+        def push(i):
+            bridge.emit_overlay_update({"stage": "listening", "text": texts[i], "ack": i})
+
+    state = {"next": 0, "sent_at": None}
+
+    def send_next():
+        i = state["next"]
+        if i >= updates:
+            QTimer.singleShot(0, app.quit)
+            return
+        state["sent_at"] = time.perf_counter()
+        push(i)
+
+    def on_painted(*ack):
+        if state["sent_at"] is None or (ack and ack[0] != state["next"]):
+            return
+        latencies.append(time.perf_counter() - state["sent_at"])
+        state["sent_at"] = None
+        state["next"] += 1
+        QTimer.singleShot(0, send_next)
+
+    def start():
+        # Memory once the overlay shows dictation state, before the update run
+        result["overlay_mb"] = tree_rss_mb(os.getpid())
+        painted.connect(on_painted)
+        send_next()
+
+    overlay.show_overlay()
+    if renderer == "native":
+        QTimer.singleShot(500, start)
+    else:
+        bridge.ui_loaded.connect(lambda mode: QTimer.singleShot(500, start))
+    QTimer.singleShot(int(timeout * 1000), app.quit)
+    app.exec()
+
+    result["latencies_ms"] = [round(v * 1000, 3) for v in latencies]
+    print("RESULT " + json.dumps(result))
+
+def measure(renderer, updates, timeout, offscreen):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", renderer, str(updates), str(timeout)],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout + 60)
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"{renderer} run failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+def summarize(r):
+    lat = r["latencies_ms"]
+    return {
+        "overlay_mb": round(r["overlay_mb"] - r["baseline_mb"], 1) if "overlay_mb" in r else None,
+        "updates": len(lat),
+        "p50_ms": round(statistics.median(lat), 2) if lat else None,
+        "p95_ms": round(percentile(sorted(lat), 95), 2) if lat else None,
+        "max_ms": round(max(lat), 2) if lat else None,
+    }
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], int(sys.argv[3]), float(sys.argv[4]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renderers", default="native,web", help="comma-separated: native, web")
+    parser.add_argument("--updates", type=int, default=200, help="partial updates to time")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds before a run is abandoned")
+    parser.add_argument("--offscreen", action="store_true", help="use Qt's offscreen platform (no display needed)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for renderer in args.renderers.split(","):
+        if renderer == "web":
+            try:
+                import PyQt6.QtWebEngineWidgets  # noqa: F401
+            except Exception as e:
+                results[renderer] = {"skipped": f"QtWebEngine is not available ({e})"}
+                continue
+        results[renderer] = summarize(measure(renderer, args.updates, args.timeout, args.offscreen))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'renderer':<8} {'memory':>10} {'updates':>8} {'p50':>9} {'p95':>9} {'max':>9}")
+    for renderer, r in results.items():
+        if "skipped" in r:
+            print(f"{renderer:<8} skipped: {r['skipped']}")
+            continue
+        memory = f"{r['overlay_mb']:.1f} MB" if r["overlay_mb"] is not None else "n/a"
+        if not r["updates"]:
+            print(f"{renderer:<8} {memory:>10}   no updates painted (overlay never became ready)")
+            continue
+        print(f"{renderer:<8} {memory:>10} {r['updates']:>8} {r['p50_ms']:>6.2f} ms {r['p95_ms']:>6.2f} ms {r['max_ms']:>6.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compares blocking and streamed refinement (AIProcessor.refine) against the
+local fake endpoint (scripts/fake_openai_server.py), or the real API with
+--live.
+
+For each mode it reports when the user would first see refined text in the
+overlay, when the first sentence could be pasted early (refine_early_paste),
+and when the full text is ready, plus time to first token and tokens/s from
+AIProcessor.last_refine_metrics.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_refine_streaming.py [--words 120] [--latency-ms 400] \
+        [--tokens-per-s 60] [--runs 3] [--live] [--json]
+"""
+import argparse
+import json
+import statistics
+import time
+
+from scripts.fake_openai_server import FakeOpenAIServer
+from src.config import current_config
+from src.core.ai import AIProcessor, sentence_prefix_end
+
+WORDS = ("so the plan for next week is to finish the migration and then look at "
+         "the reporting dashboard because the numbers there are still off").split()
+
+def sample_transcript(num_words: int) -> str:
+    """Plain sentences of ~15 words, so early paste has sentence ends to find."""
+    words = [WORDS[i % len(WORDS)] for i in range(num_words)]
+    sentences = [" ".join(words[i:i + 15]) for i in range(0, num_words, 15)]
+    return " ".join(s[0].upper() + s[1:] + "." for s in sentences)
+
+def run_once(processor: AIProcessor, text: str, streaming: bool) -> dict:
+    current_config.refine_streaming = streaming
+    marks = {}
+    start = time.perf_counter()
+
+    def on_delta(partial):
+        now = time.perf_counter() - start
+        marks.setdefault("first_text_s", now)
+        if "first_sentence_s" not in marks and sentence_prefix_end(partial):
+            marks["first_sentence_s"] = now
+
+    result = processor.refine(text, on_delta=on_delta)
+    total_s = time.perf_counter() - start
+    metrics = processor.last_refine_metrics or {}
+    return {
+        # Without streaming nothing is visible until the whole reply is in
+        "first_text_s": marks.get("first_text_s", total_s),
+        "first_sentence_s": marks.get("first_sentence_s", total_s),
+        "total_s": total_s,
+        "ttft_s": metrics.get("ttft_s"),
+        "tokens_per_s": metrics.get("tokens_per_s"),
+        "chars": len(result),
+    }
+
+def summarize(runs: list) -> dict:
+    summary = {}
+    for key in runs[0]:
+        values = [r[key] for r in runs if r[key] is not None]
+        summary[key] = round(statistics.median(values), 3) if values else None
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=120, help="length of the transcript to refine")
+    parser.add_argument("--latency-ms", type=float, default=400, help="fake server time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=60, help="fake server generation speed")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--live", action="store_true", help="use the configured API instead of the fake server")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    server = None
+    if not args.live:
+        server = FakeOpenAIServer(latency_ms=args.latency_ms, tokens_per_s=args.tokens_per_s).start()
+        # In-memory only; nothing here is saved to the user's config file
+        current_config.openai_api_key = "sk-fake"
+        current_config.openai_base_url = server.base_url
+
+    # Every run should reach the model, even for transcripts short enough to cache or refine locally
+    current_config.refine_cache_enabled = False
+    current_config.refine_mode = "llm"
+    processor = AIProcessor()
+    text = sample_transcript(args.words)
+    results = {}
+    for mode, streaming in (("blocking", False), ("streaming", True)):
+        results[mode] = summarize([run_once(processor, text, streaming) for _ in range(args.runs)])
+    if server:
+        server.shutdown()
+
+    if args.json:
+        print(json.dumps({"words": args.words, "live": args.live, "results": results}, indent=2))
+        return
+
+    print(f"Transcript: {args.words} words ({'live API' if args.live else 'fake server'}), median of {args.runs} runs")
+    print(f"{'mode':>10} {'first text':>11} {'1st sentence':>13} {'total':>7} {'ttft':>6} {'tok/s':>7}")
+    for mode, r in results.items():
+        ttft = f"{r['ttft_s']:>6.2f}" if r["ttft_s"] is not None else f"{'-':>6}"
+        tps = f"{r['tokens_per_s']:>7.1f}" if r["tokens_per_s"] is not None else f"{'-':>7}"
+        print(f"{mode:>10} {r['first_text_s']:>10.2f}s {r['first_sentence_s']:>12.2f}s {r['total_s']:>6.2f}s {ttft} {tps}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Micro-benchmark: per-frame cost of the streaming resampler vs. the old
+per-call scipy.signal.resample_poly path (16kHz -> 24kHz, 30ms frames).
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_resampler.py [--frames 2000]
+"""
+import argparse
+import time
+import tracemalloc
+import numpy as np
+from scipy.signal import resample_poly
+
+from src.core.resampler import StreamingResampler
+
+IN_RATE = 16000
+OUT_RATE = 24000
+FRAME = IN_RATE * 30 // 1000
+
+def legacy_resample(pcm_bytes: bytes) -> bytes:
+    # Verbatim copy of the previous AIProcessor._resample_to_realtime_rate body
+    audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
+    resampled = resample_poly(audio, OUT_RATE, IN_RATE)
+    resampled = np.clip(resampled, -32768, 32767).astype(np.int16)
+    return resampled.tobytes()
+
+def measure(name, fn, frames):
+    # Warm-up (imports, first-call allocations)
+    for frame in frames[:20]:
+        fn(frame)
+
+    start = time.perf_counter()
+    for frame in frames:
+        fn(frame)
+    elapsed = time.perf_counter() - start
+
+    # tracemalloc can't count frees, so report the transient heap high-water
+    # mark per call (numpy temporaries included) as the allocation cost.
+    tracemalloc.start()
+    peak = 0
+    for frame in frames[:200]:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        fn(frame)
+        _, frame_peak = tracemalloc.get_traced_memory()
+        peak = max(peak, frame_peak - base)
+    tracemalloc.stop()
+
+    per_frame_us = elapsed / len(frames) * 1e6
+    print(f"{name:<22} {per_frame_us:8.1f} us/frame   peak transient alloc {peak:7d} B/frame")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(FRAME * args.frames) * 3000).astype(np.int16)
+    frames = [audio[i:i + FRAME].tobytes() for i in range(0, len(audio), FRAME)]
+
+    resampler = StreamingResampler(IN_RATE, OUT_RATE)
+
+    print(f"{len(frames)} frames of {FRAME} samples ({IN_RATE} -> {OUT_RATE} Hz)")
+    measure("resample_poly/frame", legacy_resample, frames)
+    measure("StreamingResampler", resampler.process_pcm16, frames)
+
+if __name__ == "__main__":
+    main()
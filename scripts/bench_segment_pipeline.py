@@ -0,0 +1,149 @@
+"""
+Shows what a slow cloud transcription does to the streaming VAD loop, with
+segments transcribed inline (the old behaviour) and through the ordered
+segment pipeline StreamingTranscriptionWorker now uses.
+
+A producer thread plays synthetic dictation (tone bursts and pauses, see
+check_chunked_transcription.py) into an Int16RingBuffer at --speedup times
+real time, like AudioRecorder's callback. The consumer mirrors the cloud VAD
+loop, with a simple energy threshold standing in for webrtcvad, and sends
+segments to the local fake endpoint (scripts/fake_openai_server.py).
+Reported per mode:
+  - ring overruns and audio dropped
+  - whether every word came back, in order
+  - time from the end of audio to the last segment's text
+  - pipeline back-pressure stats
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_segment_pipeline.py [--minutes 2] [--speedup 4] \
+        [--latency-ms 4000] [--parallel 3] [--ring-s 15]
+"""
+import argparse
+import threading
+import time
+import numpy as np
+
+from scripts.check_chunked_transcription import SAMPLE_RATE, synthetic_dictation
+from scripts.fake_openai_server import FakeOpenAIServer
+from src.config import current_config
+from src.core.ai import AIProcessor
+from src.core.buffers import Int16RingBuffer
+from src.core.pipeline import OrderedTaskPipeline
+
+FRAME_LEN = 480  # 30ms, as AudioRecorder streams
+SPEECH_RMS = 0.02 * 32768
+SILENCE_MS = 600
+MIN_SEGMENT_MS = 300
+
+def play(ring, pcm, interval_s, timing):
+    next_tick = time.perf_counter()
+    for start in range(0, len(pcm) - FRAME_LEN + 1, FRAME_LEN):
+        ring.write(pcm[start:start + FRAME_LEN])
+        next_tick += interval_s
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    timing["audio_end"] = time.perf_counter()
+
+def consume(ring, producer, transcribe_segment, words, pipeline=None):
+    """Cloud VAD loop from StreamingTranscriptionWorker, minus Qt and webrtcvad."""
+    frame_ms = 1000 * FRAME_LEN // SAMPLE_RATE
+    current, duration, silence = [], 0, 0
+
+    def deliver(texts):
+        for text in texts:
+            words.extend(text.split())
+
+    def close_segment(frames, ms):
+        if ms < MIN_SEGMENT_MS:
+            return
+        if pipeline is None:
+            deliver([transcribe_segment(frames)])
+        else:
+            pipeline.submit(transcribe_segment, frames, on_wait=lambda: deliver(pipeline.poll()))
+
+    while True:
+        frame = ring.read(timeout=0.1)
+        if frame is None:
+            if not producer.is_alive() and ring.available() < FRAME_LEN:
+                break
+            continue
+        if pipeline is not None:
+            deliver(pipeline.poll())
+        frame_bytes = frame.tobytes()
+        samples = np.frombuffer(frame_bytes, dtype=np.int16).astype(np.float32)
+        if np.sqrt(np.mean(samples ** 2)) > SPEECH_RMS:
+            current.append(frame_bytes)
+            duration += frame_ms
+            silence = 0
+        elif current:
+            # Unlike the worker, keep pauses inside a segment so the fake server can tell bursts apart
+            current.append(frame_bytes)
+            silence += frame_ms
+            if silence >= SILENCE_MS:
+                close_segment(current, duration)
+                current, duration, silence = [], 0, 0
+    if current:
+        close_segment(current, duration)
+    if pipeline is not None:
+        deliver(pipeline.drain())
+
+def run_mode(name, pcm, expected, args):
+    processor = AIProcessor()
+    ring = Int16RingBuffer(int(args.ring_s * SAMPLE_RATE), FRAME_LEN)
+    timing = {}
+    producer = threading.Thread(target=play, args=(ring, pcm, FRAME_LEN / SAMPLE_RATE / args.speedup, timing))
+    pipeline = OrderedTaskPipeline(args.parallel, name="segment") if name == "pipelined" else None
+    words = []
+
+    def transcribe_segment(frames):
+        return processor.transcribe_pcm16(b"".join(frames), SAMPLE_RATE)
+
+    producer.start()
+    consume(ring, producer, transcribe_segment, words, pipeline)
+    producer.join()
+    # From the last audio frame to the last text: what the user waits for after they stop
+    tail_s = time.perf_counter() - timing["audio_end"]
+    result = {
+        "overruns": ring.overruns,
+        "dropped_s": ring.dropped_samples / SAMPLE_RATE,
+        "words_ok": words == expected,
+        "words": len(words),
+        "tail_s": tail_s,
+        "stats": pipeline.stats() if pipeline else None,
+    }
+    if pipeline:
+        pipeline.shutdown()
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=2)
+    parser.add_argument("--speedup", type=float, default=4, help="playback speed relative to real time")
+    parser.add_argument("--latency-ms", type=float, default=4000,
+                        help="fake server time per request, in audio time (a slow connection)")
+    parser.add_argument("--parallel", type=int, default=3)
+    parser.add_argument("--ring-s", type=float, default=15, help="ring capacity in seconds of audio")
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency_ms=args.latency_ms / args.speedup, ms_per_audio_s=0).start()
+    # In-memory only; nothing here is saved to the user's config file
+    current_config.openai_api_key = "sk-fake"
+    current_config.openai_base_url = server.base_url
+    current_config.transcription_model = "whisper-1"
+    current_config.upload_encoding = "wav"
+
+    pcm, expected = synthetic_dictation(args.minutes)
+    print(f"Audio: {len(pcm) / SAMPLE_RATE:.0f}s at {args.speedup:g}x, {len(expected)} words, "
+          f"{args.latency_ms:.0f}ms per segment request (audio time), ring {args.ring_s:g}s")
+    for name in ("inline", "pipelined"):
+        r = run_mode(name, pcm, expected, args)
+        print(f"{name:>10}: overruns {r['overruns']:4d} ({r['dropped_s']:5.1f}s of audio lost), "
+              f"words {r['words']}/{len(expected)} {'OK' if r['words_ok'] else 'MISMATCH'}, "
+              f"text {r['tail_s']:.1f}s after audio end")
+        if r["stats"]:
+            print(f"{'':>12}pipeline: {r['stats']}")
+    server.shutdown()
+
+if __name__ == "__main__":
+    main()
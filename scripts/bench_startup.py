@@ -0,0 +1,142 @@
+"""
+Startup benchmark: import cost of the core modules, how long a fresh
+interpreter takes to have a DictationCore ready (and which heavy packages
+that pulled in), and the GUI's time from launch to a live hotkey. Every
+measurement runs in a new Python process so nothing is already imported.
+
+    import     `python -X importtime -c "import <module>"` per module:
+               the module's cumulative time and its most expensive imports.
+    core       Seconds from spawning an interpreter to a constructed DictationCore,
+               and which of the heavy packages (openai, scipy, sherpa_onnx,
+               PyQt6, pyautogui, ...) it loaded. The core should load none:
+               they are imported on first use.
+    gui        Launches src/main.py with GHOSTFLOW_EXIT_WHEN_READY=1 and reads
+               its "Hotkey ready" log line. Skipped when PyQt6 isn't installed.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_startup.py [--repeat 5] [--json]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TARGETS = ["src.core.dictation", "src.core.transcription", "src.core.ai", "src.headless"]
+HEAVY_MODULES = ["openai", "scipy", "sherpa_onnx", "PyQt6", "PyQt6.QtWebEngineWidgets",
+                 "pynput", "pyautogui", "sounddevice", "soundfile"]
+
+# argv[1] is the parent's time.time() just before it spawned the interpreter
+CORE_PROBE = """
+import json, sys, time
+from src.core.dictation import DictationCore
+DictationCore()
+elapsed = time.time() - float(sys.argv[1])
+print(json.dumps({"elapsed_s": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+def child_env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    # Only the cold import counts, not writing __pycache__
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+def measure_import(module, top=5):
+    """(cumulative seconds, [(module, seconds)] of its most expensive direct imports)."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=child_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    total = None
+    children = []
+    for line in proc.stderr.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)", line)
+        if not m:
+            continue
+        cumulative_s = int(m.group(2)) / 1e6
+        depth = len(m.group(3)) // 2
+        name = m.group(4)
+        if name == module and depth == 0:
+            total = cumulative_s
+        elif depth == 1:
+            children.append((name, cumulative_s))
+    children.sort(key=lambda c: c[1], reverse=True)
+    return total, children[:top]
+
+def measure_core():
+    proc = subprocess.run([sys.executable, "-c", CORE_PROBE % (HEAVY_MODULES,), repr(time.time())],
+                          cwd=ROOT, env=child_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"core probe failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def measure_gui(timeout=60):
+    """Seconds from launch to the hotkey being live, as logged by src/main.py."""
+    env = child_env()
+    env["GHOSTFLOW_EXIT_WHEN_READY"] = "1"
+    proc = subprocess.run([sys.executable, os.path.join("src", "main.py")], cwd=ROOT, env=env,
+                          capture_output=True, text=True, timeout=timeout)
+    m = re.search(r"Hotkey ready ([\d.]+)s after launch", proc.stdout)
+    if not m:
+        raise RuntimeError(f"no 'Hotkey ready' line (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+    return float(m.group(1))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement; the median is reported")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--no-gui", action="store_true", help="skip launching the GUI")
+    args = parser.parse_args()
+    repeat = max(1, args.repeat)
+    results = {"imports": {}, "core": None, "gui_hotkey_ready_s": None}
+
+    for module in IMPORT_TARGETS:
+        runs = [measure_import(module) for _ in range(repeat)]
+        totals = [total for total, _ in runs]
+        results["imports"][module] = {
+            "seconds": statistics.median(totals),
+            "top": runs[-1][1],
+        }
+
+    cores = [measure_core() for _ in range(repeat)]
+    results["core"] = {
+        "seconds": statistics.median(c["elapsed_s"] for c in cores),
+        "heavy_loaded": cores[-1]["loaded"],
+    }
+
+    gui_skipped = None
+    if args.no_gui:
+        gui_skipped = "--no-gui"
+    elif importlib.util.find_spec("PyQt6") is None:
+        gui_skipped = "PyQt6 not installed"
+    else:
+        try:
+            results["gui_hotkey_ready_s"] = statistics.median(measure_gui() for _ in range(repeat))
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            gui_skipped = f"failed: {str(e).strip().splitlines()[-1]}"
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"Imports (median of {repeat}, cold, no bytecode writes):")
+    for module, r in results["imports"].items():
+        top = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in r["top"][:3])
+        print(f"  {module:<26} {r['seconds'] * 1000:7.0f} ms   ({top})")
+    core = results["core"]
+    heavy = ", ".join(core["heavy_loaded"]) or "none"
+    print(f"DictationCore ready:         {core['seconds'] * 1000:7.0f} ms   heavy modules loaded: {heavy}")
+    if gui_skipped:
+        print(f"GUI hotkey ready:            skipped ({gui_skipped})")
+    else:
+        print(f"GUI hotkey ready:            {results['gui_hotkey_ready_s'] * 1000:7.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+UI startup benchmark: how long a WebWindow takes from creation until its
+React app has rendered and connected to the bridge (UIBridge.ui_ready),
+i.e. when the overlay is ready to show dictation state. Each run is a
+fresh process, so the Chromium and disk caches start as cold as an app launch.
+
+Pages:
+    bundle   src/ui/dist/app.html (scripts/build_ui.py): local, precompiled
+    source   src/ui/app.html: CDN React development builds, in-browser Babel
+             and the Tailwind CDN; needs the network
+
+A page that never reports in (e.g. source while offline, where only the
+no-React fallback renders) is shown as "not ready" after --timeout.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_ui_startup.py [--pages bundle,source] [--modes overlay,settings]
+        [--repeat 5] [--offscreen] [--json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class StubApp:
+    """The GhostApp attributes UIBridge reads."""
+    permissions_granted = True
+    main_window = None
+
+    def on_settings_changed(self):
+        pass
+
+def run_child(page, mode, timeout, launched_at):
+    """Runs in the child process: one window, reports JSON on stdout."""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QTimer
+    from src.gui.bridge import UIBridge
+    from src.gui.web_window import WebWindow, BUNDLE_HTML, SOURCE_HTML
+
+    app = QApplication(sys.argv[:1])
+    bridge = UIBridge(StubApp())
+    html_path = BUNDLE_HTML if page == "bundle" else SOURCE_HTML
+    window = WebWindow(bridge, mode=mode, width=340, height=80, html_path=html_path)
+    window_created = time.time()
+    bridge.ui_loaded.connect(lambda m: QTimer.singleShot(0, app.quit) if m == mode else None)
+    QTimer.singleShot(int(timeout * 1000), app.quit)
+    window.show()
+    app.exec()
+    result = {
+        "ready_s": window.ready_after,
+        # Interpreter start (incl. the PyQt/WebEngine imports) to ready
+        "launch_to_ready_s": (window_created - launched_at + window.ready_after) if window.ready_after else None,
+    }
+    sys.__stdout__.write("RESULT " + json.dumps(result) + "\n")
+
+def measure(page, mode, timeout, offscreen):
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", page, mode, str(timeout), repr(time.time())],
+                          cwd=ROOT, env=env, capture_output=True, text=True, timeout=timeout + 60)
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"{page}/{mode} run failed (exit {proc.returncode}):\n{proc.stderr[-2000:]}")
+
+def median_or_none(values):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        page, mode, timeout, launched_at = sys.argv[2:6]
+        run_child(page, mode, float(timeout), float(launched_at))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", default="bundle,source", help="comma-separated: bundle, source")
+    parser.add_argument("--modes", default="overlay,settings", help="comma-separated: overlay, settings")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per page and mode; the median is reported")
+    parser.add_argument("--timeout", type=float, default=20.0, help="seconds to wait for a page to report in")
+    parser.add_argument("--offscreen", action="store_true", help="use Qt's offscreen platform (no display needed)")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        import PyQt6.QtWebEngineWidgets  # noqa: F401
+    except Exception as e:
+        print(f"Skipped: QtWebEngine is not available ({e}).")
+        return
+
+    results = {}
+    for page in args.pages.split(","):
+        for mode in args.modes.split(","):
+            runs = [measure(page, mode, args.timeout, args.offscreen) for _ in range(max(1, args.repeat))]
+            results[f"{page}/{mode}"] = {
+                "ready_s": median_or_none(r["ready_s"] for r in runs),
+                "launch_to_ready_s": median_or_none(r["launch_to_ready_s"] for r in runs),
+                "not_ready": sum(r["ready_s"] is None for r in runs),
+                "runs": len(runs),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'page/mode':<18} {'window->ready':>14} {'launch->ready':>14}")
+    for name, r in results.items():
+        if r["ready_s"] is None:
+            print(f"{name:<18} {'not ready':>14} {'':>14}   ({r['not_ready']}/{r['runs']} runs timed out)")
+            continue
+        note = f"   ({r['not_ready']}/{r['runs']} runs timed out)" if r["not_ready"] else ""
+        print(f"{name:<18} {r['ready_s'] * 1000:11.0f} ms {r['launch_to_ready_s'] * 1000:11.0f} ms{note}")
+
+if __name__ == "__main__":
+    main()
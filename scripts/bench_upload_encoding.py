@@ -0,0 +1,121 @@
+"""
+Compares the Whisper upload encodings (WAV, FLAC, Opus): bytes sent, encode
+time, and estimated stop-to-upload wall time at a few uplink speeds.
+
+Two encode timings are reported per mode:
+  - "one-shot": encoding the whole recording at stop (transcribe_pcm16 path)
+  - "at stop":  what is left when the recorder has been encoding while
+                recording (AudioFileWriter): the last frame plus close()
+
+With --live, each mode is also uploaded to the transcription endpoint using
+the API key from the Ghost Flow config, and the real wall time is measured.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/bench_upload_encoding.py [reference.wav] \
+        [--seconds 60] [--uplink-kbps 500,2000,20000] [--live] [--json]
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import numpy as np
+
+from src.core.encoder import AudioFileWriter, encode_pcm16, encoding_available, read_pcm16
+from src.core.resampler import resample_pcm16
+
+SAMPLE_RATE = 16000
+FRAME_LEN = 480
+MODES = ("wav", "flac", "opus")
+
+def synthetic_speech(seconds: float) -> bytes:
+    """Voiced harmonics with syllable-rate envelope and pauses; compresses roughly like speech."""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 120 + 30 * np.sin(2 * np.pi * 0.3 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.5)
+    signal = 0.3 * voiced * envelope + 0.01 * rng.standard_normal(len(t))
+    return (np.clip(signal, -1, 1) * 20000).astype(np.int16).tobytes()
+
+def incremental_stop_latency(pcm_bytes: bytes, encoding: str) -> float:
+    base = os.path.join(tempfile.gettempdir(), f"ghost_bench_{encoding}")
+    writer = AudioFileWriter(base, SAMPLE_RATE, encoding)
+    frame_bytes = FRAME_LEN * 2
+    last = len(pcm_bytes) - frame_bytes
+    for start in range(0, last, frame_bytes):
+        writer.write(pcm_bytes[start:start + frame_bytes])
+    begin = time.perf_counter()
+    writer.write(pcm_bytes[last:])
+    writer.close()
+    elapsed = time.perf_counter() - begin
+    os.remove(writer.path)
+    return elapsed
+
+def live_upload(filename: str, data: bytes) -> float:
+    from src.core.ai import AIProcessor
+    processor = AIProcessor()
+    start = time.perf_counter()
+    processor._upload_transcription("whisper-1", (filename, data), len(data))
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wav", nargs="?", help="reference recording (default: synthetic speech)")
+    parser.add_argument("--seconds", type=float, default=60, help="length of the synthetic recording")
+    parser.add_argument("--uplink-kbps", type=lambda v: [float(x) for x in v.split(",") if x],
+                        default=[500, 2000, 20000])
+    parser.add_argument("--rtt-ms", type=float, default=150, help="added once per upload in the estimate")
+    parser.add_argument("--live", action="store_true", help="also upload each mode to the API")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    if args.wav:
+        pcm_bytes, rate = read_pcm16(args.wav)
+        pcm_bytes = resample_pcm16(pcm_bytes, rate, SAMPLE_RATE)
+    else:
+        pcm_bytes = synthetic_speech(args.seconds)
+    audio_s = len(pcm_bytes) / 2 / SAMPLE_RATE
+
+    results = []
+    for mode in MODES:
+        if not encoding_available(mode):
+            print(f"Skipping {mode}: not available (pip install soundfile)")
+            continue
+        start = time.perf_counter()
+        filename, data = encode_pcm16(pcm_bytes, SAMPLE_RATE, mode)
+        one_shot_s = time.perf_counter() - start
+        at_stop_s = incremental_stop_latency(pcm_bytes, mode)
+        result = {
+            "mode": mode,
+            "bytes": len(data),
+            "ratio": round(len(data) / (len(pcm_bytes) + 44), 3),
+            "encode_one_shot_s": round(one_shot_s, 4),
+            "encode_at_stop_s": round(at_stop_s, 4),
+            # Recorder path: encoding overlapped the recording, so only upload time remains
+            "estimated_wall_s": {
+                str(int(kbps)): round(at_stop_s + args.rtt_ms / 1000 + len(data) * 8 / 1000 / kbps, 3)
+                for kbps in args.uplink_kbps
+            },
+        }
+        if args.live:
+            result["live_wall_s"] = round(live_upload(filename, data), 3)
+        results.append(result)
+
+    if args.json:
+        print(json.dumps({"audio_s": round(audio_s, 2), "results": results}, indent=2))
+        return
+
+    print(f"Audio: {audio_s:.1f}s ({'file' if args.wav else 'synthetic'})")
+    speeds = "".join(f"{f'@{int(k)}kbps':>12}" for k in args.uplink_kbps)
+    live = f"{'live s':>9}" if args.live else ""
+    print(f"{'mode':>6} {'bytes':>10} {'ratio':>6} {'one-shot':>9} {'at stop':>8}{speeds}{live}")
+    for r in results:
+        walls = "".join(f"{r['estimated_wall_s'][str(int(k))]:>12.2f}" for k in args.uplink_kbps)
+        live = f"{r['live_wall_s']:>9.2f}" if args.live else ""
+        print(f"{r['mode']:>6} {r['bytes']:>10} {r['ratio']:>6.2f} {r['encode_one_shot_s']:>9.3f} "
+              f"{r['encode_at_stop_s']:>8.4f}{walls}{live}")
+
+if __name__ == "__main__":
+    main()
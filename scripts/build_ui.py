@@ -0,0 +1,169 @@
+"""
+Builds the web UI into src/ui/dist/, which the app loads from disk. The
+output has no CDN requests and does no in-browser JSX compilation.
+
+src/ui/app.html stays the single source. It still runs on its own (React
+development builds, Babel and the Tailwind CDN), which is handy while
+editing, but needs the network and compiles the JSX on every load. The
+build turns it into:
+
+    dist/app.html    the page, with the same inline no-React fallback
+    dist/app.js      the JSX block, precompiled (esbuild) and minified (rjsmin)
+    dist/app.css     Tailwind v3 with only the classes app.html uses, plus
+                     app.html's own <style>, minified
+    dist/react*.js   React 18 production builds, from src/ui/vendor/
+    dist/qwebchannel.js
+
+Build requirements (build time only): pip install esbuild_py rjsmin, plus a
+Tailwind CSS v3 standalone CLI: the `tailwind` pip package on Linux, or
+the binary from github.com/tailwindlabs/tailwindcss/releases (v3.x),
+passed with --tailwindcss.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/build_ui.py            # rebuild src/ui/dist
+    PYTHONPATH=. python scripts/build_ui.py --check    # fail if dist is out of date
+"""
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UI_DIR = os.path.join(ROOT, "src", "ui")
+SOURCE_HTML = os.path.join(UI_DIR, "app.html")
+DIST_DIR = os.path.join(UI_DIR, "dist")
+VENDOR_FILES = [
+    os.path.join(UI_DIR, "vendor", "react.production.min.js"),
+    os.path.join(UI_DIR, "vendor", "react-dom.production.min.js"),
+    os.path.join(UI_DIR, "qwebchannel.js"),
+]
+# Recorded in dist/app.html so --check (and anyone reading it) can tell which source it came from
+STAMP_RE = re.compile(r"<!-- built from app.html sha256:([0-9a-f]{64}) -->")
+
+STYLE_RE = re.compile(r"<style>(.*?)</style>", re.S)
+JSX_RE = re.compile(r'<script type="text/babel">(.*?)</script>', re.S)
+INLINE_JS_RE = re.compile(r'<script type="text/javascript">(.*?)</script>', re.S)
+REMOTE_SCRIPT_RE = re.compile(r'\s*<script src="https?://[^"]*"></script>')
+COMMENT_RE = re.compile(r"\s*<!--.*?-->", re.S)
+
+class BuildError(Exception):
+    pass
+
+def source_digest():
+    with open(SOURCE_HTML, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def find_tailwindcss(path=None):
+    """The Tailwind CLI to use, checked to be v3 (the version cdn.tailwindcss.com serves)."""
+    exe = path or shutil.which("tailwindcss")
+    if not exe:
+        raise BuildError("Tailwind CSS v3 CLI not found. Install it (see --help) or pass --tailwindcss PATH.")
+    out = subprocess.run([exe, "--help"], capture_output=True, text=True)
+    version = re.search(r"tailwindcss v(\d+)\.", out.stdout + out.stderr)
+    if not version or version.group(1) != "3":
+        raise BuildError(f"{exe} is not Tailwind CSS v3; the UI's classes are written for v3.")
+    return exe
+
+def compile_jsx(source):
+    try:
+        from esbuild_py import transform
+        import rjsmin
+    except ImportError as e:
+        raise BuildError(f"{e}. Run: pip install esbuild_py rjsmin") from e
+    js = transform(source)
+    if not js or "React.createElement" not in js:
+        raise BuildError(f"esbuild could not compile the JSX block: {js}")
+    return rjsmin.jsmin(js)
+
+def minify_js(source):
+    import rjsmin
+    return rjsmin.jsmin(source)
+
+def build_css(custom_css, tailwindcss, out_path):
+    # Custom rules between components and utilities, so utility classes still win
+    with tempfile.NamedTemporaryFile("w", suffix=".css", delete=False) as f:
+        f.write("@tailwind base;\n@tailwind components;\n")
+        f.write(custom_css)
+        f.write("\n@tailwind utilities;\n")
+        input_path = f.name
+    try:
+        proc = subprocess.run([tailwindcss, "-i", input_path, "-o", out_path, "--content", SOURCE_HTML, "--minify"],
+                              capture_output=True, text=True)
+    finally:
+        os.unlink(input_path)
+    if proc.returncode != 0:
+        raise BuildError(f"tailwindcss failed:\n{proc.stderr}")
+
+def build_html(html, digest):
+    html = REMOTE_SCRIPT_RE.sub("", html)
+    html = COMMENT_RE.sub("", html)
+    vendor = "".join(f'\n    <script src="{os.path.basename(p)}"></script>' for p in VENDOR_FILES[:2])
+    html = html.replace('<script src="qwebchannel.js"></script>',
+                        vendor.lstrip() + '\n    <script src="qwebchannel.js"></script>', 1)
+    html = STYLE_RE.sub('<link rel="stylesheet" href="app.css">', html, count=1)
+    html = JSX_RE.sub('<script src="app.js"></script>', html, count=1)
+    inline_js = INLINE_JS_RE.search(html).group(1)
+    html = INLINE_JS_RE.sub("<script>@INLINE_JS@</script>", html, count=1)
+    # Indentation only; the inline script keeps its own whitespace (template literals)
+    html = "\n".join(line.strip() for line in html.splitlines() if line.strip())
+    html = html.replace("@INLINE_JS@", minify_js(inline_js), 1)
+    remote = re.findall(r'(?:src|href)="(https?://[^"]*)"', html)
+    if remote:
+        raise BuildError(f"dist/app.html would still load remote assets: {remote}")
+    return html.replace("<html", f"<!-- built from app.html sha256:{digest} -->\n<html", 1) + "\n"
+
+def build(out_dir, tailwindcss):
+    with open(SOURCE_HTML, encoding="utf-8") as f:
+        html = f.read()
+    style = STYLE_RE.search(html)
+    jsx = JSX_RE.search(html)
+    if not style or not jsx or not INLINE_JS_RE.search(html):
+        raise BuildError("app.html is missing its <style>, fallback <script> or text/babel <script> block")
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, "app.js"), "w", encoding="utf-8") as f:
+        f.write(compile_jsx(jsx.group(1)))
+    build_css(style.group(1), tailwindcss, os.path.join(out_dir, "app.css"))
+    with open(os.path.join(out_dir, "app.html"), "w", encoding="utf-8") as f:
+        f.write(build_html(html, source_digest()))
+    for path in VENDOR_FILES:
+        shutil.copyfile(path, os.path.join(out_dir, os.path.basename(path)))
+
+def check():
+    """True if dist/app.html was built from the current app.html."""
+    try:
+        with open(os.path.join(DIST_DIR, "app.html"), encoding="utf-8") as f:
+            stamp = STAMP_RE.search(f.read())
+    except FileNotFoundError:
+        return False
+    return bool(stamp) and stamp.group(1) == source_digest()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="exit 1 if src/ui/dist is missing or stale")
+    parser.add_argument("--tailwindcss", help="path to a Tailwind CSS v3 standalone CLI")
+    parser.add_argument("--out", default=DIST_DIR, help="output directory (default: src/ui/dist)")
+    args = parser.parse_args()
+
+    if args.check:
+        if check():
+            print("src/ui/dist is up to date.")
+            return
+        print("src/ui/dist is missing or out of date: run scripts/build_ui.py", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        build(args.out, find_tailwindcss(args.tailwindcss))
+    except BuildError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    for name in sorted(os.listdir(args.out)):
+        size = os.path.getsize(os.path.join(args.out, name))
+        print(f"  {name:<32} {size / 1024:7.1f} KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+End-to-end check of chunked Whisper transcription against the local fake
+endpoint (scripts/fake_openai_server.py), no network or API key needed.
+
+Builds a long recording of tone bursts separated by short pauses, runs it
+through AIProcessor.transcribe once as a single request and once chunked,
+and checks that the chunked text has every burst exactly once and in order
+(a cut through a burst would show up as a duplicated word).
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/check_chunked_transcription.py [--minutes 10] [--target-s 60] [--parallel 4]
+"""
+import argparse
+import os
+import tempfile
+import time
+import numpy as np
+
+from scripts.fake_openai_server import FakeOpenAIServer, TONE_STEP_HZ
+from src.config import current_config
+from src.core.ai import AIProcessor
+from src.core.encoder import AudioFileWriter
+
+SAMPLE_RATE = 16000
+
+def synthetic_dictation(minutes: float, seed: int = 0, pause_s=(0.3, 1.2)):
+    """Int16 PCM of tone bursts (0.4-2.5s) with pauses (default 0.3-1.2s), plus the expected words."""
+    rng = np.random.default_rng(seed)
+    parts, words, total = [], [], 0
+    while total < minutes * 60 * SAMPLE_RATE:
+        freq = int(rng.integers(300 // TONE_STEP_HZ, 3000 // TONE_STEP_HZ)) * TONE_STEP_HZ
+        burst_n = int(rng.uniform(0.4, 2.5) * SAMPLE_RATE)
+        t = np.arange(burst_n) / SAMPLE_RATE
+        burst = 0.5 * np.sin(2 * np.pi * freq * t) * np.minimum(1, np.minimum(t, t[::-1]) / 0.02)
+        pause = np.zeros(int(rng.uniform(*pause_s) * SAMPLE_RATE))
+        parts += [burst, pause]
+        words.append(f"tone{freq}")
+        total += burst_n + len(pause)
+    audio = np.concatenate(parts) + 0.002 * rng.standard_normal(total)
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16), words
+
+def run(path, min_chunked_s):
+    current_config.chunk_min_recording_s = min_chunked_s
+    start = time.perf_counter()
+    text = AIProcessor().transcribe(path)
+    return text.split(), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--minutes", type=float, default=10)
+    parser.add_argument("--target-s", type=int, default=60)
+    parser.add_argument("--parallel", type=int, default=4)
+    parser.add_argument("--encoding", default="flac", choices=["wav", "flac"])
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--ms-per-audio-s", type=float, default=100)
+    args = parser.parse_args()
+
+    server = FakeOpenAIServer(latency_ms=args.latency_ms, ms_per_audio_s=args.ms_per_audio_s).start()
+    # In-memory only; nothing here is saved to the user's config file
+    current_config.openai_api_key = "sk-fake"
+    current_config.openai_base_url = server.base_url
+    current_config.transcription_model = "whisper-1"
+    current_config.upload_encoding = args.encoding
+    current_config.chunk_target_s = args.target_s
+    current_config.chunk_max_parallel = args.parallel
+
+    pcm, expected = synthetic_dictation(args.minutes)
+    writer = AudioFileWriter(os.path.join(tempfile.gettempdir(), "ghost_chunk_check"), SAMPLE_RATE, args.encoding)
+    writer.write(pcm.tobytes())
+    writer.close()
+
+    single, single_s = run(writer.path, 0)
+    server.requests.clear()
+    chunked, chunked_s = run(writer.path, 1)
+    chunks = [r for r in server.requests if r["kind"] == "transcription"]
+    os.remove(writer.path)
+
+    print(f"Audio: {len(pcm) / SAMPLE_RATE:.0f}s, {len(expected)} bursts")
+    print(f"Single request: {single_s:6.2f}s, words match: {single == expected}")
+    print(f"Chunked:        {chunked_s:6.2f}s, {len(chunks)} chunks, "
+          f"{sum(1 for c in chunks if c['prompt'])} with a prompt, words match: {chunked == expected}")
+    print(f"Speedup: {single_s / chunked_s:.1f}x")
+    if chunked != expected:
+        for i, (got, want) in enumerate(zip(chunked, expected)):
+            if got != want:
+                print(f"First mismatch at word {i}: got {got}, expected {want}")
+                break
+        else:
+            print(f"Length differs: got {len(chunked)}, expected {len(expected)}")
+    print("PASS" if chunked == expected else "FAIL")
+    server.shutdown()
+    raise SystemExit(0 if chunked == expected else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Local stand-in for the OpenAI endpoints Ghost Flow calls, for offline
+testing and benchmarks. Point the app (or a script) at it by setting
+`openai_base_url` to the printed URL.
+
+POST /v1/audio/transcriptions
+    "Transcribes" synthetic audio made of tone bursts separated by silence:
+    each burst becomes one word, tone<Hz> (rounded to 50 Hz), so callers can
+    check ordering and that no burst was cut in two. Responds after
+    --latency-ms plus --ms-per-audio-s for every second of audio received.
+POST /v1/chat/completions
+    Echoes the last user message back as the assistant reply. With
+    "stream": true the reply is sent as server-sent events, one word per
+    chunk: the first after --latency-ms, the rest at --tokens-per-s.
+ws /v1/realtime (FakeRealtimeServer, on its own port; needs `websockets`)
+    Input audio transcription over the realtime protocol: appended PCM16
+    (24kHz) is transcribed like an upload on commit, after the same
+    latency, and sent back as one delta per word plus a completed event.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/fake_openai_server.py [--port 8765] [--latency-ms 200] [--ms-per-audio-s 50] \
+        [--tokens-per-s 60] [--realtime-port 8766]
+"""
+import argparse
+import base64
+import io
+import json
+import re
+import threading
+import time
+import wave
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+try:
+    import soundfile
+except Exception:
+    soundfile = None
+
+try:
+    from websockets.sync.server import serve as serve_websocket
+except Exception:
+    serve_websocket = None
+
+TONE_STEP_HZ = 50
+FRAME_MS = 30
+REALTIME_RATE = 24000
+
+def decode_audio(data: bytes):
+    """Returns (float32 mono samples, sample_rate) for WAV, FLAC or Ogg bytes."""
+    if data[:4] == b"RIFF":
+        with wave.open(io.BytesIO(data), "rb") as wf:
+            rate = wf.getframerate()
+            pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+        return pcm.astype(np.float32) / 32768.0, rate
+    if soundfile is None:
+        raise ValueError("compressed upload needs soundfile")
+    samples, rate = soundfile.read(io.BytesIO(data), dtype="float32", always_2d=True)
+    return samples[:, 0], rate
+
+def tone_words(samples: np.ndarray, rate: int) -> list:
+    """One word per contiguous run of loud frames, named after its dominant frequency."""
+    frame = rate * FRAME_MS // 1000
+    n = len(samples) // frame
+    if n == 0:
+        return []
+    rms = np.sqrt((samples[:n * frame].reshape(n, frame) ** 2).mean(axis=1))
+    loud = rms > 0.05
+    words, start = [], None
+    for i, is_loud in enumerate(list(loud) + [False]):
+        if is_loud and start is None:
+            start = i
+        elif not is_loud and start is not None:
+            if i - start >= 2:
+                burst = samples[start * frame:i * frame]
+                spectrum = np.abs(np.fft.rfft(burst))
+                freq = np.argmax(spectrum) * rate / len(burst)
+                words.append(f"tone{int(round(freq / TONE_STEP_HZ) * TONE_STEP_HZ)}")
+            start = None
+    return words
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    server_version = "FakeOpenAI/1.0"
+
+    def log_message(self, fmt, *args):
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    def _json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _transcription(self):
+        raw = self._body()
+        message = BytesParser(policy=HTTP).parsebytes(
+            b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + raw
+        )
+        fields = {}
+        for part in message.iter_parts():
+            name = part.get_param("name", header="content-disposition")
+            fields[name] = part.get_payload(decode=True)
+
+        samples, rate = decode_audio(fields["file"])
+        audio_s = len(samples) / rate
+        prompt = (fields.get("prompt") or b"").decode()
+        self.server.record("transcription", {
+            "bytes": len(fields["file"]), "audio_s": round(audio_s, 3), "prompt": prompt,
+        })
+        time.sleep((self.server.latency_ms + self.server.ms_per_audio_s * audio_s) / 1000)
+        self._json(200, {"text": " ".join(tone_words(samples, rate))})
+
+    def _sse(self, payload):
+        self.wfile.write(b"data: " + json.dumps(payload).encode() + b"\n\n")
+        self.wfile.flush()
+
+    def _chat_stream(self, request, text):
+        tokens = re.findall(r"\S+\s*", text)
+        base = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                "model": request.get("model", "fake")}
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(1 / self.server.tokens_per_s)
+            self._sse({**base, "choices": [{"index": 0, "finish_reason": None, "delta": {"content": token}}]})
+        self._sse({**base, "choices": [{"index": 0, "finish_reason": "stop", "delta": {}}]})
+        if (request.get("stream_options") or {}).get("include_usage"):
+            self._sse({**base, "choices": [], "usage": {
+                "prompt_tokens": len(tokens), "completion_tokens": len(tokens), "total_tokens": 2 * len(tokens),
+            }})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _chat(self):
+        request = json.loads(self._body())
+        user = [m["content"] for m in request.get("messages", []) if m.get("role") == "user"]
+        text = user[-1] if user else ""
+        self.server.record("chat", {"model": request.get("model"), "chars": len(text),
+                                    "stream": bool(request.get("stream"))})
+        time.sleep(self.server.latency_ms / 1000)
+        if request.get("stream"):
+            self._chat_stream(request, text)
+            return
+        # Blocking replies wait for the whole generation, like the real API
+        time.sleep(max(0, len(text.split()) - 1) / self.server.tokens_per_s)
+        self._json(200, {
+            "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model", "fake"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": text}}],
+        })
+
+    def do_POST(self):
+        try:
+            if self.path.endswith("/audio/transcriptions"):
+                self._transcription()
+            elif self.path.endswith("/chat/completions"):
+                self._chat()
+            else:
+                self._json(404, {"error": {"message": f"Invalid URL (POST {self.path})"}})
+        except Exception as e:
+            self._json(400, {"error": {"message": str(e)}})
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency_ms=200, ms_per_audio_s=50, verbose=False, tokens_per_s=60):
+        super().__init__(("127.0.0.1", port), FakeOpenAIHandler)
+        self.latency_ms = latency_ms
+        self.ms_per_audio_s = ms_per_audio_s
+        self.tokens_per_s = tokens_per_s
+        self.verbose = verbose
+        self.requests = []
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def record(self, kind, details):
+        with self._lock:
+            self.requests.append({"kind": kind, "time": time.time(), **details})
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+class FakeRealtimeServer:
+    """Realtime transcription websocket, sharing latency settings with a FakeOpenAIServer."""
+
+    def __init__(self, http_server: FakeOpenAIServer, port=0):
+        if serve_websocket is None:
+            raise RuntimeError("FakeRealtimeServer needs the websockets package")
+        self.http = http_server
+        self._server = serve_websocket(self._handle, "127.0.0.1", port)
+        self._items = 0
+        self._lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"ws://127.0.0.1:{self._server.socket.getsockname()[1]}/v1/realtime"
+
+    def _item_id(self) -> str:
+        with self._lock:
+            self._items += 1
+            return f"item_fake{self._items}"
+
+    def _handle(self, ws):
+        audio = bytearray()
+        for message in ws:
+            event = json.loads(message)
+            kind = event.get("type")
+            if kind == "input_audio_buffer.clear":
+                audio = bytearray()
+            elif kind == "input_audio_buffer.append":
+                audio += base64.b64decode(event.get("audio", ""))
+            elif kind == "input_audio_buffer.commit":
+                self._commit(ws, bytes(audio))
+                audio = bytearray()
+
+    def _commit(self, ws, pcm: bytes):
+        item_id = self._item_id()
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        audio_s = len(samples) / REALTIME_RATE
+        self.http.record("realtime", {"bytes": len(pcm), "audio_s": round(audio_s, 3)})
+        ws.send(json.dumps({"type": "input_audio_buffer.committed", "item_id": item_id}))
+        time.sleep((self.http.latency_ms + self.http.ms_per_audio_s * audio_s) / 1000)
+        words = tone_words(samples, REALTIME_RATE)
+        for i, word in enumerate(words):
+            ws.send(json.dumps({"type": "conversation.item.input_audio_transcription.delta",
+                                "item_id": item_id, "delta": (" " if i else "") + word}))
+        ws.send(json.dumps({"type": "conversation.item.input_audio_transcription.completed",
+                            "item_id": item_id, "transcript": " ".join(words)}))
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def shutdown(self):
+        self._server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200)
+    parser.add_argument("--ms-per-audio-s", type=float, default=50)
+    parser.add_argument("--tokens-per-s", type=float, default=60)
+    parser.add_argument("--realtime-port", type=int, default=8766)
+    args = parser.parse_args()
+    server = FakeOpenAIServer(args.port, args.latency_ms, args.ms_per_audio_s, verbose=True,
+                              tokens_per_s=args.tokens_per_s)
+    print(f"Fake OpenAI API at {server.base_url}")
+    if serve_websocket is not None:
+        realtime = FakeRealtimeServer(server, args.realtime_port).start()
+        print(f"Fake realtime API at {realtime.url} (set realtime_url)")
+    server.serve_forever()
+
+if __name__ == "__main__":
+    main()
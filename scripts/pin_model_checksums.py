@@ -0,0 +1,44 @@
+"""
+Fetches the SHA-256 of every local model file and prints the
+EXPECTED_SHA256 table for src/core/model_manager.py. LFS files report their
+SHA-256 in the response headers; files stored in git (tokens.txt) are
+downloaded and hashed.
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/pin_model_checksums.py [--base-url URL]
+"""
+import argparse
+import hashlib
+import urllib.request
+
+from src.core.model_manager import BASE_URL, CHUNK_SIZE, FILES, ModelDownloader
+
+def sha256_of_url(url):
+    digest = hashlib.sha256()
+    with urllib.request.urlopen(url, timeout=30) as response:
+        for block in iter(lambda: response.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--base-url", default=BASE_URL)
+    args = parser.parse_args()
+
+    downloader = ModelDownloader(base_url=args.base_url)
+    lines = []
+    for filename in FILES:
+        url = args.base_url + filename
+        advertised = downloader.advertised_digest(url)
+        if advertised and advertised[0] == "sha256":
+            lines.append(f'    "{filename}": "{advertised[1]}",')
+        else:
+            print(f"Hashing {filename}...")
+            lines.append(f'    "{filename}": "{sha256_of_url(url)}",')
+
+    print("EXPECTED_SHA256 = {")
+    print("\n".join(lines))
+    print("}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Stress test for the audio callback ring buffer (Int16RingBuffer).
+
+A producer thread plays the PortAudio callback and pushes 30ms blocks of a
+running sample counter far faster than real time, while the consumer reads
+frames the way StreamingTranscriptionWorker does and checks every sample.
+
+  1. Fast consumer: every sample must arrive, in order, with zero overruns.
+  2. Stalled consumer: blocks are dropped whole once the ring is full, and
+     written + dropped must account for every produced sample.
+
+Also reports producer-side write() latency (what the audio thread pays).
+
+Usage (from the project root):
+    PYTHONPATH=. python scripts/stress_ring_buffer.py [--seconds 600] [--speedup 200]
+"""
+import argparse
+import threading
+import time
+import numpy as np
+
+from src.core.buffers import Int16RingBuffer
+
+SAMPLE_RATE = 16000
+FRAME_LEN = 480  # 30ms
+
+def produce(ring, blocks, interval_s, latencies):
+    block = np.empty((FRAME_LEN, 1), dtype=np.int16)  # callback indata shape
+    ramp = np.arange(FRAME_LEN, dtype=np.int64)
+    next_tick = time.perf_counter()
+    for i in range(blocks):
+        block[:, 0] = (i * FRAME_LEN + ramp) & 0x7FFF
+        start = time.perf_counter()
+        ring.write(block[:, 0])
+        latencies.append(time.perf_counter() - start)
+        next_tick += interval_s
+        delay = next_tick - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+def run_fast_consumer(blocks, interval_s):
+    ring = Int16RingBuffer(15 * SAMPLE_RATE, FRAME_LEN)
+    latencies = []
+    producer = threading.Thread(target=produce, args=(ring, blocks, interval_s, latencies))
+    producer.start()
+
+    expected = 0
+    received = 0
+    errors = 0
+    while producer.is_alive() or ring.available() >= FRAME_LEN:
+        frame = ring.read(timeout=0.05)
+        if frame is None:
+            continue
+        samples = np.frombuffer(frame, dtype=np.int16)
+        want = (expected + np.arange(len(samples))) & 0x7FFF
+        if not np.array_equal(samples, want):
+            errors += 1
+        expected += len(samples)
+        received += len(samples)
+    producer.join()
+    return ring, received, errors, latencies
+
+def run_stalled_consumer(blocks):
+    ring = Int16RingBuffer(2 * SAMPLE_RATE, FRAME_LEN)
+    latencies = []
+    # Producer runs flat out while nobody reads
+    produce(ring, blocks, 0.0, latencies)
+    received = 0
+    while ring.read() is not None:
+        received += FRAME_LEN
+    return ring, received
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=600, help="audio to push through the ring")
+    parser.add_argument("--speedup", type=float, default=200, help="callback rate relative to real time")
+    args = parser.parse_args()
+
+    blocks = int(args.seconds * SAMPLE_RATE / FRAME_LEN)
+    interval_s = FRAME_LEN / SAMPLE_RATE / args.speedup
+    produced = blocks * FRAME_LEN
+
+    start = time.perf_counter()
+    ring, received, errors, latencies = run_fast_consumer(blocks, interval_s)
+    elapsed = time.perf_counter() - start
+    lat_us = np.array(latencies) * 1e6
+    print(f"Fast consumer: {args.seconds:.0f}s of audio in {elapsed:.2f}s ({args.seconds / elapsed:.0f}x real time)")
+    print(f"  produced {produced}, received {received}, corrupt frames {errors}, "
+          f"overruns {ring.overruns}, peak fill {ring.high_water / SAMPLE_RATE:.2f}s")
+    print(f"  write() latency: p50 {np.percentile(lat_us, 50):.1f}us  p99 {np.percentile(lat_us, 99):.1f}us  "
+          f"max {lat_us.max():.1f}us")
+    fast_ok = received == produced and errors == 0 and ring.overruns == 0
+
+    stall_blocks = int(5 * SAMPLE_RATE / FRAME_LEN)
+    ring, received = run_stalled_consumer(stall_blocks)
+    stall_produced = stall_blocks * FRAME_LEN
+    written = received + ring.available()
+    print(f"Stalled consumer: produced {stall_produced}, delivered {received}, "
+          f"dropped {ring.dropped_samples} in {ring.overruns} overruns")
+    stall_ok = ring.overruns > 0 and written + ring.dropped_samples == stall_produced
+
+    print("PASS" if fast_ok and stall_ok else "FAIL")
+    raise SystemExit(0 if fast_ok and stall_ok else 1)
+
+if __name__ == "__main__":
+    main()
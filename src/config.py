@@ -1,7 +1,7 @@
 import json
 import os
 from dataclasses import dataclass, asdict, field
-from typing import List
+from typing import Dict, List
 
 CONFIG_FILE = os.path.expanduser("~/.ghostflow_config.json")
 
@@ -15,6 +15,7 @@ DEFAULT_SYSTEM_PROMPT = (
 @dataclass
 class Config:
     openai_api_key: str = ""
+    openai_base_url: str = ""  # Empty = api.openai.com; point at a stub server for offline testing
     transcription_model: str = "whisper-1" 
     model: str = "gpt-4o-mini"
     hotkey: str = "Key.f8"
@@ -23,12 +24,56 @@ class Config:
     
     # UI Customization
     overlay_position: str = "top-right" # top-right, top-left, bottom-right, bottom-left, center, bottom-center, top-center
+    overlay_renderer: str = "native"  # native (Qt painter) or web (a second Chromium view, like the settings window)
 
     # Streaming mode
     streaming_enabled: bool = False
     vad_silence_ms: int = 600
     vad_aggressiveness: int = 2
+    segment_max_parallel: int = 3  # Cloud segments transcribed at once while VAD keeps listening
+
+    # Realtime transcription sessions (kept open across VAD segments)
+    realtime_url: str = "wss://api.openai.com/v1/realtime"
+    realtime_pool_size: int = 3  # Raised to segment_max_parallel if lower
+    realtime_idle_timeout_s: int = 120
+    realtime_incremental: bool = True  # Append frames while speaking, commit on VAD silence
+
+    # Whisper uploads
+    upload_encoding: str = "auto"  # auto, wav, flac (lossless) or opus
+    upload_opus_below_kbps: int = 2000  # auto: use Opus instead of FLAC when measured uplink is slower
+
+    # Long batch recordings are split at pauses and transcribed in parallel
+    chunk_min_recording_s: int = 120  # Shorter recordings go up as one request (0 = never split)
+    chunk_target_s: int = 60
+    chunk_max_parallel: int = 4
+    speculative_transcription: bool = True  # Batch mode: transcribe finished sentences while still recording
+    speculative_chunk_s: int = 30  # Audio gathered before looking for a pause to send
+
+    # Refinement
+    refine_mode: str = "auto"  # auto: clean short transcripts locally, escalate messy ones; llm: always; local: never
+    refine_local_max_words: int = 25  # auto: longer transcripts go to the LLM
+    refine_local_max_disfluency: float = 0.08  # auto: fillers/stutters/self-corrections per word before escalating
+    refine_replacements: Dict[str, str] = field(default_factory=dict)  # Whole-word replacements, applied to every final transcript (all models)
+    refine_streaming: bool = True  # Stream the refined text into the overlay as it's generated
+    refine_early_paste: bool = False  # Paste complete sentences before the rest has arrived
+    refine_cache_enabled: bool = True  # Reuse results for repeated short phrases (same model and prompt)
+    refine_cache_max_chars: int = 300  # Longer transcripts are never cached
+    refine_cache_max_entries: int = 500
+    refine_cache_ttl_days: int = 30  # 0 = no expiry
+
+    # Local engine
+    local_incremental: bool = True  # Decode while recording and show live text
+    local_prewarm: bool = True  # Load the model in the background at startup / when selected
+    local_idle_unload_min: int = 0  # Free the model after this many idle minutes (0 = keep resident)
+    local_num_threads: int = 0  # 0 = auto (from physical core count)
+    local_provider: str = "cpu"  # ONNX Runtime execution provider: cpu, coreml
+    local_decoding_method: str = "greedy_search"  # or modified_beam_search
+    local_max_active_paths: int = 4  # Beam width for modified_beam_search
     
+    # History retention (0 = unlimited)
+    history_max_entries: int = 0
+    history_retention_days: int = 0
+
     # Cache for models that don't support temperature (to avoid 400 errors/roundtrips)
     reasoning_models: List[str] = field(default_factory=list)
 
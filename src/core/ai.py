@@ -1,17 +1,43 @@
 import os
-import io
-import wave
-import json
+import re
+import time
 import base64
+import threading
 import numpy as np
-from typing import Optional
-from scipy.signal import resample_poly
-from openai import OpenAI
-from websocket import create_connection, WebSocketTimeoutException
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 from src.config import current_config
+from src.core.realtime import realtime_pool, RealtimeConnectionError
+from src.core.resampler import StreamingResampler, resample_pcm16
+from src.core.encoder import (MAX_UPLOAD_BYTES, audio_duration, choose_upload_encoding, encode_pcm16,
+                              encoding_available, read_pcm16, upload_stats)
+from src.core.chunking import find_pause, split_at_silences
+from src.core.refine_cache import cacheable, get_refine_cache
+from src.core.local_refiner import apply_replacements, escalation_reason, local_refine
+from src.core.tracing import tracer
 
 REALTIME_SAMPLE_RATE = 24000
 REALTIME_BASE_MODEL = "gpt-realtime"
+# Whisper only looks at the last ~224 tokens of a prompt
+CHUNK_PROMPT_CHARS = 800
+# Each chunked-transcription lane after the first is prompted with a
+# transcript of the 5-10s before it, starting at a pause
+LANE_SEED_MAX_S = 10
+# Speculative chunks end in a pause at most this loud relative to the median
+# frame, outside the newest PAUSE_GUARD_S (which may still be mid-word).
+PAUSE_MAX_RATIO = 0.2
+PAUSE_GUARD_S = 0.5
+PAUSE_RETRY_S = 1.0
+
+# End of a sentence followed by whitespace: refined text up to here is safe to paste early
+SENTENCE_END_RE = re.compile(r"[.!?\u2026][\"')\]\u201d\u2019]*\s+")
+
+def sentence_prefix_end(text: str) -> int:
+    """Length of the longest prefix of `text` made of complete sentences (0 if none)."""
+    end = 0
+    for match in SENTENCE_END_RE.finditer(text):
+        end = match.end()
+    return end
 
 def is_realtime_transcription_model(model_id: Optional[str]) -> bool:
     return "transcribe" in (model_id or "").lower()
@@ -32,23 +58,245 @@ def normalize_realtime_transcription_model(model_id: Optional[str]) -> str:
         return "whisper-1"
     return model_id
 
+class RealtimeSegment:
+    """
+    Streams one VAD segment to a pooled realtime session frame by frame, so
+    only the commit is left to do when the speaker pauses. This shortens the
+    wait after a pause, not the time to first words: turn detection is off,
+    so the server sends no transcription deltas before the commit.
+    The session is acquired on a background thread (a cold pool means a TLS
+    handshake) and frames are queued until it's open, so append() never
+    stalls the VAD loop.
+    Frames are also kept locally; if the socket drops mid-segment the whole
+    segment is re-sent through the regular (retrying) path instead.
+    """
+
+    def __init__(self, processor, sample_rate: int):
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self.transcription_model = current_config.transcription_model
+        self._frames = []
+        self._pending = []  # resampled audio not yet sent
+        self._session = None
+        self._failed = False
+        self._cancelled = False
+        self._lock = threading.Lock()
+        self._opened = threading.Event()
+        self._resampler = None
+        if sample_rate != REALTIME_SAMPLE_RATE:
+            self._resampler = StreamingResampler(sample_rate, REALTIME_SAMPLE_RATE)
+        threading.Thread(target=self._open, daemon=True).start()
+
+    def _open(self):
+        url, headers, model = self.processor._realtime_endpoint(self.transcription_model)
+        session = None
+        try:
+            session = realtime_pool.acquire(url, headers, model)
+            session.begin()
+        except Exception as e:
+            print(f"DEBUG: Incremental realtime upload unavailable ({e}). Buffering segment.")
+            if session is not None:
+                realtime_pool.discard(session)
+            session = None
+
+        with self._lock:
+            cancelled = self._cancelled
+            if session is None:
+                self._failed = True
+            elif not cancelled:
+                self._session = session
+        if cancelled and session is not None:
+            self._recycle(session)
+        self._opened.set()
+
+    @staticmethod
+    def _recycle(session):
+        try:
+            session.begin()
+            realtime_pool.release(session)
+        except Exception:
+            realtime_pool.discard(session)
+
+    def _drop_session(self):
+        if self._session is not None:
+            realtime_pool.discard(self._session)
+            self._session = None
+        self._pending = []
+        self._failed = True
+
+    def append(self, pcm_bytes: bytes):
+        self._frames.append(pcm_bytes)
+        if self._failed:
+            return
+        pcm_24k = self._resampler.process_pcm16(pcm_bytes) if self._resampler else pcm_bytes
+        if pcm_24k:
+            self._pending.append(pcm_24k)
+        if self._session is not None:
+            self._flush()
+
+    def _flush(self):
+        """Sends the queued audio. Only the VAD loop and then commit() call it, never both at once."""
+        pending, self._pending = self._pending, []
+        for pcm_24k in pending:
+            try:
+                self._session.append(base64.b64encode(pcm_24k).decode("utf-8"))
+            except RealtimeConnectionError as e:
+                print(f"DEBUG: Realtime session lost mid-segment ({e}). Buffering segment.")
+                self._drop_session()
+                return
+
+    def commit(self, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        if not self._frames:
+            self.cancel()
+            return ""
+        with tracer.span("realtime_commit"):
+            return self._commit(on_delta)
+
+    def _commit(self, on_delta=None) -> str:
+        # Runs on the segment pool, so waiting for a slow handshake here is fine
+        self._opened.wait()
+        if self._session is not None:
+            if self._resampler:
+                # Push the resampler's filter tail so the last few ms aren't lost
+                tail = self._resampler.flush_pcm16()
+                if tail:
+                    self._pending.append(tail)
+            self._flush()
+
+        if self._session is not None:
+            session = self._session
+            self._session = None
+            try:
+                text = session.commit(on_delta)
+                realtime_pool.release(session)
+                return text
+            except RealtimeConnectionError as e:
+                print(f"DEBUG: Realtime session lost on commit ({e}). Re-sending segment.")
+                realtime_pool.discard(session)
+            except Exception:
+                realtime_pool.discard(session)
+                raise
+
+        pcm_bytes = b"".join(self._frames)
+        return self.processor._realtime_transcribe_pcm16(pcm_bytes, self.sample_rate, self.transcription_model)
+
+    def cancel(self):
+        """Drops the segment without transcribing it (e.g. too short). Doesn't wait for the session to open."""
+        self._frames = []
+        self._pending = []
+        with self._lock:
+            self._cancelled = True
+            session, self._session = self._session, None
+        if session is not None:
+            self._recycle(session)
+
+class SpeculativeTranscription:
+    """
+    Transcribes a batch (Whisper) recording while it is still being made.
+    The recorder's writer thread feeds it audio; each time speculative_chunk_s
+    has built up, everything before the latest clear pause is sent in the
+    background. Chunks go out one at a time, each prompted with the text
+    before it, so finish() only has to send the tail. If no pause shows up
+    by twice the chunk length, the quietest point is used instead.
+    """
+
+    def __init__(self, processor, sample_rate: int, model: str):
+        self.processor = processor
+        self.sample_rate = sample_rate
+        self.model = model
+        self.chunk_s = max(5, current_config.speculative_chunk_s)
+        self._pending = bytearray()
+        self._next_check = int(self.chunk_s * sample_rate) * 2
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative")
+        self._futures = []
+        self._texts = []
+        self._feed_error = None
+        self.sent_s = 0.0
+
+    def _find_cut(self):
+        samples = np.frombuffer(self._pending, dtype=np.int16)
+        forced = len(samples) >= 2 * self.chunk_s * self.sample_rate
+        return find_pause(samples, self.sample_rate, self.chunk_s / 2, PAUSE_GUARD_S,
+                          max_ratio=None if forced else PAUSE_MAX_RATIO)
+
+    def feed(self, pcm_bytes):
+        """Adds Int16 PCM (called on the recorder's writer thread)."""
+        if self._feed_error is not None:
+            return
+        try:
+            self._feed(pcm_bytes)
+        except Exception as e:
+            # finish() will raise so the caller re-transcribes the saved file instead
+            self._feed_error = e
+
+    def _feed(self, pcm_bytes):
+        self._pending += pcm_bytes
+        if len(self._pending) < self._next_check:
+            return
+        cut = self._find_cut()
+        if cut is None:
+            self._next_check = len(self._pending) + int(PAUSE_RETRY_S * self.sample_rate) * 2
+            return
+        chunk = bytes(self._pending[:cut * 2])
+        del self._pending[:cut * 2]
+        self._next_check = int(self.chunk_s * self.sample_rate) * 2
+        self.sent_s += cut / self.sample_rate
+        print(f"DEBUG: Speculatively transcribing {cut / self.sample_rate:.1f}s while recording")
+        self._futures.append(self._executor.submit(self._transcribe, chunk))
+
+    def _transcribe(self, pcm_bytes: bytes) -> str:
+        prompt = self._texts[-1][-CHUNK_PROMPT_CHARS:] if self._texts else None
+        duration_s = len(pcm_bytes) / 2 / self.sample_rate
+        filename, data = encode_pcm16(pcm_bytes, self.sample_rate, choose_upload_encoding(duration_s, self.sample_rate))
+        text = self.processor._upload_transcription(self.model, (filename, data), len(data), prompt=prompt or None)
+        self._texts.append(text)
+        return text
+
+    def finish(self) -> str:
+        """Sends the remaining tail and returns the whole text in order. Raises if any chunk failed."""
+        if self._feed_error is not None:
+            self.cancel()
+            raise RuntimeError(f"Speculative transcription lost audio: {self._feed_error}")
+        tail_s = len(self._pending) / 2 / self.sample_rate
+        print(f"DEBUG: Speculative: {self.sent_s:.1f}s already sent, sending {tail_s:.1f}s tail")
+        if self._pending:
+            self._futures.append(self._executor.submit(self._transcribe, bytes(self._pending)))
+            self._pending = bytearray()
+        try:
+            texts = [f.result() for f in self._futures]
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        return " ".join(t.strip() for t in texts if t and t.strip())
+
+    def cancel(self):
+        """Abandons the recording (e.g. it was silent)."""
+        self._pending = bytearray()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
 class AIProcessor:
     def __init__(self):
-        # Cached OpenAI client and the API key used to construct it.
-        # Tracking the key allows us to recreate the client if the user
+        # Cached OpenAI client and the API key / base URL used to construct it.
+        # Tracking them allows us to recreate the client if the user
         # updates their preferences at runtime.
         self.client = None
         self._client_api_key = None
+        self._client_base_url = None
+        self.last_refine_metrics = None
 
     def _get_client(self):
         # Ensure an API key exists
         if not current_config.openai_api_key:
             raise ValueError("OpenAI API Key is missing. Please check Preferences.")
 
-        # Recreate the client if it's missing or the API key changed
-        if self.client is None or current_config.openai_api_key != self._client_api_key:
-            self.client = OpenAI(api_key=current_config.openai_api_key)
+        # Recreate the client if it's missing or the API key / endpoint changed
+        if (self.client is None or current_config.openai_api_key != self._client_api_key
+                or current_config.openai_base_url != self._client_base_url):
+            # Imported on first use: the openai package alone adds most of a second to startup
+            from openai import OpenAI
+            self.client = OpenAI(api_key=current_config.openai_api_key,
+                                 base_url=current_config.openai_base_url or None)
             self._client_api_key = current_config.openai_api_key
+            self._client_base_url = current_config.openai_base_url
 
         return self.client
 
@@ -58,10 +306,46 @@ class AIProcessor:
         if not pcm_bytes:
             return b""
 
-        audio = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32)
-        resampled = resample_poly(audio, REALTIME_SAMPLE_RATE, sample_rate)
-        resampled = np.clip(resampled, -32768, 32767).astype(np.int16)
-        return resampled.tobytes()
+        with tracer.span("resample"):
+            return resample_pcm16(pcm_bytes, sample_rate, REALTIME_SAMPLE_RATE)
+
+    def _realtime_endpoint(self, transcription_model: str):
+        url = f"{current_config.realtime_url}?model={REALTIME_BASE_MODEL}"
+        headers = [
+            f"Authorization: Bearer {current_config.openai_api_key}",
+            "OpenAI-Beta: realtime=v1",
+        ]
+        # Overlapping segments each hold a session until their commit returns
+        pool_size = max(current_config.realtime_pool_size, current_config.segment_max_parallel)
+        realtime_pool.configure(pool_size, current_config.realtime_idle_timeout_s)
+        return url, headers, normalize_realtime_transcription_model(transcription_model)
+
+    def warm_realtime(self):
+        """Opens pooled realtime sessions in the background so the first segment skips the handshake."""
+        model = current_config.transcription_model
+        if not current_config.openai_api_key or not is_realtime_transcription_model(model):
+            return
+        url, headers, model = self._realtime_endpoint(model)
+        threading.Thread(target=realtime_pool.warm, args=(url, headers, model), daemon=True).start()
+
+    def open_realtime_segment(self, sample_rate: int) -> Optional[RealtimeSegment]:
+        """Returns an incremental upload for the next VAD segment, or None if it doesn't apply."""
+        if not current_config.realtime_incremental:
+            return None
+        if not current_config.openai_api_key or not is_realtime_transcription_model(current_config.transcription_model):
+            return None
+        return RealtimeSegment(self, sample_rate)
+
+    def open_speculative(self, sample_rate: int) -> Optional[SpeculativeTranscription]:
+        """Returns a background transcriber for a Whisper batch recording, or None if it doesn't apply."""
+        model = current_config.transcription_model
+        if not current_config.speculative_transcription or not current_config.openai_api_key:
+            return None
+        if is_realtime_transcription_model(model) or model == "local-parakeet":
+            return None
+        if not is_whisper_model(model):
+            model = "whisper-1"
+        return SpeculativeTranscription(self, sample_rate, model)
 
     def _realtime_transcribe_pcm16(self, pcm_bytes: bytes, sample_rate: int, transcription_model: str) -> str:
         if not pcm_bytes:
@@ -70,85 +354,54 @@ class AIProcessor:
         pcm_24k = self._resample_to_realtime_rate(pcm_bytes, sample_rate)
         audio_b64 = base64.b64encode(pcm_24k).decode("utf-8")
 
-        transcription_model = normalize_realtime_transcription_model(transcription_model)
-
-        url = f"wss://api.openai.com/v1/realtime?model={REALTIME_BASE_MODEL}"
-        headers = [
-            f"Authorization: Bearer {current_config.openai_api_key}",
-            "OpenAI-Beta: realtime=v1",
-        ]
-
-        ws = create_connection(url, header=headers)
-        ws.settimeout(10)
-        completed_transcript = None
-        delta_parts = []
+        url, headers, transcription_model = self._realtime_endpoint(transcription_model)
+
+        # A pooled socket may have been dropped by the server while idle.
+        # Nothing was transcribed in that case, so retry once on a fresh one.
+        for attempt in range(2):
+            session = realtime_pool.acquire(url, headers, transcription_model)
+            try:
+                text = session.transcribe(audio_b64)
+            except RealtimeConnectionError as e:
+                realtime_pool.discard(session)
+                if attempt == 0:
+                    print(f"DEBUG: Realtime session lost ({e}). Reconnecting...")
+                    continue
+                raise
+            except Exception:
+                realtime_pool.discard(session)
+                raise
+            realtime_pool.release(session)
+            return text
+
+    def _upload_transcription(self, model: str, file, num_bytes: int, prompt: Optional[str] = None) -> str:
+        """Sends one file to the Whisper endpoint and feeds the upload timing into upload_stats."""
+        client = self._get_client()
+        kwargs = {"prompt": prompt} if prompt else {}
         try:
-            session_update = {
-                "type": "session.update",
-                "session": {
-                    "input_audio_format": "pcm16",
-                    "input_audio_transcription": {"model": transcription_model, "language": "en"},
-                    "turn_detection": None,
-                },
-            }
-            ws.send(json.dumps(session_update))
-            ws.send(json.dumps({"type": "input_audio_buffer.append", "audio": audio_b64}))
-            ws.send(json.dumps({"type": "input_audio_buffer.commit"}))
-
-            while True:
-                try:
-                    raw = ws.recv()
-                except WebSocketTimeoutException:
-                    break
-
-                if not raw:
-                    break
-                if isinstance(raw, bytes):
-                    raw = raw.decode("utf-8")
-                event = json.loads(raw)
-                event_type = event.get("type", "")
-
-                if event_type == "conversation.item.input_audio_transcription.delta":
-                    delta = event.get("delta", "")
-                    if delta:
-                        delta_parts.append(delta)
-                elif event_type == "conversation.item.input_audio_transcription.completed":
-                    completed_transcript = event.get("transcript", "")
-                    break
-                elif event_type == "error":
-                    err = event.get("error", {})
-                    message = err.get("message", "Realtime API error")
-                    raise ValueError(message)
-        finally:
-            ws.close()
-
-        if completed_transcript is not None:
-            return completed_transcript.strip()
-        return "".join(delta_parts).strip()
-
-    def _read_wav_pcm16(self, audio_path: str) -> tuple[bytes, int]:
-        with wave.open(audio_path, 'rb') as wf:
-            sample_rate = wf.getframerate()
-            channels = wf.getnchannels()
-            sample_width = wf.getsampwidth()
-            pcm_bytes = wf.readframes(wf.getnframes())
-
-        if sample_width != 2:
-            raise ValueError("Realtime transcription expects 16-bit PCM WAV input.")
-
-        if channels > 1:
-            audio = np.frombuffer(pcm_bytes, dtype=np.int16)
-            audio = audio.reshape(-1, channels)[:, 0]
-            pcm_bytes = audio.astype(np.int16).tobytes()
-
-        return pcm_bytes, sample_rate
+            start = time.perf_counter()
+            with tracer.span("upload"):
+                transcript = client.audio.transcriptions.create(
+                    model=model,
+                    file=file,
+                    language="en",
+                    **kwargs,
+                )
+            upload_stats.record(num_bytes, time.perf_counter() - start)
+            return transcript.text
+        except Exception as e:
+            print(f"DEBUG: Transcription API error: {e}")
+            if "404" in str(e) and "Invalid URL" in str(e):
+                raise ValueError("API Endpoint Error: Ensure you are using 'whisper-1' for transcription.")
+            raise e
 
     def transcribe(self, audio_path: str) -> str:
         client = self._get_client()
         
         model_to_use = current_config.transcription_model
         if is_realtime_transcription_model(model_to_use):
-            pcm_bytes, sample_rate = self._read_wav_pcm16(audio_path)
+            # Batch recordings for realtime models are WAV, but the reader handles encoded files too
+            pcm_bytes, sample_rate = read_pcm16(audio_path)
             return self._realtime_transcribe_pcm16(pcm_bytes, sample_rate, model_to_use)
 
         # OpenAI's audio endpoint is strict about model names.
@@ -156,21 +409,138 @@ class AIProcessor:
             print(f"DEBUG: Configured model '{model_to_use}' not compatible with audio endpoint. Falling back to 'whisper-1'.")
             model_to_use = "whisper-1"
             
-        try:
-            with open(audio_path, "rb") as audio_file:
-                transcript = client.audio.transcriptions.create(
-                    model=model_to_use,
-                    file=audio_file,
-                    language="en"
-                )
-            return transcript.text
-        except Exception as e:
-            print(f"DEBUG: Transcription API error: {e}")
-            if "404" in str(e) and "Invalid URL" in str(e):
-                raise ValueError("API Endpoint Error: Ensure you are using 'whisper-1' for transcription.")
-            raise e
-
-    def refine(self, raw_text: str) -> str:
+        min_chunked_s = current_config.chunk_min_recording_s
+        if min_chunked_s > 0 and audio_duration(audio_path) >= min_chunked_s:
+            pcm_bytes, sample_rate = read_pcm16(audio_path)
+            return self.transcribe_chunked(pcm_bytes, sample_rate, model_to_use)
+
+        # The recorder already encoded the file (see choose_upload_encoding) while recording.
+        # Its length wasn't known then, so one that came out over the limit is re-encoded now.
+        size = os.path.getsize(audio_path)
+        if size > MAX_UPLOAD_BYTES and not audio_path.endswith(".ogg") and encoding_available("opus"):
+            pcm_bytes, sample_rate = read_pcm16(audio_path)
+            filename, data = encode_pcm16(pcm_bytes, sample_rate, "opus")
+            print(f"DEBUG: Recording is {size / 1e6:.1f} MB, over the upload limit. Re-encoded to {filename} ({len(data) / 1e6:.1f} MB)")
+            return self._upload_transcription(model_to_use, (filename, data), len(data))
+        with open(audio_path, "rb") as audio_file:
+            return self._upload_transcription(model_to_use, audio_file, size)
+
+    def _transcribe_lane(self, chunks, sample_rate: int, model: str, failed: threading.Event,
+                         seed: Optional[bytes] = None) -> list:
+        """
+        Transcribes consecutive chunks in order, prompting each with the text
+        before it. The first is prompted with the transcript of `seed`, the
+        audio just before the lane, if given.
+        """
+        texts = []
+        prompt = None
+        if seed:
+            seed_s = len(seed) / 2 / sample_rate
+            filename, data = encode_pcm16(seed, sample_rate, choose_upload_encoding(seed_s, sample_rate))
+            try:
+                prompt = self._upload_transcription(model, (filename, data), len(data)) or None
+            except Exception as e:
+                print(f"DEBUG: Lane seed transcription failed ({e}). Starting without a prompt.")
+        for pcm_bytes in chunks:
+            if failed.is_set():
+                return texts
+            duration_s = len(pcm_bytes) / 2 / sample_rate
+            filename, data = encode_pcm16(pcm_bytes, sample_rate, choose_upload_encoding(duration_s, sample_rate))
+            try:
+                text = self._upload_transcription(model, (filename, data), len(data), prompt=prompt)
+            except Exception:
+                failed.set()
+                raise
+            texts.append(text)
+            prompt = text[-CHUNK_PROMPT_CHARS:] or None
+        return texts
+
+    def transcribe_chunked(self, pcm_bytes: bytes, sample_rate: int, model: str) -> str:
+        """
+        Splits a long recording at pauses (about chunk_target_s each) and
+        transcribes it over the shared client with at most chunk_max_parallel
+        requests in flight. Each worker takes a contiguous run of chunks and
+        works through it in order, prompting every chunk with the previous
+        chunk's text. The first chunk of a later run has no previous text yet,
+        so its worker first transcribes the last few seconds before the run
+        (see lane_seed) and uses that. This costs each of those runs one
+        short extra request.
+        """
+        samples = np.frombuffer(pcm_bytes, dtype=np.int16)
+        bounds = split_at_silences(samples, sample_rate, current_config.chunk_target_s)
+        workers = max(1, min(current_config.chunk_max_parallel, len(bounds)))
+        lanes = np.array_split(np.arange(len(bounds)), workers)
+        print(f"DEBUG: Transcribing {len(samples) / sample_rate:.0f}s in {len(bounds)} chunks ({workers} parallel)")
+
+        self._get_client()  # create the shared client before the workers race for it
+        failed = threading.Event()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="whisper-chunk") as pool:
+            futures = [
+                pool.submit(self._transcribe_lane,
+                            [samples[bounds[i][0]:bounds[i][1]].tobytes() for i in lane],
+                            sample_rate, model, failed,
+                            self.lane_seed(samples, bounds[lane[0]][0], sample_rate) if lane[0] else None)
+                for lane in lanes
+            ]
+            texts = [text for future in futures for text in future.result()]
+        return " ".join(t.strip() for t in texts if t and t.strip())
+
+    @staticmethod
+    def lane_seed(samples: np.ndarray, end: int, sample_rate: int) -> bytes:
+        """Up to LANE_SEED_MAX_S of audio before `end`, starting at the quietest pause in its first half."""
+        start = max(0, end - LANE_SEED_MAX_S * sample_rate)
+        window = samples[start:end]
+        pause = find_pause(window, sample_rate, 0, LANE_SEED_MAX_S / 2)
+        return window[pause or 0:].tobytes()
+
+    def refine(self, raw_text: str, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Polishes a transcript with the chat model. With refine_streaming on,
+        the reply is streamed and on_delta gets the text so far as it grows.
+        Time to first token and tokens/s end up in last_refine_metrics.
+        In refine_mode "auto", clean short transcripts are refined locally
+        and only escalated to the model when escalation_reason() says so.
+        Short phrases are answered from the refine cache when possible.
+        """
+        with tracer.span("refine"):
+            return self._refine(raw_text, on_delta)
+
+    def _refine(self, raw_text: str, on_delta=None) -> str:
+        mode = current_config.refine_mode
+        reason = "llm mode" if mode == "llm" else None
+        if mode == "auto":
+            reason = escalation_reason(raw_text)
+        if reason is None:
+            start = time.perf_counter()
+            text = local_refine(raw_text)
+            elapsed = time.perf_counter() - start
+            self.last_refine_metrics = {"local": True, "total_s": round(elapsed, 6)}
+            print(f"DEBUG: Refined locally in {elapsed * 1e6:.0f}us")
+            if on_delta and text:
+                on_delta(text)
+            return text
+        if mode == "auto":
+            print(f"DEBUG: Escalating refinement to {current_config.model} ({reason})")
+
+        # The model sees the user's dictionary terms already in place
+        raw_text = apply_replacements(raw_text, current_config.refine_replacements)
+        use_cache = cacheable(raw_text)
+        if use_cache:
+            start = time.perf_counter()
+            cached = get_refine_cache().get(current_config.model, current_config.system_prompt, raw_text)
+            if cached is not None:
+                self.last_refine_metrics = {"cached": True, "total_s": round(time.perf_counter() - start, 4)}
+                print(f"DEBUG: Refine cache hit ({get_refine_cache().stats()})")
+                if on_delta:
+                    on_delta(cached)
+                return cached
+
+        result = self._refine_uncached(raw_text, on_delta)
+        if use_cache and result:
+            get_refine_cache().put(current_config.model, current_config.system_prompt, raw_text, result)
+        return result
+
+    def _refine_uncached(self, raw_text: str, on_delta=None) -> str:
         client = self._get_client()
         
         messages = [
@@ -192,7 +562,12 @@ class AIProcessor:
             }
             if use_temp:
                 kwargs["temperature"] = 0.3
+            stream = current_config.refine_streaming
+            if stream:
+                kwargs["stream"] = True
+                kwargs["stream_options"] = {"include_usage": True}
 
+            start = time.perf_counter()
             response = client.chat.completions.create(**kwargs)
 
         except Exception as e:
@@ -212,10 +587,51 @@ class AIProcessor:
             else:
                 raise e
 
+        if stream:
+            return self._read_refine_stream(response, start, on_delta)
+        self.last_refine_metrics = {"streamed": False, "total_s": round(time.perf_counter() - start, 3)}
         return response.choices[0].message.content.strip()
 
+    def _read_refine_stream(self, response, start: float, on_delta=None) -> str:
+        text = ""
+        first_token_at = None
+        chunks = 0
+        usage_tokens = None
+        for event in response:
+            if getattr(event, "usage", None):
+                usage_tokens = event.usage.completion_tokens
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if not delta:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            text += delta
+            chunks += 1
+            if on_delta:
+                on_delta(text.lstrip())
+        end = time.perf_counter()
+
+        # Each content chunk is about one token if the server doesn't report usage
+        tokens = usage_tokens or chunks
+        ttft_s = (first_token_at or end) - start
+        generation_s = end - (first_token_at or end)
+        # The first token's wait is TTFT; the rate is over the tokens that followed it
+        tokens_per_s = (tokens - 1) / generation_s if tokens > 1 and generation_s > 0 else None
+        self.last_refine_metrics = {
+            "streamed": True,
+            "ttft_s": round(ttft_s, 3),
+            "total_s": round(end - start, 3),
+            "tokens": tokens,
+            "tokens_per_s": round(tokens_per_s, 1) if tokens_per_s else None,
+        }
+        print(f"DEBUG: Refine streamed: TTFT {ttft_s:.2f}s, {tokens} tokens"
+              f"{f' at {tokens_per_s:.0f} tok/s' if tokens_per_s else ''}, total {end - start:.2f}s")
+        return text.strip()
+
     def transcribe_pcm16(self, pcm_bytes: bytes, sample_rate: int) -> str:
-        """Transcribe raw PCM16 mono bytes using an in-memory WAV buffer."""
+        """Transcribe raw PCM16 mono bytes, encoded in memory per upload_encoding."""
         if not pcm_bytes:
             return ""
 
@@ -223,16 +639,8 @@ class AIProcessor:
         if is_realtime_transcription_model(model_to_use):
             return self._realtime_transcribe_pcm16(pcm_bytes, sample_rate, model_to_use)
 
-        # Write PCM16 bytes into an in-memory WAV container
-        buf = io.BytesIO()
-        with wave.open(buf, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)  # 16-bit PCM
-            wf.setframerate(sample_rate)
-            wf.writeframes(pcm_bytes)
-        buf.seek(0)
-
-        client = self._get_client()
+        duration_s = len(pcm_bytes) / 2 / sample_rate
+        filename, data = encode_pcm16(pcm_bytes, sample_rate, choose_upload_encoding(duration_s, sample_rate))
 
         # Ensure a compatible model is selected for audio endpoint
         model_to_use = current_config.transcription_model
@@ -240,15 +648,4 @@ class AIProcessor:
             print(f"DEBUG: Configured model '{model_to_use}' not compatible with audio endpoint. Falling back to 'whisper-1'.")
             model_to_use = "whisper-1"
 
-        try:
-            transcript = client.audio.transcriptions.create(
-                model=model_to_use,
-                file=("audio.wav", buf),
-                language="en",
-            )
-            return transcript.text
-        except Exception as e:
-            print(f"DEBUG: Transcription API error: {e}")
-            if "404" in str(e) and "Invalid URL" in str(e):
-                raise ValueError("API Endpoint Error: Ensure you are using 'whisper-1' for transcription.")
-            raise e
+        return self._upload_transcription(model_to_use, (filename, data), len(data))
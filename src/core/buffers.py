@@ -0,0 +1,146 @@
+import time
+import numpy as np
+
+PCM16_SCALE = np.float32(1.0 / 32768.0)
+
+# How often a waiting Int16RingBuffer reader re-checks for data. The
+# producer never signals (that would take a lock on the audio thread).
+RING_POLL_S = 0.005
+
+class SampleBuffer:
+    """
+    Growable contiguous float32 sample buffer. Int16 PCM frames are scaled to
+    [-1, 1] directly into the backing array, so appending allocates nothing
+    until capacity runs out (then it doubles). view() hands out zero-copy
+    slices; clear() keeps the capacity for the next session.
+    """
+
+    def __init__(self, capacity: int):
+        self._data = np.empty(max(1, capacity), dtype=np.float32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        self._size = 0
+
+    def _reserve(self, n: int):
+        needed = self._size + n
+        if needed <= len(self._data):
+            return
+        # Old views keep the previous array alive, so pending readers stay valid
+        grown = np.empty(max(needed, 2 * len(self._data)), dtype=np.float32)
+        grown[:self._size] = self._data[:self._size]
+        self._data = grown
+
+    def append_pcm16(self, pcm_bytes: bytes) -> np.ndarray:
+        """Appends Int16 PCM bytes and returns a view of the converted frame."""
+        src = np.frombuffer(pcm_bytes, dtype=np.int16)
+        self._reserve(len(src))
+        out = self._data[self._size:self._size + len(src)]
+        np.multiply(src, PCM16_SCALE, out=out)
+        self._size += len(src)
+        return out
+
+    def append(self, samples: np.ndarray):
+        self._reserve(len(samples))
+        self._data[self._size:self._size + len(samples)] = samples
+        self._size += len(samples)
+
+    def view(self, start: int = 0, end=None) -> np.ndarray:
+        end = self._size if end is None else min(end, self._size)
+        return self._data[start:end]
+
+class Int16RingBuffer:
+    """
+    Preallocated single-producer/single-consumer ring of Int16 samples.
+
+    The audio callback (producer) copies each block in with write() and
+    never allocates, blocks or takes a lock: each side only advances its own
+    counter, and the GIL makes those int updates atomic. If the consumer
+    falls behind, the incoming block is dropped whole and counted in
+    `overruns` / `dropped_samples` (the producer must not move the read
+    position). read() hands out contiguous memoryviews of at most
+    `frame_len` samples; a frame straddling the end of the ring is copied
+    into a spill area past the end, so no read ever allocates either.
+    """
+
+    def __init__(self, capacity: int, frame_len: int):
+        self._size = 1 << max(1, int(capacity) - 1).bit_length()
+        self._mask = self._size - 1
+        self.frame_len = frame_len
+        # [size:] is consumer-owned spill space for wrapped frames
+        self._data = np.zeros(self._size + frame_len, dtype=np.int16)
+        self.reset()
+
+    @property
+    def capacity(self) -> int:
+        return self._size
+
+    def reset(self):
+        """Empties the ring and zeroes the counters. Only call with the producer stopped."""
+        self._head = 0           # samples written (producer only)
+        self._tail = 0           # samples released (consumer only)
+        self._pending = 0        # samples handed out by the last read()
+        self.overruns = 0
+        self.dropped_samples = 0
+        self.high_water = 0
+        self.first_write_at = None  # perf_counter of the first block, for latency tracing
+
+    def available(self) -> int:
+        return self._head - self._tail - self._pending
+
+    def free(self) -> int:
+        """Samples write() would accept right now."""
+        return self._size - (self._head - self._tail)
+
+    def write(self, samples: np.ndarray) -> bool:
+        """Producer side: copies a block in. Returns False (and counts an overrun) if it doesn't fit."""
+        n = len(samples)
+        if self.first_write_at is None:
+            self.first_write_at = time.perf_counter()
+        used = self._head - self._tail
+        if n > self._size - used:
+            self.overruns += 1
+            self.dropped_samples += n
+            return False
+        pos = self._head & self._mask
+        first = min(n, self._size - pos)
+        self._data[pos:pos + first] = samples[:first]
+        if first < n:
+            self._data[:n - first] = samples[first:]
+        # Publish only after the samples are in place
+        self._head += n
+        if used + n > self.high_water:
+            self.high_water = used + n
+        return True
+
+    def read(self, n: int = None, timeout: float = 0.0):
+        """
+        Consumer side: returns a read-only byte memoryview of the next n
+        samples (default frame_len), or None if fewer are buffered within
+        `timeout` seconds. The view stays valid until the next read().
+        """
+        n = self.frame_len if n is None else min(n, self.frame_len)
+        # Release the previous frame now that the caller is done with it
+        self._tail += self._pending
+        self._pending = 0
+
+        if self._head - self._tail < n:
+            deadline = time.monotonic() + timeout
+            while self._head - self._tail < n:
+                if time.monotonic() >= deadline:
+                    return None
+                time.sleep(RING_POLL_S)
+
+        pos = self._tail & self._mask
+        end = pos + n
+        if end > self._size:
+            self._data[self._size:end] = self._data[:end - self._size]
+        self._pending = n
+        return memoryview(self._data[pos:end]).cast("B").toreadonly()
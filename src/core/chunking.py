@@ -0,0 +1,64 @@
+import numpy as np
+
+FRAME_MS = 30
+# Energy is averaged over this window so cuts land in real pauses, not
+# between two syllables that happen to have one quiet frame.
+PAUSE_WINDOW_MS = 300
+
+def frame_energy(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Mean power of each FRAME_MS frame of Int16 samples, smoothed over PAUSE_WINDOW_MS."""
+    frame = sample_rate * FRAME_MS // 1000
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32)
+    frames = samples[:n_frames * frame].astype(np.float32).reshape(n_frames, frame)
+    energy = np.einsum("ij,ij->i", frames, frames) / frame
+    window = max(1, PAUSE_WINDOW_MS // FRAME_MS)
+    return np.convolve(energy, np.ones(window, dtype=np.float32) / window, mode="same")
+
+def find_silence_cuts(samples: np.ndarray, sample_rate: int, target_s: float, max_s: float = None) -> list:
+    """
+    Sample offsets that split `samples` into chunks of roughly target_s
+    (between target_s / 2 and max_s, default 1.5 * target_s), each cut at
+    the quietest pause in that range. Returns [] if no split is needed.
+    """
+    max_s = max_s or target_s * 1.5
+    frame = sample_rate * FRAME_MS // 1000
+    energy = frame_energy(samples, sample_rate)
+    min_frames = max(1, int(target_s * 500 / FRAME_MS))
+    max_frames = max(min_frames + 1, int(max_s * 1000 / FRAME_MS))
+
+    cuts = []
+    start = 0
+    while len(energy) - start > max_frames:
+        lo = start + min_frames
+        hi = start + max_frames
+        best = lo + int(np.argmin(energy[lo:hi]))
+        cuts.append(best * frame)
+        start = best
+    return cuts
+
+def split_at_silences(samples: np.ndarray, sample_rate: int, target_s: float, max_s: float = None) -> list:
+    """(start, end) sample ranges covering `samples`, cut by find_silence_cuts."""
+    cuts = find_silence_cuts(samples, sample_rate, target_s, max_s)
+    starts = [0] + cuts
+    ends = cuts + [len(samples)]
+    return list(zip(starts, ends))
+
+def find_pause(samples: np.ndarray, sample_rate: int, min_s: float, guard_s: float,
+               max_ratio: float = None):
+    """
+    Offset of the quietest pause in samples[min_s : len - guard_s], or None
+    if there is no room. With max_ratio, the pause must also be at most
+    max_ratio times the median energy (i.e. a real gap, not just a soft word).
+    """
+    frame = sample_rate * FRAME_MS // 1000
+    energy = frame_energy(samples, sample_rate)
+    lo = int(min_s * 1000 / FRAME_MS)
+    hi = len(energy) - int(guard_s * 1000 / FRAME_MS)
+    if hi <= lo:
+        return None
+    best = lo + int(np.argmin(energy[lo:hi]))
+    if max_ratio is not None and energy[best] > max_ratio * np.median(energy):
+        return None
+    return best * frame
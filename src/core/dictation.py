@@ -0,0 +1,389 @@
+import threading
+import time
+from typing import Callable, Optional
+from src.config import current_config
+from src.core.ai import AIProcessor, is_realtime_transcription_model, sentence_prefix_end
+from src.core.encoder import choose_upload_encoding
+from src.core.history import HistoryManager
+from src.core.local_engine import LocalParakeetEngine
+from src.core.model_manager import ModelManager
+from src.core.realtime import realtime_pool
+from src.core.recorder import AudioRecorder
+from src.core.refine_cache import get_refine_cache
+from src.core.tracing import tracer
+from src.core.transcription import BatchTranscription, StreamingTranscription, webrtcvad
+
+LOCAL_MODEL = "local-parakeet"
+
+class EngineLoadError(Exception):
+    """Raised by DictationCore.start() when the local engine can't be loaded."""
+
+class DictationListener:
+    """
+    Receives DictationCore's results. Every method runs on one of the core's
+    worker threads, so a GUI has to hand them to its own thread.
+    """
+
+    def on_partial(self, finalized_text: str, live_text: str):
+        """Streaming: text so far while still recording."""
+        pass
+
+    def on_segment(self, text: str):
+        """Streaming (cloud): a completed VAD segment."""
+        pass
+
+    def on_refine_progress(self, text: str):
+        """Batch: the refined text so far."""
+        pass
+
+    def on_early_paste(self, text: str):
+        """Batch, with refine_early_paste: complete sentences ready before refinement ends."""
+        pass
+
+    def on_result(self, text: str, streaming: bool):
+        """Final text (empty if nothing was said), already saved to history."""
+        pass
+
+    def on_error(self, message: str, streaming: bool):
+        pass
+
+    def on_engine_error(self, message: str):
+        """The local engine's background pre-warm failed."""
+        pass
+
+def local_engine_options():
+    """LocalParakeetEngine runtime settings from the current config."""
+    return (
+        current_config.local_num_threads,
+        current_config.local_provider,
+        current_config.local_decoding_method,
+        current_config.local_max_active_paths,
+    )
+
+def build_local_engine():
+    num_threads, provider, decoding_method, max_active_paths = local_engine_options()
+    return LocalParakeetEngine(
+        ModelManager.get_model_paths(),
+        incremental=current_config.local_incremental,
+        vad_aggressiveness=current_config.vad_aggressiveness,
+        num_threads=num_threads,
+        provider=provider,
+        decoding_method=decoding_method,
+        max_active_paths=max_active_paths,
+    )
+
+class DictationCore:
+    """
+    The dictation pipeline without a GUI: recording, transcription in the
+    configured mode, the local engine's lifecycle and history. start() and
+    stop() bracket one dictation, whose text arrives on the listener;
+    finish_session() ends it once the caller has used the result. Heavy
+    packages (openai, scipy, sherpa-onnx) are only imported when first used.
+    """
+
+    def __init__(self, listener: Optional[DictationListener] = None, recorder: Optional[AudioRecorder] = None):
+        self.listener = listener or DictationListener()
+        self.recorder = recorder or AudioRecorder()
+        self.processing = False
+        self.is_local_session = False
+        self.speculative = None
+        self._session = None  # StreamingTranscription of the running dictation
+        self._worker = None   # thread transcribing the running dictation
+
+        # Local engine state; the lock keeps the idle unload away from a starting dictation
+        self.local_engine = None
+        self._engine_lock = threading.RLock()
+        self._engine_loader = None
+        self._engine_load_callbacks = []  # run when the pre-warm finishes
+        self._idle_timer = None
+
+    # --- Local Engine Lifecycle ---
+    def preload_local_engine(self):
+        """Starts loading the local engine in the background if it's selected and downloaded."""
+        if not current_config.local_prewarm or current_config.transcription_model != LOCAL_MODEL:
+            return
+        with self._engine_lock:
+            if self.local_engine or self._engine_loader:
+                return
+            if not ModelManager.is_model_ready():
+                return
+            print("DEBUG: Pre-warming local engine in background...")
+            self._engine_loader = threading.Thread(target=self._load_engine, name="engine-loader", daemon=True)
+            self._engine_loader.start()
+
+    def after_engine_load(self, callback: Callable[[], None]) -> bool:
+        """
+        If a pre-warm is running, arranges for callback to be called (on the
+        loader thread) once it has finished, loaded or not, and returns True.
+        Returns False if there's nothing to wait for.
+        """
+        with self._engine_lock:
+            if self._engine_loader is None:
+                return False
+            self._engine_load_callbacks.append(callback)
+            return True
+
+    def _load_engine(self):
+        """Loads the engine and runs a warm-up decode, on the loader thread."""
+        try:
+            start = time.time()
+            engine = build_local_engine()
+            engine.warm_up()
+            print(f"DEBUG: Local Parakeet Engine loaded and warmed up in {time.time() - start:.2f}s")
+        except Exception as e:
+            print(f"DEBUG: Local engine pre-warm failed: {e}")
+            engine = None
+            self.listener.on_engine_error(str(e))
+        with self._engine_lock:
+            if engine is not None:
+                if self.local_engine:
+                    engine.close()
+                else:
+                    self.local_engine = engine
+            self._engine_loader = None
+            callbacks, self._engine_load_callbacks = self._engine_load_callbacks, []
+        if engine is not None:
+            self.schedule_engine_unload()
+        for callback in callbacks:
+            callback()
+
+    def _cancel_engine_unload(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def schedule_engine_unload(self):
+        minutes = current_config.local_idle_unload_min
+        with self._engine_lock:
+            self._cancel_engine_unload()
+            if self.local_engine and minutes and minutes > 0:
+                self._idle_timer = threading.Timer(minutes * 60, self.unload_local_engine)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def unload_local_engine(self):
+        with self._engine_lock:
+            if not self.local_engine:
+                return
+            if self.recorder.is_recording or self.processing:
+                self.schedule_engine_unload()
+                return
+            print("DEBUG: Unloading idle local engine")
+            self.local_engine.close()
+            self.local_engine = None
+
+    def on_settings_changed(self):
+        """Applies saved preferences to the refine cache and the local engine."""
+        get_refine_cache().sync_settings(current_config.model, current_config.system_prompt)
+        # Thread/provider/decoding changes need a fresh recognizer
+        if self.local_engine and self.local_engine.runtime_options != local_engine_options():
+            print("DEBUG: Local engine settings changed. Reloading.")
+            self.unload_local_engine()
+        self.preload_local_engine()
+        if self.local_engine:
+            self.schedule_engine_unload()
+
+    def _prepare_local_engine(self, on_loading):
+        """Makes sure a local engine with the current settings is loaded (caller holds the lock)."""
+        if self.local_engine and self.local_engine.runtime_options != local_engine_options():
+            self.local_engine.close()
+            self.local_engine = None
+        if not self.local_engine:
+            if on_loading:
+                on_loading()
+            try:
+                self.local_engine = build_local_engine()
+                print("DEBUG: Local Parakeet Engine Loaded")
+            except Exception as e:
+                print(f"Error loading local engine: {e}")
+                raise EngineLoadError(str(e)) from e
+        self.local_engine.incremental = current_config.local_incremental
+        self.local_engine.set_vad_aggressiveness(current_config.vad_aggressiveness)
+
+    # --- Dictation ---
+    def start(self, on_loading: Optional[Callable[[], None]] = None) -> str:
+        """
+        Starts recording a dictation and returns its mode: "batch",
+        "streaming" or "local". The local model must already be downloaded;
+        on_loading is called before the engine has to be loaded on the spot.
+        A running pre-warm is waited for here; callers on an event loop
+        should use after_engine_load() first instead of blocking.
+        Raises EngineLoadError, or the recorder's error if capture fails.
+        """
+        tracer.begin("batch", current_config.transcription_model)
+        is_local = current_config.transcription_model == LOCAL_MODEL
+        self.is_local_session = is_local
+        if is_local:
+            self._cancel_engine_unload()
+            # A background pre-warm may still be running; wait for it instead of loading twice
+            loader = self._engine_loader
+            if loader:
+                if on_loading:
+                    on_loading()
+                loader.join()
+
+        # Force streaming ON for local model because it's designed for it
+        use_streaming = current_config.streaming_enabled or is_local
+        print(f"DEBUG: Streaming={use_streaming}, is_local={is_local}")
+        if use_streaming and webrtcvad is None and not is_local:
+            print("WARNING: webrtcvad not available. Falling back to batch mode for Cloud.")
+            use_streaming = False
+        mode = ("local" if is_local else "streaming") if use_streaming else "batch"
+        tracer.set_mode(mode)
+
+        with self._engine_lock:
+            if is_local:
+                try:
+                    self._prepare_local_engine(on_loading)
+                except EngineLoadError:
+                    tracer.set_status("error")
+                    raise
+            try:
+                if use_streaming:
+                    self._start_streaming(self.local_engine if is_local else None)
+                else:
+                    self._start_batch()
+            except Exception:
+                self._cancel_speculative()
+                tracer.set_status("error")
+                raise
+        return mode
+
+    def _start_streaming(self, local_engine):
+        print("DEBUG: Starting in streaming mode")
+        # Capture first; the ring holds the audio until the worker picks it up
+        ring = self.recorder.start_streaming()
+        self._session = StreamingTranscription(
+            ring,
+            self.recorder.sample_rate,
+            vad_silence_ms=current_config.vad_silence_ms,
+            vad_aggressiveness=current_config.vad_aggressiveness,
+            local_engine=local_engine,
+            on_partial=self.listener.on_partial,
+            on_segment=self.listener.on_segment,
+        )
+        self._worker = threading.Thread(target=self._run_streaming, args=(self._session,),
+                                        name="streaming-transcription", daemon=True)
+        self._worker.start()
+
+    def _start_batch(self):
+        # Realtime models re-read the PCM, so only Whisper uploads get compressed
+        encoding = "wav"
+        if not is_realtime_transcription_model(current_config.transcription_model):
+            encoding = choose_upload_encoding()
+        # Whisper: transcribe finished sentences in the background while recording
+        self.speculative = AIProcessor().open_speculative(self.recorder.sample_rate)
+        print(f"DEBUG: Starting in batch mode (upload encoding: {encoding}, speculative: {self.speculative is not None})")
+        self.recorder.start(encoding, on_frame=self.speculative.feed if self.speculative else None)
+
+    def _cancel_speculative(self):
+        if self.speculative is not None:
+            self.speculative.cancel()
+            self.speculative = None
+
+    def stop(self) -> bool:
+        """
+        Stops recording. Returns True if the dictation is now being
+        transcribed (the result goes to the listener), False if there was
+        nothing to transcribe. Raises if the recorder fails to stop.
+        """
+        if not self.recorder.is_recording:
+            return False
+        tracer.mark("release")
+        if self.recorder.ring.first_write_at is not None:
+            tracer.mark("first_audio", at=self.recorder.ring.first_write_at)
+        self.processing = True
+
+        if self.recorder.streaming:
+            self.recorder.stop_streaming()
+            if self._session:
+                self._session.request_stop()
+            return True
+
+        try:
+            audio_path = self.recorder.stop()
+        except Exception:
+            self._cancel_speculative()
+            raise
+        if not audio_path:
+            print("DEBUG: No audio recorded (silent or empty).")
+            self._cancel_speculative()
+            tracer.set_status("empty")
+            return False
+
+        speculative, self.speculative = self.speculative, None
+        self._worker = threading.Thread(target=self._run_batch, args=(BatchTranscription(audio_path, speculative),),
+                                        name="batch-transcription", daemon=True)
+        self._worker.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the running transcription has reported. Returns False on timeout."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+            return not worker.is_alive()
+        return True
+
+    def _run_batch(self, transcription):
+        print("DEBUG: Batch transcription started")
+        pasted = 0
+
+        def on_refine_delta(text):
+            nonlocal pasted
+            self.listener.on_refine_progress(text)
+            if current_config.refine_early_paste:
+                end = sentence_prefix_end(text)
+                if end > pasted:
+                    self.listener.on_early_paste(text[pasted:end])
+                    pasted = end
+
+        try:
+            text = transcription.run(on_refine_delta=on_refine_delta)
+        except Exception as e:
+            print(f"DEBUG: Batch transcription error: {e}")
+            tracer.set_status("empty" if "No speech" in str(e) else "error")
+            self.listener.on_error(str(e), False)
+            return
+        self._deliver(text, streaming=False)
+
+    def _run_streaming(self, session):
+        try:
+            text = session.run()
+        except Exception as e:
+            print(f"DEBUG: Streaming transcription error: {e}")
+            tracer.set_status("error")
+            if self.recorder.is_recording and self.recorder.streaming:
+                try:
+                    self.recorder.stop_streaming()
+                except Exception:
+                    pass
+            self.listener.on_error(str(e), True)
+            return
+        self._deliver(text, streaming=True)
+
+    def _deliver(self, text, streaming):
+        if text and text.strip():
+            print(f"DEBUG: Success Result: {text}")
+            tracer.set_status("ok")
+            HistoryManager.add(text)
+        else:
+            tracer.set_status("empty")
+        self.listener.on_result(text, streaming)
+
+    def finish_session(self):
+        """Ends the dictation (after its result was used) and records its latency trace."""
+        tracer.finish()
+        self.processing = False
+        self._session = None
+        self._worker = None
+        self.is_local_session = False
+        self.schedule_engine_unload()
+
+    def close(self):
+        with self._engine_lock:
+            self._cancel_engine_unload()
+        realtime_pool.close_all()
+        HistoryManager.close()
+        get_refine_cache().close()
+        tracer.close()
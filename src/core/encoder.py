@@ -0,0 +1,156 @@
+import io
+import wave
+import threading
+import numpy as np
+from typing import Optional
+from src.config import current_config
+try:
+    import soundfile
+except Exception:
+    soundfile = None
+
+# Upload encodings for the Whisper endpoint. "auto" picks FLAC (lossless,
+# roughly half the size of WAV for speech) and drops to Opus (about a tenth)
+# on slow uplinks or when FLAC would exceed the upload limit.
+UPLOAD_ENCODINGS = ("auto", "wav", "flac", "opus")
+EXTENSIONS = {"wav": ".wav", "flac": ".flac", "opus": ".ogg"}
+SOUNDFILE_FORMATS = {"flac": ("FLAC", "PCM_16"), "opus": ("OGG", "OPUS")}
+
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+FLAC_RATIO_ESTIMATE = 0.6
+# Uploads smaller than this are dominated by request overhead, not bandwidth
+MIN_SAMPLE_BYTES = 64 * 1024
+THROUGHPUT_SMOOTHING = 0.3
+
+def encoding_available(encoding: str) -> bool:
+    if encoding == "wav":
+        return True
+    if soundfile is None or encoding not in SOUNDFILE_FORMATS:
+        return False
+    fmt, subtype = SOUNDFILE_FORMATS[encoding]
+    try:
+        return soundfile.check_format(fmt, subtype)
+    except Exception:
+        return False
+
+class UploadStats:
+    """
+    Effective uplink throughput from recent transcription uploads (bytes over
+    request time, smoothed). Request time includes server processing, so this
+    under-estimates bandwidth, which errs toward the smaller encoding.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._kbps = None
+
+    def record(self, num_bytes: int, seconds: float):
+        if num_bytes < MIN_SAMPLE_BYTES or seconds <= 0:
+            return
+        kbps = num_bytes * 8 / 1000 / seconds
+        with self._lock:
+            if self._kbps is None:
+                self._kbps = kbps
+            else:
+                self._kbps += THROUGHPUT_SMOOTHING * (kbps - self._kbps)
+
+    def kbps(self) -> Optional[float]:
+        with self._lock:
+            return self._kbps
+
+upload_stats = UploadStats()
+
+def choose_upload_encoding(duration_s: Optional[float] = None, sample_rate: int = 16000) -> str:
+    """Resolves current_config.upload_encoding to an encoding that is available here."""
+    requested = current_config.upload_encoding
+    if requested != "auto":
+        if encoding_available(requested):
+            return requested
+        print(f"DEBUG: Upload encoding '{requested}' unavailable (is soundfile installed?). Using WAV.")
+        return "wav"
+
+    if not encoding_available("flac"):
+        return "wav"
+    kbps = upload_stats.kbps()
+    slow = kbps is not None and kbps < current_config.upload_opus_below_kbps
+    too_big = duration_s is not None and duration_s * sample_rate * 2 * FLAC_RATIO_ESTIMATE > MAX_UPLOAD_BYTES
+    if (slow or too_big) and encoding_available("opus"):
+        return "opus"
+    return "flac"
+
+class AudioFileWriter:
+    """
+    Writes Int16 mono PCM to disk incrementally, as WAV or compressed with
+    soundfile, so the upload file is ready as soon as recording stops. The
+    extension is appended to base_path; unavailable encodings fall back to WAV.
+    """
+
+    def __init__(self, base_path: str, sample_rate: int, encoding: str = "wav"):
+        self.encoding = encoding if encoding_available(encoding) else "wav"
+        self.path = base_path + EXTENSIONS[self.encoding]
+        self._wav = None
+        self._sf = None
+        if self.encoding == "wav":
+            self._wav = wave.open(self.path, "wb")
+            self._wav.setnchannels(1)
+            self._wav.setsampwidth(2)
+            self._wav.setframerate(sample_rate)
+        else:
+            fmt, subtype = SOUNDFILE_FORMATS[self.encoding]
+            self._sf = soundfile.SoundFile(self.path, "w", sample_rate, 1, subtype, format=fmt)
+
+    def write(self, pcm_bytes):
+        if self._wav is not None:
+            # Header sizes are patched once, by close()
+            self._wav.writeframesraw(pcm_bytes)
+        else:
+            self._sf.buffer_write(pcm_bytes, dtype="int16")
+
+    def close(self):
+        if self._wav is not None:
+            self._wav.close()
+        if self._sf is not None:
+            self._sf.close()
+
+def encode_pcm16(pcm_bytes: bytes, sample_rate: int, encoding: str = "wav") -> tuple[str, bytes]:
+    """Encodes Int16 mono PCM in memory. Returns (upload filename, file bytes)."""
+    if encoding != "wav" and encoding_available(encoding):
+        fmt, subtype = SOUNDFILE_FORMATS[encoding]
+        buf = io.BytesIO()
+        try:
+            with soundfile.SoundFile(buf, "w", sample_rate, 1, subtype, format=fmt) as f:
+                f.buffer_write(pcm_bytes, dtype="int16")
+            return "audio" + EXTENSIONS[encoding], buf.getvalue()
+        except Exception as e:
+            print(f"DEBUG: {encoding} encoding failed ({e}). Uploading WAV.")
+
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)  # 16-bit PCM
+        wf.setframerate(sample_rate)
+        wf.writeframes(pcm_bytes)
+    return "audio.wav", buf.getvalue()
+
+def read_pcm16(audio_path: str) -> tuple[bytes, int]:
+    """Reads any file AudioFileWriter produces back to Int16 mono PCM. Returns (pcm_bytes, sample_rate)."""
+    if audio_path.endswith(".wav") or soundfile is None:
+        with wave.open(audio_path, "rb") as wf:
+            if wf.getsampwidth() != 2:
+                raise ValueError("Expected 16-bit PCM WAV input.")
+            channels = wf.getnchannels()
+            sample_rate = wf.getframerate()
+            pcm_bytes = wf.readframes(wf.getnframes())
+        if channels > 1:
+            pcm_bytes = np.frombuffer(pcm_bytes, dtype=np.int16).reshape(-1, channels)[:, 0].tobytes()
+        return pcm_bytes, sample_rate
+
+    data, sample_rate = soundfile.read(audio_path, dtype="int16", always_2d=True)
+    return data[:, 0].tobytes(), sample_rate
+
+def audio_duration(audio_path: str) -> float:
+    """Length in seconds of a file AudioFileWriter produced, from its header."""
+    if audio_path.endswith(".wav") or soundfile is None:
+        with wave.open(audio_path, "rb") as wf:
+            return wf.getnframes() / wf.getframerate()
+    return soundfile.info(audio_path).duration
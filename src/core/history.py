@@ -1,54 +1,271 @@
 import json
 import os
+import re
 import time
-from typing import List, Dict
+import queue
+import sqlite3
+import threading
+from typing import List, Dict, Optional
+from src.config import current_config
 
+HISTORY_DB = os.path.expanduser("~/.ghostflow_history.db")
+# Pre-SQLite history file, imported once on first open
 HISTORY_FILE = os.path.expanduser("~/.ghostflow_history.json")
 
+PAGE_SIZE = 50
+# Retention is enforced every PRUNE_EVERY inserts (and at startup) so add() stays O(1)
+PRUNE_EVERY = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    date_str TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_timestamp ON history (timestamp);
+"""
+
+# Full-text index kept in sync with the history table by triggers. The
+# prefix indexes keep short "term*" queries from scanning every matching
+# term. Row ids grow with time (imports are inserted oldest first), so
+# "ORDER BY rowid DESC" is newest first and FTS5 can walk it without sorting.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    text, content='history', content_rowid='id', prefix='2 3 4',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+    INSERT INTO history_fts (history_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+SEARCH_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+class HistoryStore:
+    """
+    SQLite (WAL) history store. Inserts are queued to a single writer thread
+    so callers on the GUI thread never touch the disk; reads use their own
+    connection and see committed rows immediately thanks to WAL.
+    """
+
+    def __init__(self, path: str = HISTORY_DB, legacy_path: Optional[str] = HISTORY_FILE):
+        self.path = path
+        self._read_lock = threading.Lock()
+        self._reader = self._connect()
+        self._reader.executescript(SCHEMA)
+        self.fts_enabled = self._init_fts()
+        self._migrate(legacy_path)
+
+        self._queue = queue.Queue()
+        self._inserts = 0
+        self._writer = threading.Thread(target=self._write_loop, name="history-writer", daemon=True)
+        self._writer.start()
+        self._queue.put(self._prune)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_fts(self) -> bool:
+        try:
+            existed = self._reader.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'"
+            ).fetchone()
+            self._reader.executescript(FTS_SCHEMA)
+            if not existed:
+                # Index rows written before the FTS table existed
+                with self._reader:
+                    self._reader.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"WARNING: SQLite FTS5 unavailable, history search falls back to LIKE: {e}")
+            return False
+
+    def _migrate(self, legacy_path: Optional[str]):
+        if not legacy_path or not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'r') as f:
+                data = json.load(f)
+            rows = [
+                (e.get("text", ""), e.get("timestamp", 0), e.get("date_str", ""))
+                for e in (data if isinstance(data, list) else [])
+                if e.get("text")
+            ]
+            rows.sort(key=lambda r: r[1])
+            with self._reader:
+                self._reader.executemany("INSERT INTO history (text, timestamp, date_str) VALUES (?, ?, ?)", rows)
+            os.replace(legacy_path, legacy_path + ".migrated")
+            print(f"DEBUG: Migrated {len(rows)} history entries to {self.path}")
+        except Exception as e:
+            print(f"ERROR: Failed to migrate history: {e}")
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                job(conn)
+            except Exception as e:
+                print(f"ERROR: History write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _insert(self, text: str, timestamp: float, date_str: str):
+        def job(conn):
+            with conn:
+                conn.execute("INSERT INTO history (text, timestamp, date_str) VALUES (?, ?, ?)", (text, timestamp, date_str))
+            self._inserts += 1
+            if self._inserts % PRUNE_EVERY == 0:
+                self._prune(conn)
+        self._queue.put(job)
+
+    def _prune(self, conn):
+        max_entries = current_config.history_max_entries
+        retention_days = current_config.history_retention_days
+        with conn:
+            if retention_days and retention_days > 0:
+                conn.execute("DELETE FROM history WHERE timestamp < ?", (time.time() - retention_days * 86400,))
+            if max_entries and max_entries > 0:
+                conn.execute(
+                    "DELETE FROM history WHERE id NOT IN (SELECT id FROM history ORDER BY timestamp DESC LIMIT ?)",
+                    (max_entries,),
+                )
+
+    def add(self, text: str):
+        self._insert(text, time.time(), time.strftime("%Y-%m-%d %H:%M:%S"))
+
+    def page(self, offset: int = 0, limit: int = PAGE_SIZE) -> List[Dict]:
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT id, text, timestamp, date_str FROM history ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def search(self, query: str, offset: int = 0, limit: int = PAGE_SIZE,
+               start_ts: Optional[float] = None, end_ts: Optional[float] = None):
+        """
+        Returns (entries, total) for entries matching every word of `query`
+        as a prefix, optionally within [start_ts, end_ts], newest first.
+        """
+        terms = SEARCH_TOKEN_RE.findall(query or "")
+        where, params = [], []
+        if start_ts:
+            where.append("h.timestamp >= ?")
+            params.append(start_ts)
+        if end_ts:
+            where.append("h.timestamp <= ?")
+            params.append(end_ts)
+
+        order = "h.id"
+        if not terms:
+            source = "history h"
+        elif self.fts_enabled:
+            source = "history_fts f JOIN history h ON h.id = f.rowid"
+            order = "f.rowid"
+            where.insert(0, "history_fts MATCH ?")
+            params.insert(0, " ".join(f'"{t}"*' for t in terms))
+        else:
+            source = "history h"
+            for t in terms:
+                where.append("h.text LIKE ?")
+                params.append(f"%{t}%")
+
+        clause = f"WHERE {' AND '.join(where)}" if where else ""
+        with self._read_lock:
+            total = self._reader.execute(f"SELECT COUNT(*) FROM {source} {clause}", params).fetchone()[0]
+            rows = self._reader.execute(
+                f"SELECT h.id, h.text, h.timestamp, h.date_str FROM {source} {clause} "
+                f"ORDER BY {order} DESC LIMIT ? OFFSET ?",
+                params + [limit, offset],
+            ).fetchall()
+        return [dict(r) for r in rows], total
+
+    def count(self) -> int:
+        with self._read_lock:
+            return self._reader.execute("SELECT COUNT(*) FROM history").fetchone()[0]
+
+    def clear(self):
+        def job(conn):
+            with conn:
+                conn.execute("DELETE FROM history")
+        self._queue.put(job)
+        self.flush()
+
+    def flush(self):
+        """Blocks until all queued writes are on disk."""
+        self._queue.join()
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._writer.join(timeout=2)
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store() -> HistoryStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore()
+        return _store
+
 class HistoryManager:
     @staticmethod
-    def load() -> List[Dict]:
-        if not os.path.exists(HISTORY_FILE):
-            return []
+    def load(offset: int = 0, limit: int = PAGE_SIZE) -> List[Dict]:
+        """Returns one page of history, newest first."""
         try:
-            with open(HISTORY_FILE, 'r') as f:
-                data = json.load(f)
-            # Ensure it's a list and sort by timestamp desc
-            if isinstance(data, list):
-                return sorted(data, key=lambda x: x.get('timestamp', 0), reverse=True)
-            return []
+            return get_store().page(offset, limit)
         except Exception as e:
             print(f"ERROR: Failed to load history: {e}")
             return []
 
+    @staticmethod
+    def search(query: str, offset: int = 0, limit: int = PAGE_SIZE, start_ts=None, end_ts=None):
+        """Returns (entries, total) matching query/date range, newest first."""
+        try:
+            return get_store().search(query, offset, limit, start_ts, end_ts)
+        except Exception as e:
+            print(f"ERROR: Failed to search history: {e}")
+            return [], 0
+
+    @staticmethod
+    def count() -> int:
+        try:
+            return get_store().count()
+        except Exception as e:
+            print(f"ERROR: Failed to count history: {e}")
+            return 0
+
     @staticmethod
     def add(text: str):
+        """Queues an entry; returns immediately (the write happens on a background thread)."""
         if not text:
             return
-        
-        history = HistoryManager.load()
-        entry = {
-            "text": text,
-            "timestamp": time.time(),
-            "date_str": time.strftime("%Y-%m-%d %H:%M:%S")
-        }
-        
-        # Add to top
-        history.insert(0, entry)
-        
-        # Keep last 50
-        history = history[:50]
-        
         try:
-            with open(HISTORY_FILE, 'w') as f:
-                json.dump(history, f, indent=4)
+            get_store().add(text)
         except Exception as e:
             print(f"ERROR: Failed to save history: {e}")
 
     @staticmethod
     def clear():
         try:
-            if os.path.exists(HISTORY_FILE):
-                os.remove(HISTORY_FILE)
+            get_store().clear()
         except Exception as e:
             print(f"ERROR: Failed to clear history: {e}")
+
+    @staticmethod
+    def close():
+        if _store is not None:
+            _store.close()
@@ -1,69 +1,334 @@
+import os
+import sys
+import time
+import subprocess
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait
+from src.core.buffers import SampleBuffer
 try:
-    import sherpa_onnx
-except ImportError:
-    sherpa_onnx = None
+    import webrtcvad
+except Exception:
+    webrtcvad = None
 
 SAMPLE_RATE = 16000
 
+# Long dictations are cut into segments at pauses and each closed segment is
+# decoded in the background while the user keeps talking, so stopping only
+# has to decode the open tail. Segments shorter than MIN_SEGMENT_S are not
+# cut (short windows hurt accuracy); segments reaching MAX_SEGMENT_S without
+# a pause are cut at the quietest frame of their last CUT_SEARCH_S.
+SEGMENT_SILENCE_MS = 400
+MIN_SEGMENT_S = 3.0
+MAX_SEGMENT_S = 20.0
+CUT_SEARCH_S = 3.0
+
+# Incremental mode re-decodes the open segment every PARTIAL_INTERVAL_S of
+# new audio for live text.
+PARTIAL_INTERVAL_S = 1.0
+
+# Each segment is accumulated in its own SampleBuffer sized for a full
+# segment; buffers go back to a small free list once decoded.
+SEGMENT_CAPACITY = int((MAX_SEGMENT_S + 1) * SAMPLE_RATE)
+MAX_POOLED_BUFFERS = 4
+
+DECODING_METHODS = ("greedy_search", "modified_beam_search")
+
+def physical_core_count() -> int:
+    """Best-effort physical (not hyper-threaded) core count."""
+    try:
+        if sys.platform == "darwin":
+            out = subprocess.run(["sysctl", "-n", "hw.physicalcpu"], capture_output=True, text=True, timeout=2)
+            return max(1, int(out.stdout.strip()))
+        if os.path.exists("/proc/cpuinfo"):
+            cores = set()
+            physical_id = None
+            with open("/proc/cpuinfo") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    key = key.strip()
+                    if key == "physical id":
+                        physical_id = value.strip()
+                    elif key == "core id":
+                        cores.add((physical_id, value.strip()))
+            if cores:
+                return len(cores)
+    except Exception as e:
+        print(f"DEBUG: Could not determine physical core count: {e}")
+    return max(1, (os.cpu_count() or 2) // 2)
+
+def auto_num_threads() -> int:
+    """Threads for num_threads=0: physical cores minus one for audio/GUI, capped at 8
+    (the encoder stops scaling well beyond that)."""
+    cores = physical_core_count()
+    if cores <= 2:
+        return cores
+    return min(cores - 1, 8)
+
+def load_sherpa_onnx():
+    """Imports sherpa_onnx on first use (it's slow to load), or returns None if it isn't installed."""
+    try:
+        import sherpa_onnx
+    except ImportError:
+        return None
+    return sherpa_onnx
+
 class LocalParakeetEngine:
-    def __init__(self, model_paths):
+    def __init__(self, model_paths, incremental=True, vad_aggressiveness=2,
+                 num_threads=0, provider="cpu", decoding_method="greedy_search", max_active_paths=4):
+        sherpa_onnx = load_sherpa_onnx()
         if not sherpa_onnx:
             raise ImportError("sherpa-onnx is not installed. Run: pip install sherpa-onnx")
 
+        if decoding_method not in DECODING_METHODS:
+            print(f"DEBUG: Unknown decoding method '{decoding_method}'. Falling back to greedy_search.")
+            decoding_method = "greedy_search"
+        resolved_threads = num_threads if num_threads and num_threads > 0 else auto_num_threads()
+
+        # Settings the engine was built with, so callers can tell when a reload is needed
+        self.runtime_options = (num_threads, provider, decoding_method, max_active_paths)
+        print(f"DEBUG: Local engine: threads={resolved_threads}, provider={provider}, decoding={decoding_method}")
+
         self.recognizer = sherpa_onnx.OfflineRecognizer.from_transducer(
             tokens=model_paths["tokens"],
             encoder=model_paths["encoder"],
             decoder=model_paths["decoder"],
             joiner=model_paths["joiner"],
-            num_threads=4,
+            num_threads=resolved_threads,
             sample_rate=SAMPLE_RATE,
             feature_dim=80,
-            decoding_method="greedy_search",
-            provider="cpu",
+            decoding_method=decoding_method,
+            max_active_paths=max_active_paths,
+            provider=provider,
             model_type="nemo_transducer",
         )
-        self._audio_buffer = []
-        self._last_text = ""
+        self.incremental = incremental
+        self.vad = webrtcvad.Vad(vad_aggressiveness) if webrtcvad else None
+        # One worker: ONNX Runtime already spreads a decode over num_threads
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="parakeet")
+        self._segments = []
+        self._partial = None
+        self._free_buffers = []
+        self._open = None
+        self.start_stream()
+
+    def warm_up(self):
+        """Runs a throwaway decode so ONNX Runtime finishes graph optimisation before first use."""
+        noise = np.random.default_rng(0).standard_normal(SAMPLE_RATE).astype(np.float32) * 0.01
+        self._decode(noise)
+
+    def close(self):
+        """Stops the background decoder so the model can be freed."""
+        self.start_stream()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._free_buffers = []
+        self._open = None
+
+    def set_vad_aggressiveness(self, level: int):
+        if webrtcvad:
+            self.vad = webrtcvad.Vad(level)
 
     def start_stream(self):
         """Resets the buffer for a new utterance."""
-        self._audio_buffer = []
+        if self._partial is not None and not self._partial.cancel() and not self._partial.done():
+            # A running partial decode still reads the open buffer; leave it to it
+            self._open = None
+        for segment in self._segments:
+            # A running decode may still read its buffer; only recycle idle ones
+            if segment["future"].cancel() or segment["future"].done():
+                self._release_buffer(segment["buffer"])
+        self._segments = []      # closed segments: {"buffer", "samples", "future", "text"} in order
+        self._partial = None     # in-flight decode of the open segment
+        if self._open is None:
+            self._open = self._take_buffer()
+        self._open.clear()       # open segment audio
+        self._frame_energy = []
+        self._frame_len = 0
+        self._silence_ms = 0
+        self._partial_text = ""
+        self._partial_samples = 0
         self._last_text = ""
 
+    def _decode(self, samples: np.ndarray) -> str:
+        stream = self.recognizer.create_stream()
+        stream.accept_waveform(SAMPLE_RATE, samples)
+        self.recognizer.decode_stream(stream)
+        return stream.result.text.strip()
+
+    def _decode_batch(self, windows) -> list:
+        streams = []
+        for samples in windows:
+            stream = self.recognizer.create_stream()
+            stream.accept_waveform(SAMPLE_RATE, samples)
+            streams.append(stream)
+        self.recognizer.decode_streams(streams)
+        return [s.result.text.strip() for s in streams]
+
+    def _take_buffer(self) -> SampleBuffer:
+        if self._free_buffers:
+            buffer = self._free_buffers.pop()
+            buffer.clear()
+            return buffer
+        return SampleBuffer(SEGMENT_CAPACITY)
+
+    def _release_buffer(self, buffer: SampleBuffer):
+        if buffer is not None and len(self._free_buffers) < MAX_POOLED_BUFFERS:
+            self._free_buffers.append(buffer)
+
+    def _close_segment(self, cut_frame=None):
+        """Hands the open segment (or its first cut_frame frames) to the background decoder."""
+        buffer = self._open
+        size = len(buffer)
+        cut = size if cut_frame is None else min(size, cut_frame * self._frame_len)
+
+        self._open = self._take_buffer()
+        if cut < size:
+            # Only a forced cut leaves a remainder (at most CUT_SEARCH_S)
+            self._open.append(buffer.view(cut))
+
+        self._segments.append({
+            "buffer": buffer,
+            "samples": cut,
+            "future": self._executor.submit(self._decode, buffer.view(0, cut)),
+            "text": None,
+        })
+        self._frame_energy = self._frame_energy[cut_frame:] if cut_frame is not None else []
+        self._silence_ms = 0
+        # A queued partial of the old open segment would only delay the segment's own decode
+        if self._partial is not None:
+            self._partial.cancel()
+            self._partial = None
+        self._partial_text = ""
+        self._partial_samples = 0
+
+    def _segment_texts(self):
+        """Texts of closed segments decoded so far, in order, up to the first pending one."""
+        texts = []
+        for segment in self._segments:
+            if segment["text"] is None:
+                future = segment["future"]
+                if not future.done() or future.cancelled():
+                    return texts, False
+                segment["text"] = future.result()
+                self._release_buffer(segment["buffer"])
+                segment["buffer"] = None
+            texts.append(segment["text"])
+        return texts, True
+
+    def _update_partial(self):
+        if self._partial is not None and self._partial.done():
+            future = self._partial
+            self._partial = None
+            self._partial_text = future.result()
+
+        busy = self._partial is not None or any(not s["future"].done() for s in self._segments)
+        open_samples = len(self._open)
+        if busy or open_samples - self._partial_samples < PARTIAL_INTERVAL_S * SAMPLE_RATE:
+            return
+        self._partial_samples = open_samples
+        self._partial = self._executor.submit(self._decode, self._open.view())
+
+    def _join(self, texts) -> str:
+        return " ".join(t for t in texts if t)
+
     def process_audio(self, pcm_bytes: bytes) -> str:
         """
-        Buffers Int16 PCM bytes. Returns empty string since offline model
-        transcribes only at the end.
+        Buffers Int16 PCM bytes and closes segments at pauses. Returns the
+        text decoded so far: finished segments, plus the open segment's live
+        hypothesis in incremental mode.
         """
-        if not self._audio_buffer:
-            self._audio_buffer = []
+        # Converted to float32 in place, straight into the open segment
+        samples = self._open.append_pcm16(pcm_bytes)
+        self._frame_len = len(samples)
+        self._frame_energy.append(float(np.dot(samples, samples)))
 
-        # Convert int16 bytes to float32 array normalized to [-1, 1]
-        samples = np.frombuffer(pcm_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-        self._audio_buffer.append(samples)
-        
-        return ""  # Offline model doesn't provide interim results
+        frame_ms = 1000 * len(samples) // SAMPLE_RATE
+        is_speech = True
+        if self.vad and frame_ms in (10, 20, 30):
+            is_speech = self.vad.is_speech(pcm_bytes, SAMPLE_RATE)
+        self._silence_ms = 0 if is_speech else self._silence_ms + frame_ms
+
+        open_s = len(self._open) / SAMPLE_RATE
+        if open_s >= MIN_SEGMENT_S and self._silence_ms >= SEGMENT_SILENCE_MS:
+            self._close_segment()
+        elif open_s >= MAX_SEGMENT_S:
+            search = max(1, int(CUT_SEARCH_S * 1000 // frame_ms))
+            tail = self._frame_energy[-search:]
+            self._close_segment(cut_frame=len(self._frame_energy) - search + tail.index(min(tail)) + 1)
+
+        texts, all_done = self._segment_texts()
+        if self.incremental and all_done:
+            self._update_partial()
+            texts.append(self._partial_text)
+        self._last_text = self._join(texts)
+        return self._last_text
 
     def finalize_stream(self) -> str:
-        """Transcribes all buffered audio and returns final text."""
-        if not self._audio_buffer:
-            return self._last_text
-        
-        # Concatenate all buffered audio
-        all_samples = np.concatenate(self._audio_buffer)
-        
-        # Create stream and transcribe
-        stream = self.recognizer.create_stream()
-        stream.accept_waveform(SAMPLE_RATE, all_samples)
-        self.recognizer.decode_stream(stream)
-        
-        text = stream.result.text.strip()
-        self._last_text = text
-        return text
+        """Decodes whatever is still pending plus the open tail and returns the full text."""
+        partial, self._partial = self._partial, None
+        if partial is not None:
+            partial.cancel()
+
+        # Segments the worker hasn't started yet are batched with the tail
+        texts = [segment["text"] for segment in self._segments]
+        batch, batch_slots = [], []
+        for i, segment in enumerate(self._segments):
+            if texts[i] is None and segment["future"].cancel():
+                batch.append(segment["buffer"].view(0, segment["samples"]))
+                batch_slots.append(i)
+        tail = self._open.view()
+        if len(tail):
+            batch.append(tail)
+        if batch:
+            # Queued behind whatever the worker is already running (a partial or
+            # a segment), so the recognizer is never used from two threads at once
+            results = self._executor.submit(self._decode_batch, batch).result()
+            for slot, text in zip(batch_slots, results):
+                texts[slot] = text
+            if len(tail):
+                texts.append(results[-1])
+
+        for i, segment in enumerate(self._segments):
+            if texts[i] is None:
+                texts[i] = segment["future"].result()
+        if partial is not None:
+            # A partial that was already running still reads the open buffer
+            wait([partial])
+
+        for segment in self._segments:
+            self._release_buffer(segment["buffer"])
+        self._segments = []
+        self._open.clear()
+        self._last_text = self._join(texts)
+        return self._last_text
 
     def stop_stream(self):
         """Finalizes and cleans up the stream."""
-        final_text = self.finalize_stream()
-        self._audio_buffer = []
-        return final_text
+        return self.finalize_stream()
+
+def benchmark(model_paths, samples: np.ndarray, candidates) -> list:
+    """
+    Builds an engine for each candidate settings dict (LocalParakeetEngine
+    keyword arguments), warms it up and times one full decode of `samples`
+    (float32, 16kHz). Returns one result dict per candidate, fastest first.
+    """
+    audio_s = len(samples) / SAMPLE_RATE
+    results = []
+    for options in candidates:
+        start = time.perf_counter()
+        engine = LocalParakeetEngine(model_paths, incremental=False, **options)
+        load_s = time.perf_counter() - start
+        try:
+            engine.warm_up()
+            start = time.perf_counter()
+            text = engine._decode(samples)
+            decode_s = time.perf_counter() - start
+        finally:
+            engine.close()
+        results.append({
+            **options,
+            "load_s": round(load_s, 3),
+            "decode_s": round(decode_s, 3),
+            "rtf": round(decode_s / audio_s, 4) if audio_s else None,
+            "text": text,
+        })
+    return sorted(results, key=lambda r: r["rtf"] if r["rtf"] is not None else float("inf"))
@@ -0,0 +1,120 @@
+import re
+from typing import Dict, Optional
+from src.config import current_config, DEFAULT_SYSTEM_PROMPT
+
+# Deterministic clean-up for short, already well-formed transcripts, so they
+# don't need an LLM round-trip. escalation_reason() decides when a transcript
+# is messy enough that only the refinement model will do.
+
+REFINE_MODES = ("auto", "llm", "local")
+
+# Only fillers that are never real words; "like" and "you know" need context
+FILLERS = ("um", "umm", "uh", "uhh", "uhm", "erm", "er", "ah", "hmm", "mm", "mhm")
+# Takes a comma on either side with it, so "is, um, good" doesn't leave "is, good"
+FILLER_RE = re.compile(r"(?:,\s*)?\b(?:" + "|".join(FILLERS) + r")\b[,.]?", re.IGNORECASE)
+# Stutters and restarts: "the the", "I mean", "sorry, no", "wait"
+REPEAT_RE = re.compile(r"\b(\w+)\s+\1\b", re.IGNORECASE)
+SELF_CORRECTION_RE = re.compile(r"\b(?:i mean|no wait|sorry|scratch that|actually no)\b", re.IGNORECASE)
+WORD_RE = re.compile(r"\b[\w']+\b")
+
+SPACE_BEFORE_PUNCT_RE = re.compile(r"\s+([,.;:!?])")
+MISSING_SPACE_RE = re.compile(r"([,;:!?])(?=[^\s\d\"')\]])")
+# "..." is an ellipsis, not a doubled period, and is left alone
+REPEATED_PUNCT_RE = re.compile(r"([,;:])[,;:]+|([!?])\2+|(?<!\.)(\.)\.(?!\.)")
+SPACES_RE = re.compile(r"\s+")
+LONE_I_RE = re.compile(r"\bi\b(?=$|\s|'|[,;:!?]|\.(?!\w))")
+SENTENCE_START_RE = re.compile(r"(^|[.!?]\s+)([a-z])")
+# A period after these doesn't end a sentence
+ABBREVIATIONS = ("e.g.", "i.e.", "etc.", "vs.", "approx.", "mr.", "mrs.", "ms.", "dr.")
+TERMINAL_PUNCT = ".!?…\"')"
+SENTENCE_BREAK_RE = re.compile(r"[.!?]\s+")
+# An unpunctuated last sentence is a question if it opens with a wh-word not
+# followed by a subject ("what time is it", not "what I want") or with an
+# auxiliary followed by one ("can you", not "will do" or "do it now").
+WH_WORDS = ("what", "who", "whom", "whose", "when", "where", "why", "which", "how")
+AUXILIARIES = ("is", "are", "am", "was", "were", "do", "does", "did", "can", "could", "will", "would",
+               "should", "shall", "may", "might", "have", "has", "had", "isn't", "aren't", "wasn't",
+               "don't", "doesn't", "didn't", "can't", "couldn't", "won't", "wouldn't", "shouldn't",
+               "haven't", "hasn't")
+SUBJECTS = ("i", "you", "we", "they", "he", "she", "it", "there", "this", "that", "these", "those",
+            "anyone", "anybody", "someone", "somebody", "everyone", "everybody")
+QUESTION_RE = re.compile(
+    r"^(?:(?:" + "|".join(WH_WORDS) + r")\b(?!\s+(?:i|you|we|they|he|she|a|an)\b)"
+    r"|(?!(?:do|have)\s+(?:it|this|that)\b)(?:" + "|".join(AUXILIARIES) + r")\s+(?:" + "|".join(SUBJECTS) + r")\b)",
+    re.IGNORECASE)
+
+def disfluency_density(text: str) -> float:
+    """
+    Stutters and self-corrections per word. Fillers are left out: the local
+    refiner removes those itself, but only the LLM can untangle a restart.
+    """
+    words = len(WORD_RE.findall(text))
+    if not words:
+        return 0.0
+    return (len(REPEAT_RE.findall(text)) + len(SELF_CORRECTION_RE.findall(text))) / words
+
+def _capitalize_sentence_start(match) -> str:
+    before = match.string[:match.start(2)].rstrip().lower()
+    if before.endswith(ABBREVIATIONS) or before.endswith(".."):
+        # An ellipsis trails off mid-sentence
+        return match.group(0)
+    return match.group(1) + match.group(2).upper()
+
+def _last_sentence(text: str) -> str:
+    start = 0
+    for match in SENTENCE_BREAK_RE.finditer(text):
+        before = text[:match.start() + 1].lower()
+        if not before.endswith(ABBREVIATIONS) and not before.endswith(".."):
+            start = match.end()
+    return text[start:]
+
+def escalation_reason(raw_text: str) -> Optional[str]:
+    """
+    Why raw_text needs the refinement model, or None if the local refiner is
+    enough. Only consulted in refine_mode "auto".
+    """
+    if current_config.system_prompt.strip() != DEFAULT_SYSTEM_PROMPT:
+        # Custom instructions (tone, formatting, translation) can't be applied locally
+        return "custom system prompt"
+    words = len(WORD_RE.findall(raw_text))
+    if words > current_config.refine_local_max_words:
+        return f"long: {words} words"
+    if disfluency_density(raw_text) > current_config.refine_local_max_disfluency:
+        return "disfluent"
+    stripped = raw_text.strip()
+    if words >= 8 and not any(c in stripped[:-1] for c in ",.;:!?") and stripped[-1:] not in TERMINAL_PUNCT:
+        # A run-on without any punctuation needs real sentence splitting
+        return "unpunctuated"
+    return None
+
+def apply_replacements(text: str, replacements: Dict[str, str]) -> str:
+    """Whole-word, case-insensitive replacements from the user's dictionary."""
+    for source, target in (replacements or {}).items():
+        if source.strip():
+            text = re.sub(r"(?<!\w)" + re.escape(source.strip()) + r"(?!\w)", lambda _: target, text,
+                          flags=re.IGNORECASE)
+    return text
+
+def local_refine(raw_text: str, replacements: Optional[Dict[str, str]] = None) -> str:
+    """
+    Removes fillers, normalises spacing and punctuation, and fixes
+    capitalisation. Unpunctuated text gets a full stop, or a question mark
+    if its last sentence reads as a question.
+    """
+    text = FILLER_RE.sub(" ", raw_text)
+    text = SPACES_RE.sub(" ", text).strip()
+    text = SPACE_BEFORE_PUNCT_RE.sub(r"\1", text)
+    text = REPEATED_PUNCT_RE.sub(lambda m: m.group(1) or m.group(2) or m.group(3), text)
+    text = MISSING_SPACE_RE.sub(r"\1 ", text)
+    # Removing a leading filler can leave the text starting with punctuation
+    text = text.lstrip(",;: ")
+    text = apply_replacements(text, replacements if replacements is not None else current_config.refine_replacements)
+    if not text:
+        return ""
+    text = LONE_I_RE.sub("I", text)
+    text = SENTENCE_START_RE.sub(_capitalize_sentence_start, text)
+    if text[-1] in ",;:":
+        text = text[:-1]
+    if text[-1] not in TERMINAL_PUNCT:
+        text += "?" if QUESTION_RE.match(_last_sentence(text)) else "."
+    return text
@@ -1,6 +1,13 @@
 import os
+import re
+import time
+import hashlib
+import http.client
+import threading
+import urllib.error
 import urllib.request
-from PyQt6.QtCore import QObject, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 MODEL_DIR = os.path.expanduser("~/.ghostflow_models/parakeet-tdt-0.6b-v3")
 BASE_URL = "https://huggingface.co/csukuangfj/sherpa-onnx-nemo-parakeet-tdt-0.6b-v3-int8/resolve/main/"
@@ -19,40 +26,228 @@ MIN_FILE_SIZES = {
     "joiner.int8.onnx": 1_000_000,
 }
 
-class ModelDownloader(QObject):
-    progress_update = pyqtSignal(str)
-    finished = pyqtSignal(bool, str)
+# Pinned SHA-256 digests; regenerate with scripts/pin_model_checksums.py
+# when BASE_URL changes. Files without an entry are checked against what the
+# server advertises: Hugging Face sends the SHA-256 as X-Linked-Etag for LFS
+# files and the git blob id as ETag for files stored in git (tokens.txt).
+# A file with no digest at all is downloaded from scratch (a resumed .part
+# can't be trusted) and only size-checked, with a warning.
+EXPECTED_SHA256 = {}
+
+CHUNK_SIZE = 1 << 20
+MAX_PARALLEL_DOWNLOADS = 4
+MAX_RESUME_ATTEMPTS = 3
+PROGRESS_INTERVAL_S = 0.25
+SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+GIT_SHA1_RE = re.compile(r"^[0-9a-f]{40}$")
+
+def git_blob_sha1(path):
+    """The git object id of a file's contents, as Hugging Face reports it for non-LFS files."""
+    digest = hashlib.sha1(f"blob {os.path.getsize(path)}\0".encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+class DownloadCancelled(Exception):
+    pass
+
+class ModelDownloader:
+    """
+    Downloads the local model. run() blocks; progress messages and the
+    final (success, error message) go to the callbacks, from its thread.
+    """
+
+    def __init__(self, base_url=BASE_URL, model_dir=MODEL_DIR,
+                 on_progress: Optional[Callable[[str], None]] = None,
+                 on_finished: Optional[Callable[[bool, str], None]] = None):
+        self.base_url = base_url
+        self.model_dir = model_dir
+        self.on_progress = on_progress or (lambda message: None)
+        self.on_finished = on_finished or (lambda success, message: None)
+        self._lock = threading.Lock()
+        self._done_bytes = {}
+        self._total_bytes = {}
+        self._last_progress = 0.0
+        # Set when one file fails, so the others stop instead of finishing for nothing
+        self._cancel = threading.Event()
+
+    def advertised_digest(self, url):
+        """
+        Reads the file's digest from the (un-followed) response headers as
+        ("sha256", hex) or ("git-sha1", hex), or None if the server sends neither.
+        """
+        request = urllib.request.Request(url, method="HEAD")
+        opener = urllib.request.build_opener(_NoRedirect)
+        try:
+            response = opener.open(request, timeout=15)
+            headers = response.headers
+        except urllib.error.HTTPError as e:
+            headers = e.headers  # 3xx lands here with redirects disabled
+        except Exception as e:
+            print(f"DEBUG: Could not fetch checksum for {url}: {e}")
+            return None
+
+        values = [(headers.get(name) or "").strip().removeprefix("W/").strip('"').lower()
+                  for name in ("X-Linked-Etag", "ETag")]
+        for value in values:
+            if SHA256_RE.match(value):
+                return ("sha256", value)
+        if GIT_SHA1_RE.match(values[1]):
+            return ("git-sha1", values[1])
+        return None
+
+    def _report(self, force=False):
+        now = time.monotonic()
+        with self._lock:
+            if not force and now - self._last_progress < PROGRESS_INTERVAL_S:
+                return
+            self._last_progress = now
+            done = sum(self._done_bytes.values())
+            total = sum(self._total_bytes.values())
+        if total:
+            pct = int(100 * done / total)
+            self.on_progress(f"Downloading Model {pct}% ({done / 1e6:.0f}/{total / 1e6:.0f} MB)")
+        else:
+            self.on_progress(f"Downloading Model ({done / 1e6:.0f} MB)")
+
+    def _download(self, filename):
+        """Downloads one file into <name>.part, resuming if possible, then verifies and renames it."""
+        path = os.path.join(self.model_dir, filename)
+        part_path = path + ".part"
+        url = self.base_url + filename
+        if filename in EXPECTED_SHA256:
+            expected = ("sha256", EXPECTED_SHA256[filename])
+        else:
+            expected = self.advertised_digest(url)
+
+        if expected is None and os.path.exists(part_path):
+            print(f"WARNING: No checksum for {filename}; not resuming an unverifiable partial download.")
+            os.remove(part_path)
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        request = urllib.request.Request(url)
+        if offset:
+            request.add_header("Range", f"bytes={offset}-")
+
+        try:
+            response = urllib.request.urlopen(request, timeout=30)
+        except urllib.error.HTTPError as e:
+            if e.code != 416 or not offset:
+                raise
+            # Range not satisfiable: the .part already holds the whole file
+            response = None
+
+        digest = hashlib.sha256()
+        if response is not None and offset and response.status != 206:
+            print(f"DEBUG: Server ignored Range for {filename}. Restarting download.")
+            offset = 0
+
+        mode = "ab" if offset else "wb"
+        with open(part_path, mode) as out:
+            if offset:
+                # Hash what's already on disk so the digest covers the whole file
+                with open(part_path, "rb") as existing:
+                    for block in iter(lambda: existing.read(CHUNK_SIZE), b""):
+                        digest.update(block)
+
+            with self._lock:
+                self._done_bytes[filename] = offset
+                length = response.headers.get("Content-Length") if response is not None else None
+                self._total_bytes[filename] = offset + int(length) if length else offset
+
+            if response is not None:
+                with response:
+                    for block in iter(lambda: response.read(CHUNK_SIZE), b""):
+                        if self._cancel.is_set():
+                            # Keep the .part so a later download resumes from here
+                            raise DownloadCancelled(filename)
+                        out.write(block)
+                        digest.update(block)
+                        with self._lock:
+                            self._done_bytes[filename] += len(block)
+                        self._report()
+
+        with self._lock:
+            received, total = self._done_bytes[filename], self._total_bytes[filename]
+        if received < total:
+            # Connection dropped mid-file; keep the .part so the next attempt resumes
+            raise ConnectionError(f"connection closed at {received}/{total} bytes")
+
+        min_size = MIN_FILE_SIZES.get(filename, 1000)
+        if os.path.getsize(part_path) < min_size:
+            os.remove(part_path)
+            raise ValueError(f"Downloaded file {filename} is too small (corrupted?)")
+
+        if expected:
+            algorithm, expected_hex = expected
+            actual = digest.hexdigest() if algorithm == "sha256" else git_blob_sha1(part_path)
+            if actual != expected_hex:
+                os.remove(part_path)
+                raise ValueError(f"Checksum mismatch for {filename}")
+            print(f"DEBUG: Verified {algorithm} of {filename}")
+        else:
+            print(f"WARNING: No checksum available for {filename}; only its size was checked.")
+            self.on_progress(f"Warning: {filename} could not be verified")
+
+        os.replace(part_path, path)
+
+    def _download_with_resume(self, filename):
+        """Retries dropped connections; each retry picks up from the .part file."""
+        for attempt in range(MAX_RESUME_ATTEMPTS):
+            try:
+                return self._download(filename)
+            except (ConnectionError, TimeoutError, http.client.IncompleteRead, urllib.error.URLError) as e:
+                if isinstance(e, urllib.error.HTTPError) or attempt == MAX_RESUME_ATTEMPTS - 1:
+                    raise
+                print(f"DEBUG: Download of {filename} interrupted ({e}). Resuming...")
+                if self._cancel.wait(1 + attempt):
+                    raise DownloadCancelled(filename)
 
     def run(self):
-        if not os.path.exists(MODEL_DIR):
+        if not os.path.exists(self.model_dir):
             try:
-                os.makedirs(MODEL_DIR)
+                os.makedirs(self.model_dir)
             except Exception as e:
-                self.finished.emit(False, f"Failed to create directory: {e}")
+                self.on_finished(False, f"Failed to create directory: {e}")
                 return
 
-        total_files = len(FILES)
-        for index, filename in enumerate(FILES):
-            path = os.path.join(MODEL_DIR, filename)
+        missing = []
+        for filename in FILES:
+            path = os.path.join(self.model_dir, filename)
             min_size = MIN_FILE_SIZES.get(filename, 1000)
-            
-            if os.path.exists(path) and os.path.getsize(path) >= min_size:
-                continue
+            if not (os.path.exists(path) and os.path.getsize(path) >= min_size):
+                missing.append(filename)
 
-            url = BASE_URL + filename
-            self.progress_update.emit(f"Downloading {index + 1}/{total_files}: {filename}")
-            
-            try:
-                urllib.request.urlretrieve(url, path)
-                if os.path.getsize(path) < min_size:
-                    os.remove(path)
-                    self.finished.emit(False, f"Downloaded file {filename} is too small (corrupted?)")
-                    return
-            except Exception as e:
-                self.finished.emit(False, f"Download failed for {filename}: {e}")
-                return
+        if not missing:
+            self.on_finished(True, "")
+            return
+
+        self._report(force=True)
+        self._cancel.clear()
+        error = None
+        # The encoder dominates; the small files finish alongside it instead of queueing behind it
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_DOWNLOADS) as pool:
+            futures = {filename: pool.submit(self._download_with_resume, filename) for filename in missing}
+            for filename, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    # Stop the other downloads; leaving the pool still waits for them to notice
+                    error = f"Download failed for {filename}: {e}"
+                    self._cancel.set()
+                    for other in futures.values():
+                        other.cancel()
+                    break
 
-        self.finished.emit(True, "")
+        if error:
+            self.on_finished(False, error)
+            return
+        self._report(force=True)
+        self.on_finished(True, "")
 
 class ModelManager:
     @staticmethod
@@ -0,0 +1,124 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+class OrderedTaskPipeline:
+    """
+    Runs tasks on a small thread pool and hands results back in submission
+    order, so the submitting loop never waits on a slow task. At most
+    max_in_flight tasks are queued or running; submit() blocks beyond that,
+    which is the only back-pressure on the caller and is counted in stats().
+    """
+
+    def __init__(self, max_parallel: int, max_in_flight: int = None, name: str = "pipeline"):
+        self.max_parallel = max(1, max_parallel)
+        self.max_in_flight = max(self.max_parallel, max_in_flight or self.max_parallel * 2)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix=name)
+        self._slots = threading.Semaphore(self.max_in_flight)
+        self._pending = deque()  # (seq, future, submitted_at), oldest first
+        self._next_seq = 0
+        self._lock = threading.Lock()
+        # Back-pressure metrics
+        self.submitted = 0
+        self.delivered = 0
+        self.peak_in_flight = 0
+        self.submit_waits = 0
+        self.submit_wait_s = 0.0
+        self.max_delivery_s = 0.0
+        self.head_blocked = 0  # results that finished but waited behind an earlier, slower task
+        self._last_done_at = 0.0
+
+    def _run(self, fn, args):
+        try:
+            return fn(*args), time.perf_counter()
+        finally:
+            self._slots.release()
+
+    def submit(self, fn: Callable, *args, on_wait: Callable[[], None] = None) -> int:
+        """
+        Queues fn(*args) and returns its sequence number. If max_in_flight
+        tasks are outstanding, blocks until one finishes, calling on_wait
+        periodically (e.g. to deliver finished results) while it waits.
+        """
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            while not self._slots.acquire(timeout=0.05):
+                if on_wait:
+                    on_wait()
+            self.submit_waits += 1
+            self.submit_wait_s += time.perf_counter() - start
+        with self._lock:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._pending.append((seq, self._executor.submit(self._run, fn, args), time.perf_counter()))
+            self.submitted += 1
+            self.peak_in_flight = max(self.peak_in_flight, len(self._pending))
+        return seq
+
+    @property
+    def next_seq(self) -> int:
+        """Sequence number of the next result poll() will deliver."""
+        with self._lock:
+            return self._pending[0][0] if self._pending else self._next_seq
+
+    @property
+    def submit_seq(self) -> int:
+        """Sequence number the next submit() will return."""
+        with self._lock:
+            return self._next_seq
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def poll(self) -> List:
+        """
+        Results of finished tasks at the head of the queue, in submission
+        order. Re-raises a task's exception when its turn comes.
+        """
+        results = []
+        with self._lock:
+            while self._pending and self._pending[0][1].done():
+                seq, future, submitted_at = self._pending.popleft()
+                self.delivered += 1
+                self.max_delivery_s = max(self.max_delivery_s, time.perf_counter() - submitted_at)
+                result, done_at = future.result()
+                if done_at < self._last_done_at:
+                    self.head_blocked += 1
+                self._last_done_at = max(self._last_done_at, done_at)
+                results.append(result)
+        return results
+
+    def drain(self, timeout: float = None) -> List:
+        """Waits for every outstanding task and returns the remaining results in order."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        results = []
+        while True:
+            with self._lock:
+                if not self._pending:
+                    return results
+                head = self._pending[0][1]
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            head.result(timeout=remaining)
+            results.extend(self.poll())
+
+    def shutdown(self):
+        """Stops without waiting; outstanding tasks finish in the background and are dropped."""
+        with self._lock:
+            for _, future, _ in self._pending:
+                future.cancel()
+            self._pending.clear()
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        return {
+            "submitted": self.submitted,
+            "delivered": self.delivered,
+            "peak_in_flight": self.peak_in_flight,
+            "submit_waits": self.submit_waits,
+            "submit_wait_s": round(self.submit_wait_s, 3),
+            "max_delivery_s": round(self.max_delivery_s, 3),
+            "head_blocked": self.head_blocked,
+        }
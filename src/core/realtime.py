@@ -0,0 +1,261 @@
+import json
+import time
+import threading
+from typing import Callable, List, Optional
+from websocket import create_connection, WebSocketTimeoutException, WebSocketConnectionClosedException
+
+DEFAULT_TIMEOUT = 10
+
+class RealtimeConnectionError(Exception):
+    """Raised when the underlying websocket is gone and the segment can be retried."""
+
+class RealtimeSession:
+    """
+    A long-lived realtime websocket configured once for input transcription.
+    Each segment clears the input buffer, appends audio and commits, so the
+    TLS handshake and session.update are only paid when the socket is opened.
+    """
+
+    def __init__(self, url: str, headers: List[str], transcription_model: str, timeout: float = DEFAULT_TIMEOUT):
+        self.url = url
+        self.headers = headers
+        self.transcription_model = transcription_model
+        self.timeout = timeout
+        self.ws = None
+        self.last_used = 0.0
+
+    @property
+    def key(self):
+        return (self.url, tuple(self.headers), self.transcription_model)
+
+    @property
+    def connected(self) -> bool:
+        return self.ws is not None and self.ws.connected
+
+    def connect(self):
+        ws = create_connection(self.url, header=self.headers, timeout=self.timeout)
+        ws.settimeout(self.timeout)
+        session_update = {
+            "type": "session.update",
+            "session": {
+                "input_audio_format": "pcm16",
+                "input_audio_transcription": {"model": self.transcription_model, "language": "en"},
+                "turn_detection": None,
+            },
+        }
+        ws.send(json.dumps(session_update))
+        self.ws = ws
+        self.last_used = time.monotonic()
+
+    def close(self):
+        ws, self.ws = self.ws, None
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+
+    def _send(self, event: dict):
+        try:
+            self.ws.send(json.dumps(event))
+        except (WebSocketConnectionClosedException, OSError) as e:
+            self.close()
+            raise RealtimeConnectionError(str(e))
+
+    def transcribe(self, audio_b64: str) -> str:
+        """Transcribes one base64 PCM16 (24kHz) segment over the open socket."""
+        self.begin()
+        self.append(audio_b64)
+        return self.commit()
+
+    def begin(self):
+        """Starts a new segment by clearing whatever is left in the input buffer."""
+        if not self.connected:
+            raise RealtimeConnectionError("Realtime session is not connected")
+        self._send({"type": "input_audio_buffer.clear"})
+
+    def append(self, audio_b64: str):
+        self._send({"type": "input_audio_buffer.append", "audio": audio_b64})
+
+    def commit(self, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Commits the appended audio and waits for its transcript. on_delta receives the text so far."""
+        self._send({"type": "input_audio_buffer.commit"})
+        try:
+            return self._await_transcript(on_delta)
+        finally:
+            self.last_used = time.monotonic()
+
+    def _await_transcript(self, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        item_id = None
+        completed_transcript = None
+        delta_parts = []
+
+        while True:
+            try:
+                raw = self.ws.recv()
+            except WebSocketTimeoutException:
+                # Late events for this item would leak into the next segment.
+                print("DEBUG: Realtime session timed out waiting for transcript. Dropping socket.")
+                self.close()
+                break
+            except (WebSocketConnectionClosedException, OSError) as e:
+                self.close()
+                if item_id is None and not delta_parts:
+                    raise RealtimeConnectionError(str(e))
+                break
+
+            if not raw:
+                self.close()
+                if item_id is None and not delta_parts:
+                    raise RealtimeConnectionError("Realtime socket closed")
+                break
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8")
+            event = json.loads(raw)
+            event_type = event.get("type", "")
+            event_item = event.get("item_id")
+
+            if event_type == "input_audio_buffer.committed":
+                item_id = event_item
+            elif event_type == "conversation.item.input_audio_transcription.delta":
+                if item_id is not None and event_item not in (None, item_id):
+                    continue
+                delta = event.get("delta", "")
+                if delta:
+                    delta_parts.append(delta)
+                    if on_delta:
+                        on_delta("".join(delta_parts).strip())
+            elif event_type == "conversation.item.input_audio_transcription.completed":
+                if item_id is not None and event_item not in (None, item_id):
+                    continue
+                completed_transcript = event.get("transcript", "")
+                break
+            elif event_type == "error":
+                err = event.get("error", {})
+                message = err.get("message", "Realtime API error")
+                raise ValueError(message)
+
+        if completed_transcript is not None:
+            return completed_transcript.strip()
+        return "".join(delta_parts).strip()
+
+class RealtimeSessionPool:
+    """
+    Keeps a small number of pre-warmed RealtimeSessions for reuse across VAD
+    segments. Sessions idle for longer than idle_timeout are closed by a
+    background janitor thread.
+    """
+
+    def __init__(self, size: int = 1, idle_timeout: float = 120.0):
+        self.size = max(1, int(size))
+        self.idle_timeout = float(idle_timeout)
+        self._lock = threading.Lock()
+        self._idle: List[RealtimeSession] = []
+        self._key = None
+        self._janitor: Optional[threading.Thread] = None
+
+    def configure(self, size: int, idle_timeout: float):
+        with self._lock:
+            self.size = max(1, int(size))
+            self.idle_timeout = float(idle_timeout)
+            surplus = self._idle[self.size:]
+            self._idle = self._idle[:self.size]
+        for session in surplus:
+            session.close()
+
+    def _switch_key(self, key):
+        """Drops idle sessions opened for another endpoint, key or model. Caller holds the lock."""
+        if key == self._key:
+            return []
+        stale = self._idle
+        self._idle = []
+        self._key = key
+        return stale
+
+    def warm(self, url: str, headers: List[str], transcription_model: str):
+        """Opens sessions until the pool is full. Blocking; run it off the GUI thread."""
+        key = (url, tuple(headers), transcription_model)
+        with self._lock:
+            stale = self._switch_key(key)
+            missing = self.size - len(self._idle)
+        for session in stale:
+            session.close()
+
+        for _ in range(missing):
+            session = RealtimeSession(url, headers, transcription_model)
+            try:
+                session.connect()
+            except Exception as e:
+                print(f"DEBUG: Realtime pre-warm failed: {e}")
+                return
+            self.release(session)
+
+    def acquire(self, url: str, headers: List[str], transcription_model: str) -> RealtimeSession:
+        """Returns a connected session, reusing an idle one when possible."""
+        key = (url, tuple(headers), transcription_model)
+        with self._lock:
+            stale = self._switch_key(key)
+            session = None
+            while self._idle:
+                candidate = self._idle.pop()
+                if candidate.connected:
+                    session = candidate
+                    break
+                stale.append(candidate)
+        for s in stale:
+            s.close()
+
+        if session is None:
+            session = RealtimeSession(url, headers, transcription_model)
+            session.connect()
+        return session
+
+    def release(self, session: RealtimeSession):
+        """Returns a session to the pool, or closes it if it's dead or surplus."""
+        with self._lock:
+            keep = session.connected and session.key == self._key and len(self._idle) < self.size
+            if keep:
+                session.last_used = time.monotonic()
+                self._idle.append(session)
+        if keep:
+            self._ensure_janitor()
+        else:
+            session.close()
+
+    def discard(self, session: RealtimeSession):
+        session.close()
+
+    def evict_idle(self):
+        now = time.monotonic()
+        with self._lock:
+            expired = [s for s in self._idle if now - s.last_used >= self.idle_timeout]
+            self._idle = [s for s in self._idle if s not in expired]
+        for session in expired:
+            print("DEBUG: Closing idle realtime session")
+            session.close()
+
+    def close_all(self):
+        with self._lock:
+            sessions = self._idle
+            self._idle = []
+        for session in sessions:
+            session.close()
+
+    def _ensure_janitor(self):
+        with self._lock:
+            if self._janitor is not None and self._janitor.is_alive():
+                return
+            self._janitor = threading.Thread(target=self._janitor_loop, daemon=True)
+            self._janitor.start()
+
+    def _janitor_loop(self):
+        while True:
+            time.sleep(max(1.0, min(self.idle_timeout / 2, 15.0)))
+            self.evict_idle()
+            with self._lock:
+                if not self._idle:
+                    self._janitor = None
+                    return
+
+# Global instance shared by every AIProcessor
+realtime_pool = RealtimeSessionPool()
@@ -1,71 +1,138 @@
-import sounddevice as sd
 import numpy as np
-import scipy.io.wavfile as wav
 import tempfile
+import threading
 import os
-import queue
+from src.core.buffers import Int16RingBuffer
+from src.core.encoder import AudioFileWriter
+
+try:
+    import sounddevice as sd
+except Exception as e:
+    print(f"WARNING: Failed to import sounddevice: {e}")
+    sd = None
+
+STREAM_FRAME_MS = 30
+# Audio the ring can hold before the callback starts dropping blocks
+RING_BUFFER_S = 15
+# Extension depends on the upload encoding (.wav, .flac or .ogg)
+BATCH_FILE_BASE = os.path.join(tempfile.gettempdir(), "ghost_voice")
 
 class AudioRecorder:
-    def __init__(self, sample_rate=16000):
+    def __init__(self, sample_rate=16000, stream_factory=None):
         self.sample_rate = sample_rate
-        self.recording = []
+        # Builds the input stream; sounddevice's InputStream unless replaying a file (see replay.py)
+        self.stream_factory = stream_factory
         self.is_recording = False
         self.stream = None
         self.streaming = False
-        self.frame_queue = None
+        self.frame_len = int(sample_rate * STREAM_FRAME_MS / 1000)
+        # Allocated once; the callback only ever copies into it (both modes)
+        self.ring = Int16RingBuffer(RING_BUFFER_S * sample_rate, self.frame_len)
+        self._writer = None
+        self._capture_done = False
+        self._frames_written = 0
+        self._peak = 0
+        self._write_error = None
+        self._audio_file = None
+        self._on_frame = None
 
-    def start(self):
+    def start(self, encoding: str = "wav", on_frame=None):
+        """
+        Starts a batch recording. Audio is encoded (wav, flac or opus) and
+        written to disk as it comes in, so the file is ready when it stops.
+        on_frame, if given, also receives each Int16 frame on the writer thread.
+        """
         if self.is_recording:
             return
-        self.recording = []
+        self.ring.reset()
+        self._capture_done = False
+        self._frames_written = 0
+        self._peak = 0
+        self._write_error = None
+        self._on_frame = on_frame
+        self._audio_file = AudioFileWriter(BATCH_FILE_BASE, self.sample_rate, encoding)
+        self._writer = threading.Thread(target=self._write_loop, args=(self._audio_file,), name="audio-writer", daemon=True)
+        self._writer.start()
+
         self.is_recording = True
         self.streaming = False
-        self.frame_queue = None
         print("DEBUG: Audio Stream Starting...")
         # Start non-blocking stream
-        self.stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=1,
-            dtype='int16',
-            callback=self._callback
-        )
-        self.stream.start()
+        try:
+            self.stream = self._open_stream()
+            self.stream.start()
+        except Exception:
+            # Let the writer finish so the file is closed before reporting the error
+            self.is_recording = False
+            self.stream = None
+            self._capture_done = True
+            self._writer.join()
+            self._writer = None
+            raise
 
-    def start_streaming(self, frame_queue: queue.Queue):
+    def start_streaming(self) -> Int16RingBuffer:
+        """Starts capturing 30ms frames into the ring buffer and returns it for the consumer."""
         if self.is_recording:
-            return
-        self.recording = []
+            return self.ring
+        self.ring.reset()
         self.is_recording = True
         self.streaming = True
-        self.frame_queue = frame_queue
         print("DEBUG: Audio Stream Starting (streaming mode)...")
 
-        blocksize = int(self.sample_rate * 30 / 1000)  # 30ms frames
-        self.stream = sd.InputStream(
-            samplerate=self.sample_rate,
-            channels=1,
-            dtype='int16',
-            blocksize=blocksize,
-            callback=self._callback
-        )
+        try:
+            self.stream = self._open_stream(blocksize=self.frame_len)
+        except Exception:
+            self.is_recording = False
+            self.streaming = False
+            raise
         self.stream.start()
+        return self.ring
+
+    def _open_stream(self, **kwargs):
+        factory = self.stream_factory
+        if factory is None:
+            if sd is None:
+                raise RuntimeError("Audio input not available (sounddevice failed to import).")
+            factory = sd.InputStream
+        return factory(samplerate=self.sample_rate, channels=1, dtype='int16', callback=self._callback, **kwargs)
 
     def _callback(self, indata, frames, time, status):
         if status:
             print(f"DEBUG: Audio Status: {status}")
         if self.is_recording:
-            if self.streaming and self.frame_queue is not None:
-                try:
-                    self.frame_queue.put_nowait(indata.copy())
-                except queue.Full:
-                    print("DEBUG: Frame queue full, dropping oldest frame")
+            # Plain copy into preallocated memory; overruns are counted, not logged, here
+            self.ring.write(indata[:, 0])
+
+    def _write_loop(self, audio_file):
+        """Drains the ring into the audio file, tracking peak amplitude as it goes."""
+        try:
+            while True:
+                frame = self.ring.read(timeout=0.1)
+                if frame is None:
+                    if not self._capture_done:
+                        continue
+                    # Stream is closed: flush the last partial frame and stop
+                    remaining = self.ring.available()
+                    if not remaining:
+                        break
+                    frame = self.ring.read(remaining)
+                samples = np.frombuffer(frame, dtype=np.int16)
+                if len(samples):
+                    # Widen before negating so -32768 doesn't wrap
+                    self._peak = max(self._peak, int(samples.max()), -int(samples.min()))
+                audio_file.write(frame)
+                if self._on_frame is not None:
                     try:
-                        _ = self.frame_queue.get_nowait()
-                        self.frame_queue.put_nowait(indata.copy())
-                    except Exception:
-                        pass
-            else:
-                self.recording.append(indata.copy())
+                        self._on_frame(frame)
+                    except Exception as e:
+                        print(f"ERROR: Frame listener failed, detaching it: {e}")
+                        self._on_frame = None
+                self._frames_written += len(samples)
+        except Exception as e:
+            self._write_error = e
+            print(f"ERROR: Failed to write recording: {e}")
+        finally:
+            audio_file.close()
 
     def stop(self) -> str:
         if not self.is_recording:
@@ -78,16 +145,21 @@ class AudioRecorder:
             self.stream = None
             print("DEBUG: Audio Stream Stopped")
 
-        if not self.recording:
+        # Only the last ~100ms is left to write, however long the recording was
+        self._capture_done = True
+        if self._writer:
+            self._writer.join()
+            self._writer = None
+
+        if self.ring.overruns:
+            print(f"WARNING: Writer fell behind; dropped {self.ring.dropped_samples} samples")
+        if self._write_error is not None or not self._frames_written:
             print("DEBUG: No recording data captured.")
             return ""
 
-        # Concatenate all blocks
-        audio_data = np.concatenate(self.recording, axis=0)
-        
         # Check volume levels (to see if Mic is actually working)
-        max_amp = np.max(np.abs(audio_data))
-        print(f"DEBUG: Recording finished. Frames: {len(audio_data)}, Max Amplitude: {max_amp}")
+        max_amp = self._peak
+        print(f"DEBUG: Recording finished. Frames: {self._frames_written}, Max Amplitude: {max_amp}")
         
         if max_amp < 100: # Very low threshold, likely silence or mic permission issue
             print("WARNING: Audio appears silent. Check Microphone permissions.")
@@ -97,12 +169,7 @@ class AudioRecorder:
             # Returning empty string will trigger "No Audio" in main.
             return "" 
         
-        # Save to temp file
-        temp_dir = tempfile.gettempdir()
-        file_path = os.path.join(temp_dir, "ghost_voice.wav")
-        wav.write(file_path, self.sample_rate, audio_data)
-        
-        return file_path
+        return self._audio_file.path
 
     def stop_streaming(self):
         if not self.is_recording:
@@ -110,10 +177,14 @@ class AudioRecorder:
 
         self.is_recording = False
         self.streaming = False
-        self.frame_queue = None
 
         if self.stream:
             self.stream.stop()
             self.stream.close()
             self.stream = None
             print("DEBUG: Audio Stream Stopped (streaming mode)")
+
+        ring = self.ring
+        print(f"DEBUG: Ring buffer peak {ring.high_water / self.sample_rate:.2f}s of "
+              f"{ring.capacity / self.sample_rate:.0f}s, overruns: {ring.overruns} "
+              f"({ring.dropped_samples} samples dropped)")
@@ -0,0 +1,174 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+from src.config import current_config
+
+REFINE_CACHE_DB = os.path.expanduser("~/.ghostflow_refine_cache.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS refine_cache (
+    key TEXT PRIMARY KEY,
+    generation TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS refine_cache_last_used ON refine_cache (last_used);
+"""
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+def normalize_transcript(text: str) -> str:
+    """Case and spacing don't change what the refiner produces for a short phrase."""
+    return WHITESPACE_RE.sub(" ", text).strip().casefold()
+
+def cacheable(text: str) -> bool:
+    """Only short phrases repeat; long dictations would just fill the cache with private text."""
+    return current_config.refine_cache_enabled and 0 < len(text.strip()) <= current_config.refine_cache_max_chars
+
+def refine_generation(model: str, system_prompt: str) -> str:
+    """Fingerprint of the settings a refinement depends on."""
+    return hashlib.sha256(f"{model}\0{system_prompt}".encode()).hexdigest()[:16]
+
+class RefineCache:
+    """
+    Refinement results keyed by a hash of (model, system prompt, normalised
+    transcript): an in-memory LRU in front of a small SQLite table so repeated
+    phrases survive restarts. Entries written under another model/prompt are
+    dropped as soon as the settings change.
+    """
+
+    def __init__(self, path: str = REFINE_CACHE_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()  # key -> (result, created)
+        self._generation = None
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            print(f"WARNING: Refine cache on disk unavailable, keeping it in memory only: {e}")
+            self._conn = None
+
+    def _key(self, generation: str, text: str) -> str:
+        return hashlib.sha256(f"{generation}\0{normalize_transcript(text)}".encode()).hexdigest()
+
+    def _sync_generation(self, generation: str):
+        """Drops entries from an older model/prompt (caller holds the lock)."""
+        if generation == self._generation:
+            return
+        if self._generation is not None:
+            print("DEBUG: Refinement model or prompt changed. Invalidating refine cache.")
+        self._generation = generation
+        self._memory.clear()
+        if self._conn is not None:
+            with self._conn:
+                self._conn.execute("DELETE FROM refine_cache WHERE generation != ?", (generation,))
+
+    def sync_settings(self, model: str, system_prompt: str):
+        """Invalidates entries made under a different model or prompt right away."""
+        with self._lock:
+            self._sync_generation(refine_generation(model, system_prompt))
+
+    def _expired(self, created: float) -> bool:
+        ttl_days = current_config.refine_cache_ttl_days
+        return bool(ttl_days and ttl_days > 0 and created < time.time() - ttl_days * 86400)
+
+    def _remember(self, key: str, result: str, created: float):
+        self._memory[key] = (result, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > max(1, current_config.refine_cache_max_entries):
+            self._memory.popitem(last=False)
+
+    def get(self, model: str, system_prompt: str, text: str) -> Optional[str]:
+        generation = refine_generation(model, system_prompt)
+        key = self._key(generation, text)
+        with self._lock:
+            self._sync_generation(generation)
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT result, created FROM refine_cache WHERE key = ?", (key,)
+                ).fetchone()
+                entry = tuple(row) if row else None
+
+            if entry is not None and self._expired(entry[1]):
+                self._memory.pop(key, None)
+                if self._conn is not None:
+                    with self._conn:
+                        self._conn.execute("DELETE FROM refine_cache WHERE key = ?", (key,))
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, *entry)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("UPDATE refine_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            return entry[0]
+
+    def put(self, model: str, system_prompt: str, text: str, result: str):
+        generation = refine_generation(model, system_prompt)
+        key = self._key(generation, text)
+        now = time.time()
+        with self._lock:
+            self._sync_generation(generation)
+            self._remember(key, result, now)
+            if self._conn is None:
+                return
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO refine_cache (key, generation, result, created, last_used) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, generation, result, now, now),
+                )
+                # Size limit: keep the most recently used entries
+                self._conn.execute(
+                    "DELETE FROM refine_cache WHERE key NOT IN "
+                    "(SELECT key FROM refine_cache ORDER BY last_used DESC LIMIT ?)",
+                    (max(1, current_config.refine_cache_max_entries),),
+                )
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM refine_cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+            }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_refine_cache() -> RefineCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = RefineCache()
+        return _cache
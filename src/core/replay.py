@@ -0,0 +1,79 @@
+import threading
+import time
+from typing import Callable, Optional
+import numpy as np
+
+# Default block for blocksize=0 (sounddevice picks its own; ~32ms at 16kHz)
+DEFAULT_BLOCKSIZE = 512
+
+class ReplayInputStream:
+    """
+    Stands in for sounddevice.InputStream and plays recorded Int16 PCM into
+    the callback from its own thread, so AudioRecorder (and everything
+    behind it) can run on a WAV file instead of a microphone. Pass it to
+    AudioRecorder with functools.partial(ReplayInputStream, samples, ...).
+
+    speed is relative to real time; 0 plays as fast as possible. With
+    can_write, blocks are held back while it returns False, i.e. a device
+    that never overruns: the way to measure throughput at speed 0.
+    """
+
+    def __init__(self, samples: np.ndarray, samplerate: int, channels: int = 1, dtype: str = "int16",
+                 callback: Optional[Callable] = None, blocksize: int = 0, speed: float = 1.0,
+                 can_write: Optional[Callable[[int], bool]] = None):
+        if channels != 1 or dtype != "int16":
+            raise ValueError("ReplayInputStream only plays mono int16")
+        self.samples = np.asarray(samples, dtype=np.int16)
+        self.samplerate = samplerate
+        self.callback = callback
+        self.blocksize = blocksize or DEFAULT_BLOCKSIZE
+        self.speed = speed
+        self.can_write = can_write
+        self.finished = threading.Event()  # set once the last block was delivered (or on stop)
+        self.started_at = None
+        self.finished_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.samples) / self.samplerate
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._play, name="replay-input", daemon=True)
+        self._thread.start()
+
+    def _play(self):
+        interval = self.blocksize / self.samplerate / self.speed if self.speed > 0 else 0
+        next_tick = time.perf_counter()
+        try:
+            for start in range(0, len(self.samples), self.blocksize):
+                if self._stop.is_set():
+                    return
+                block = self.samples[start:start + self.blocksize]
+                if self.can_write is not None:
+                    while not self.can_write(len(block)) and not self._stop.is_set():
+                        time.sleep(0.001)
+                if interval:
+                    # Like a device, deliver each block once it has been "recorded"
+                    next_tick += interval
+                    delay = next_tick - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                self.callback(block.reshape(-1, 1), len(block), None, None)
+        finally:
+            self.finished_at = time.perf_counter()
+            self.finished.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the whole recording has been played."""
+        return self.finished.wait(timeout)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self):
+        self.stop()
@@ -0,0 +1,126 @@
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+class StreamingResampler:
+    """
+    Frame-by-frame polyphase resampler for Int16 PCM.
+
+    Uses the same Kaiser FIR design and delay compensation as
+    scipy.signal.resample_poly, but carries the filter history between
+    calls so a live 30ms frame stream resamples without edge artifacts.
+    All work happens in buffers preallocated for max_frame input samples;
+    they grow once if a larger frame shows up.
+    """
+
+    def __init__(self, in_rate: int, out_rate: int, max_frame: int = 4800):
+        # scipy.signal takes about a second to import; only the filter design needs it
+        from scipy.signal import firwin
+
+        g = math.gcd(in_rate, out_rate)
+        self.up = out_rate // g
+        self.down = in_rate // g
+
+        max_rate = max(self.up, self.down)
+        half_len = 10 * max_rate
+        h = firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)) * self.up
+
+        # Polyphase split: phase p uses taps h[p], h[p + up], h[p + 2*up], ...
+        taps = -(-len(h) // self.up)
+        padded = np.zeros(taps * self.up)
+        padded[:len(h)] = h
+        phases = padded.reshape(taps, self.up).T
+
+        # Output m sits at upsampled index m*down + half_len (resample_poly's
+        # alignment). Group outputs into cycles of `up` that consume `down`
+        # inputs each, so one cycle is a single row of a (window x up) matmul.
+        offsets = [(r * self.down + half_len) // self.up for r in range(self.up)]
+        self._lead = taps - 1
+        self._window = taps + max(offsets)
+        self._filter = np.zeros((self._window, self.up), dtype=np.float32)
+        for r, q in enumerate(offsets):
+            p = (r * self.down + half_len) % self.up
+            for j in range(taps):
+                self._filter[self._lead + q - j, r] = phases[p, j]
+
+        self._alloc(max_frame)
+        self.reset()
+
+    def _alloc(self, max_frame: int):
+        self._max_frame = max_frame
+        self._buf = np.zeros(self._lead + self._window + max_frame + self.down, dtype=np.float32)
+        max_cycles = max_frame // self.down + self._window
+        self._out = np.empty((max_cycles, self.up), dtype=np.float32)
+        self._pcm = np.empty(max_cycles * self.up, dtype=np.int16)
+
+    def reset(self):
+        """Clears the filter history for a new, unrelated stream."""
+        self._buf[:self._lead] = 0.0
+        self._filled = self._lead
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def process(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Resamples an Int16 (or float) frame. Returns a float32 view into an
+        internal buffer that is only valid until the next call.
+        """
+        n = len(frame)
+        if n > self._max_frame:
+            pending = self._buf[:self._filled].copy()
+            self._alloc(n)
+            self._buf[:len(pending)] = pending
+
+        self._buf[self._filled:self._filled + n] = frame
+        self._filled += n
+        self._samples_in += n
+
+        if self._filled < self._window:
+            return self._out[:0].reshape(-1)
+
+        cycles = (self._filled - self._window) // self.down + 1
+        windows = sliding_window_view(self._buf[:self._filled], self._window)[::self.down][:cycles]
+        out = self._out[:cycles]
+        np.matmul(windows, self._filter, out=out)
+
+        consumed = cycles * self.down
+        remaining = self._filled - consumed
+        self._buf[:remaining] = self._buf[consumed:self._filled]
+        self._filled = remaining
+
+        result = out.reshape(-1)
+        self._samples_out += len(result)
+        return result
+
+    def process_pcm16(self, pcm_bytes: bytes) -> bytes:
+        """Fast path: Int16 PCM bytes in, resampled Int16 PCM bytes out."""
+        if not pcm_bytes:
+            return b""
+        return self._to_pcm16(self.process(np.frombuffer(pcm_bytes, dtype=np.int16)))
+
+    def flush_pcm16(self) -> bytes:
+        """Drains the filter tail at the end of a stream and resets the state."""
+        expected = -(-self._samples_in * self.up // self.down)
+        missing = expected - self._samples_out
+        if missing <= 0:
+            self.reset()
+            return b""
+
+        zeros_needed = self._window + self.down
+        tail = self.process(np.zeros(zeros_needed, dtype=np.int16))
+        data = self._to_pcm16(tail[:max(0, len(tail) - (self._samples_out - expected))])
+        self.reset()
+        return data
+
+    def _to_pcm16(self, samples: np.ndarray) -> bytes:
+        np.clip(samples, -32768, 32767, out=samples)
+        pcm = self._pcm[:len(samples)]
+        np.copyto(pcm, samples, casting="unsafe")
+        return pcm.tobytes()
+
+def resample_pcm16(pcm_bytes: bytes, in_rate: int, out_rate: int) -> bytes:
+    """One-shot helper for a complete segment."""
+    if in_rate == out_rate or not pcm_bytes:
+        return pcm_bytes
+    resampler = StreamingResampler(in_rate, out_rate, max_frame=len(pcm_bytes) // 2)
+    return resampler.process_pcm16(pcm_bytes) + resampler.flush_pcm16()
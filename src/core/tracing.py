@@ -0,0 +1,229 @@
+import json
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+TRACE_FILE = os.path.expanduser("~/.ghostflow_traces.jsonl")
+# The file is rolled over to TRACE_FILE + ".1" past this size, so at most
+# twice this is kept on disk (a few thousand sessions).
+TRACE_MAX_BYTES = 1024 * 1024
+# Sessions the percentiles are computed over
+STATS_WINDOW = 200
+
+# Derived end-to-end timings: (name, from mark, to mark). Marks are
+# milliseconds since the hotkey was pressed.
+INTERVALS = (
+    ("hotkey_to_first_audio", "hotkey", "first_audio"),
+    ("release_to_first_text", "release", "first_text"),
+    ("release_to_transcript", "release", "transcript_complete"),
+    ("release_to_paste", "release", "pasted"),
+)
+# Spans, in pipeline order; a session's total per span is what gets ranked
+SPANS = ("resample", "upload", "realtime_commit", "segment", "transcribe", "refine", "clipboard")
+
+class Trace:
+    """Timings of one dictation session, from hotkey press to paste."""
+
+    def __init__(self, mode: str, model: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.mode = mode
+        self.model = model
+        self.status = "cancelled"
+        self.started = time.perf_counter()
+        self.timestamp = time.time()
+        self.marks: Dict[str, float] = {"hotkey": 0.0}
+        self.counts: Dict[str, int] = {}
+        self.spans: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, stage: str, at: Optional[float] = None, once: bool = True):
+        """Records when `stage` happened (perf_counter time, default now). once keeps the first occurrence."""
+        ms = ((at if at is not None else time.perf_counter()) - self.started) * 1000
+        with self._lock:
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+            if not once or stage not in self.marks:
+                self.marks[stage] = ms
+
+    def add_span(self, stage: str, seconds: float):
+        with self._lock:
+            self.spans.setdefault(stage, []).append(seconds * 1000)
+
+    def to_record(self) -> dict:
+        with self._lock:
+            return {
+                "id": self.id,
+                "ts": round(self.timestamp, 3),
+                "mode": self.mode,
+                "model": self.model,
+                "status": self.status,
+                "marks": {k: round(v, 1) for k, v in self.marks.items()},
+                "counts": {k: v for k, v in self.counts.items() if v > 1},
+                "spans": {k: {"ms": round(sum(v), 1), "count": len(v)} for k, v in self.spans.items()},
+            }
+
+class Tracer:
+    """
+    Holds the active session's Trace and appends finished ones, one JSON
+    line each, to a rolling file on a background thread. Every call is a
+    no-op when no session is active, so core code can trace unconditionally.
+    """
+
+    def __init__(self, path: str = TRACE_FILE, max_bytes: int = TRACE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._trace: Optional[Trace] = None
+        self._recent = None  # deque of finished records, loaded lazily
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = None
+
+    def begin(self, mode: str, model: str = "") -> Trace:
+        """Starts a new session; an unfinished previous one is dropped."""
+        self._trace = Trace(mode, model)
+        return self._trace
+
+    def current(self) -> Optional[Trace]:
+        return self._trace
+
+    def mark(self, stage: str, at: Optional[float] = None, once: bool = True):
+        trace = self._trace
+        if trace is not None:
+            trace.mark(stage, at, once)
+
+    def set_status(self, status: str):
+        trace = self._trace
+        if trace is not None:
+            trace.status = status
+
+    def set_mode(self, mode: str):
+        trace = self._trace
+        if trace is not None:
+            trace.mode = mode
+
+    @contextmanager
+    def span(self, stage: str):
+        """Times the enclosed block into the active session (if any), even if it raises."""
+        trace = self._trace
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if trace is not None:
+                trace.add_span(stage, time.perf_counter() - start)
+
+    def discard(self):
+        """Ends the active session without recording it."""
+        self._trace = None
+
+    def finish(self):
+        """Ends the active session and queues its record for the trace file."""
+        trace, self._trace = self._trace, None
+        if trace is None:
+            return
+        record = trace.to_record()
+        with self._lock:
+            if self._recent is not None:
+                self._recent.append(record)
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+                self._writer.start()
+        self._queue.put(record)
+
+    def _write_loop(self):
+        while True:
+            record = self._queue.get()
+            try:
+                if record is None:
+                    return
+                self._append(record)
+            except Exception as e:
+                print(f"ERROR: Failed to write latency trace: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _append(self, record: dict):
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            os.replace(self.path, self.path + ".1")
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def flush(self):
+        """Blocks until queued records are on disk."""
+        self._queue.join()
+
+    def close(self):
+        if self._writer is not None:
+            self.flush()
+            self._queue.put(None)
+            self._writer.join(timeout=2)
+            self._writer = None
+
+    def _load_recent(self) -> deque:
+        """Last STATS_WINDOW records from the trace files (caller holds the lock)."""
+        if self._recent is None:
+            lines = deque(maxlen=STATS_WINDOW)
+            for path in (self.path + ".1", self.path):
+                try:
+                    with open(path) as f:
+                        lines.extend(f)
+                except OSError:
+                    continue
+            self._recent = deque(maxlen=STATS_WINDOW)
+            for line in lines:
+                try:
+                    self._recent.append(json.loads(line))
+                except ValueError:
+                    continue
+        return self._recent
+
+    def recent(self) -> List[dict]:
+        if self._recent is None:
+            # The first load reads the file, so make sure it has every finished session
+            self.flush()
+        with self._lock:
+            return list(self._load_recent())
+
+    def stats(self) -> dict:
+        """p50/p95 (ms) per span and end-to-end interval over the last STATS_WINDOW sessions."""
+        return latency_stats(self.recent())
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def latency_stats(records: List[dict]) -> dict:
+    samples: Dict[str, List[float]] = {}
+    for record in records:
+        if record.get("status") != "ok":
+            continue
+        marks = record.get("marks", {})
+        for name, start, end in INTERVALS:
+            if start in marks and end in marks and marks[end] >= marks[start]:
+                samples.setdefault(name, []).append(marks[end] - marks[start])
+        for name, span in record.get("spans", {}).items():
+            samples.setdefault(name, []).append(span["ms"])
+
+    order = [name for name, _, _ in INTERVALS] + list(SPANS)
+    stages = []
+    for name in sorted(samples, key=lambda n: order.index(n) if n in order else len(order)):
+        values = sorted(samples[name])
+        stages.append({
+            "stage": name,
+            "count": len(values),
+            "p50_ms": round(percentile(values, 50), 1),
+            "p95_ms": round(percentile(values, 95), 1),
+        })
+    return {
+        "sessions": len(records),
+        "ok_sessions": sum(1 for r in records if r.get("status") == "ok"),
+        "stages": stages,
+    }
+
+tracer = Tracer()
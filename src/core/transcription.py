@@ -0,0 +1,239 @@
+from typing import Callable, Optional
+from src.config import current_config
+from src.core.ai import AIProcessor, is_whisper_model
+from src.core.local_refiner import apply_replacements
+from src.core.pipeline import OrderedTaskPipeline
+from src.core.tracing import tracer
+
+try:
+    import webrtcvad
+except Exception as e:
+    print(f"WARNING: Failed to import webrtcvad: {e}")
+    webrtcvad = None
+
+# The dictation pipeline without Qt: DictationCore runs these on its worker
+# threads (the GUI gets the callbacks as signals), and scripts/bench_corpus.py drives them
+# headlessly. Failures are raised; "No speech detected." is a ValueError.
+
+class BatchTranscription:
+    """Transcribes (and, for Whisper, refines) one finished batch recording."""
+
+    def __init__(self, audio_path: str, speculative=None, processor: Optional[AIProcessor] = None):
+        self.audio_path = audio_path
+        self.speculative = speculative  # SpeculativeTranscription that ran during recording
+        self.processor = processor or AIProcessor()
+
+    def run(self, on_refine_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Returns the final text. on_refine_delta receives the refined text so far."""
+        if not current_config.openai_api_key:
+            raise ValueError("No OpenAI API Key set.")
+
+        raw_text = None
+        with tracer.span("transcribe"):
+            if self.speculative is not None:
+                try:
+                    raw_text = self.speculative.finish()
+                except Exception as e:
+                    print(f"DEBUG: Speculative transcription failed ({e}). Transcribing the full recording.")
+            if raw_text is None:
+                raw_text = self.processor.transcribe(self.audio_path)
+        tracer.mark("transcript_complete")
+        print(f"DEBUG: Raw Transcribe Result: '{raw_text}'")
+
+        if not raw_text or not raw_text.strip():
+            raise ValueError("No speech detected.")
+
+        if not is_whisper_model(current_config.transcription_model):
+            # Not refined, but the user's dictionary still applies (refine() does it for Whisper)
+            return apply_replacements(raw_text, current_config.refine_replacements)
+        clean_text = self.processor.refine(raw_text, on_delta=on_refine_delta)
+        print(f"DEBUG: Refined Text: '{clean_text}'")
+        if not clean_text:
+            # Nothing left once fillers are removed
+            raise ValueError("No speech detected.")
+        return clean_text
+
+class StreamingTranscription:
+    """
+    Consumes the recorder's ring until request_stop() and the ring is
+    drained. With a local engine every frame goes straight to it; otherwise
+    a VAD cuts the audio into segments that are transcribed in the cloud on
+    an OrderedTaskPipeline and refined once at the end.
+    """
+
+    def __init__(self, ring, sample_rate, vad_silence_ms=600, vad_aggressiveness=2, min_segment_ms=300,
+                 local_engine=None, vad=None,
+                 on_partial: Optional[Callable[[str, str], None]] = None,
+                 on_segment: Optional[Callable[[str], None]] = None):
+        self.ring = ring  # Int16RingBuffer filled by AudioRecorder's callback
+        self.sample_rate = sample_rate
+        self.vad_silence_ms = vad_silence_ms
+        self.vad_aggressiveness = vad_aggressiveness
+        self.min_segment_ms = min_segment_ms
+        self.local_engine = local_engine  # If provided, we use local parakeet
+        self.vad = vad  # anything with is_speech(frame_bytes, sample_rate); default webrtcvad
+        self.on_partial = on_partial or (lambda finalized, live: None)    # finalized_text, live_text
+        self.on_segment = on_segment or (lambda text: None)                # text of a completed cloud segment
+        self._stop_requested = False
+        self.processor = AIProcessor()
+        self._finalized_segments = []
+        self._segments = None  # OrderedTaskPipeline of in-flight cloud segments
+        self.segment_stats = None
+
+    def request_stop(self):
+        self._stop_requested = True
+
+    def _finalized_text(self):
+        parts = [p.strip() for p in self._finalized_segments if p and p.strip()]
+        return " ".join(parts).strip()
+
+    def _next_frame(self):
+        """
+        Blocks for the next frame from the ring (a memoryview, valid until the
+        next call). Returns None once a stop was requested and the ring is drained.
+        """
+        while True:
+            frame = self.ring.read(timeout=0.1)
+            if frame is not None:
+                return frame
+            if self._stop_requested:
+                return None
+
+    def run(self) -> str:
+        """Returns the final text once stopped; raises on failure."""
+        if self.local_engine:
+            return self._run_local()
+
+        print("DEBUG: StreamingTranscription started (Cloud Mode)")
+        vad = self.vad
+        if vad is None:
+            if webrtcvad is None:
+                raise RuntimeError("Streaming VAD not available.")
+            vad = webrtcvad.Vad(self.vad_aggressiveness)
+
+        # Open the realtime socket while the user starts speaking
+        self.processor.warm_realtime()
+        self._segments = OrderedTaskPipeline(max(1, current_config.segment_max_parallel), name="segment")
+        try:
+            return self._run_cloud(vad)
+        finally:
+            self.segment_stats = self._segments.stats()
+            print(f"DEBUG: Segment pipeline: {self.segment_stats}")
+            self._segments.shutdown()
+
+    def _run_local(self) -> str:
+        print("DEBUG: StreamingTranscription started (Local Mode)")
+        last_text = ""
+        self.local_engine.start_stream()
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                break
+
+            # The engine copies the frame into its own buffer, so the view can go straight in
+            try:
+                text = self.local_engine.process_audio(frame)
+            except Exception as e:
+                raise RuntimeError(f"Local Engine Error: {e}") from e
+            if text != last_text:
+                last_text = text
+                self.on_partial("", text)
+
+        try:
+            final_text = self.local_engine.stop_stream()
+            if final_text:
+                last_text = final_text
+        except Exception:
+            pass
+        tracer.mark("transcript_complete")
+        return apply_replacements(last_text, current_config.refine_replacements)
+
+    def _transcribe_segment(self, seq, frames_bytes, realtime_segment):
+        """Runs on the segment pool, so the VAD loop keeps reading the ring meanwhile."""
+        with tracer.span("segment"):
+            return self._transcribe_segment_audio(seq, frames_bytes, realtime_segment)
+
+    def _transcribe_segment_audio(self, seq, frames_bytes, realtime_segment):
+        if realtime_segment:
+            # Audio is already uploaded; show transcription deltas as they arrive,
+            # but only for the oldest segment so the overlay text stays in order.
+            def on_delta(live):
+                if self._segments.next_seq == seq:
+                    self.on_partial(self._finalized_text(), live)
+            return realtime_segment.commit(on_delta=on_delta)
+        return self.processor.transcribe_pcm16(b"".join(frames_bytes), self.sample_rate)
+
+    def _process_segment(self, frames_bytes, segment_ms, realtime_segment=None):
+        if segment_ms < self.min_segment_ms:
+            if realtime_segment:
+                realtime_segment.cancel()
+            return
+        tracer.mark("vad_segment_close", once=False)
+        seq = self._segments.submit_seq
+        self._segments.submit(self._transcribe_segment, seq, frames_bytes, realtime_segment,
+                              on_wait=self._deliver_segments)
+
+    def _deliver_segments(self, wait=False):
+        """Hands finished segment texts on in recording order. With wait, blocks for all of them."""
+        texts = self._segments.drain() if wait else self._segments.poll()
+        for text in texts:
+            if text and text.strip():
+                # Append raw segment text and emit immediate partial update.
+                self._finalized_segments.append(text.strip())
+                self.on_partial(self._finalized_text(), text.strip())
+                self.on_segment(text.strip())
+
+    def _run_cloud(self, vad) -> str:
+        """VAD segmentation loop; closed segments go to the pipeline and come back in order."""
+        silence_ms = 0
+        current_frames = []
+        current_duration = 0
+        frame_ms = int(1000 * self.ring.frame_len / self.sample_rate)
+        in_speech = False
+        realtime_segment = None
+
+        while True:
+            frame = self._next_frame()
+            if frame is None:
+                break
+
+            self._deliver_segments()
+
+            # Segments keep their frames, so take an owned copy of the ring slot
+            frame_bytes = frame.tobytes()
+            is_speech = vad.is_speech(frame_bytes, self.sample_rate)
+
+            if is_speech:
+                if not in_speech:
+                    print("DEBUG: VAD speech start")
+                    in_speech = True
+                    if realtime_segment is None:
+                        realtime_segment = self.processor.open_realtime_segment(self.sample_rate)
+                current_frames.append(frame_bytes)
+                if realtime_segment:
+                    realtime_segment.append(frame_bytes)
+                current_duration += frame_ms
+                silence_ms = 0
+            else:
+                if current_frames:
+                    silence_ms += frame_ms
+                    if silence_ms >= self.vad_silence_ms:
+                        print(f"DEBUG: VAD silence reached ({silence_ms}ms). Closing segment ({current_duration}ms).")
+                        self._process_segment(current_frames, current_duration, realtime_segment)
+                        current_frames = []
+                        current_duration = 0
+                        silence_ms = 0
+                        in_speech = False
+                        realtime_segment = None
+
+        if current_frames:
+            self._process_segment(current_frames, current_duration, realtime_segment)
+        self._deliver_segments(wait=True)
+        tracer.mark("transcript_complete")
+
+        final_text = self._finalized_text()
+        if final_text and is_whisper_model(current_config.transcription_model):
+            final_text = self.processor.refine(final_text.strip())
+        elif final_text:
+            final_text = apply_replacements(final_text, current_config.refine_replacements)
+        return final_text
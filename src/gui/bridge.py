@@ -2,6 +2,8 @@ import json
 from PyQt6.QtCore import QObject, pyqtSlot, pyqtSignal, QTimer
 from src.config import current_config, Config
 from src.core.history import HistoryManager
+from src.core.refine_cache import get_refine_cache
+from src.core.tracing import tracer
 
 class UIBridge(QObject):
     """
@@ -11,21 +13,37 @@ class UIBridge(QObject):
     # Signals to send data to JS
     status_update = pyqtSignal(str)     # For general system status
     overlay_update = pyqtSignal(str)    # For overlay state {stage, text}
+    ui_loaded = pyqtSignal(str)         # A page (mode) has rendered and connected
+    overlay_painted = pyqtSignal(int)   # An overlay update tagged with "ack" has been painted
     
     def __init__(self, app_instance):
         super().__init__()
         self.app = app_instance
-        self.last_overlay_state = json.dumps({"stage": "idle", "text": ""})
+        self.last_overlay_state = {"stage": "idle", "text": ""}
 
-    def emit_overlay_update(self, data: str):
+    def emit_overlay_update(self, payload: dict):
         """Store and emit overlay updates so late subscribers can sync."""
-        self.last_overlay_state = data
-        self.overlay_update.emit(data)
+        self.last_overlay_state = payload
+        self.overlay_update.emit(json.dumps(payload))
+
+    def set_overlay_state(self, payload: dict):
+        """Store only; pages that poll get_overlay_state (the settings footer) pick it up."""
+        self.last_overlay_state = payload
 
     @pyqtSlot(result=str)
     def get_overlay_state(self):
         """Return latest overlay state for late-connecting UIs."""
-        return self.last_overlay_state
+        return json.dumps(self.last_overlay_state)
+
+    @pyqtSlot(str)
+    def ui_ready(self, mode):
+        """Called by React once a page has rendered and its channel is connected."""
+        self.ui_loaded.emit(mode)
+
+    @pyqtSlot(int)
+    def overlay_rendered(self, ack):
+        """Called by React after painting an overlay update that carried an ack (benchmarks)."""
+        self.overlay_painted.emit(ack)
 
     @pyqtSlot(result=str)
     def get_settings(self):
@@ -40,9 +58,17 @@ class UIBridge(QObject):
             "system_prompt": current_config.system_prompt,
             "sound_feedback": current_config.sound_feedback,
             "overlay_position": current_config.overlay_position,
+            "overlay_renderer": current_config.overlay_renderer,
             "streaming_enabled": current_config.streaming_enabled,
             "vad_silence_ms": current_config.vad_silence_ms,
             "vad_aggressiveness": current_config.vad_aggressiveness,
+            "upload_encoding": current_config.upload_encoding,
+            "refine_mode": current_config.refine_mode,
+            "refine_replacements": current_config.refine_replacements,
+            "local_num_threads": current_config.local_num_threads,
+            "local_provider": current_config.local_provider,
+            "local_decoding_method": current_config.local_decoding_method,
+            "local_max_active_paths": current_config.local_max_active_paths,
             "permissions_granted": perms
         }
         return json.dumps(data)
@@ -68,19 +94,43 @@ class UIBridge(QObject):
             if changed:
                 current_config.save()
                 print(f"DEBUG: Settings saved via Bridge (streaming_enabled={current_config.streaming_enabled}, vad_silence_ms={current_config.vad_silence_ms}, vad_aggressiveness={current_config.vad_aggressiveness})")
+                self.app.on_settings_changed()
                 
         except Exception as e:
             print(f"ERROR: Error saving settings in Bridge: {e}")
 
     @pyqtSlot(result=str)
     def get_history(self):
-        """Returns the history list as a JSON string."""
+        """Returns the most recent page of history as a JSON string."""
         return json.dumps(HistoryManager.load())
 
+    @pyqtSlot(int, int, result=str)
+    def get_history_page(self, offset, limit):
+        """Returns {entries, total} for one page of history, newest first."""
+        return json.dumps({
+            "entries": HistoryManager.load(offset, limit),
+            "total": HistoryManager.count(),
+        })
+
+    @pyqtSlot(str, int, int, float, float, result=str)
+    def search_history(self, query, offset, limit, start_ts, end_ts):
+        """
+        Returns {entries, total} for history matching every word of `query`
+        (prefix match), within [start_ts, end_ts] (0 = open-ended), newest first.
+        """
+        entries, total = HistoryManager.search(query, offset, limit, start_ts or None, end_ts or None)
+        return json.dumps({"entries": entries, "total": total})
+
+    @pyqtSlot(result=str)
+    def get_latency_stats(self):
+        """Returns {sessions, ok_sessions, stages: [{stage, count, p50_ms, p95_ms}]} from recent traces."""
+        return json.dumps(tracer.stats())
+
     @pyqtSlot()
     def clear_history(self):
-        """Clears the history file."""
+        """Clears the history file, and the refine cache, which also holds past transcripts."""
         HistoryManager.clear()
+        get_refine_cache().clear()
         print("DEBUG: History cleared via Bridge")
 
     @pyqtSlot()
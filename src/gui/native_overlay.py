@@ -0,0 +1,172 @@
+import math
+import time
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtGui import QPainter, QColor, QFont, QFontMetrics, QPen
+from PyQt6.QtCore import Qt, QTimer, QRectF, pyqtSignal
+
+# Same look as OverlayWidget in src/ui/app.html (Tailwind values in comments)
+PILL_BG = QColor(0x12, 0x12, 0x12)            # bg-[#121212]
+PILL_BORDER = QColor(255, 255, 255, 13)       # border-white/5
+PILL_RADIUS = 12                              # rounded-xl
+PAD_X, PAD_Y = 16, 10                         # px-4 py-2.5
+GAP = 12                                      # gap-3
+ICON_SIZE = 24                                # w-6 h-6
+BAR_WIDTH, BAR_GAP = 4, 2                     # w-1, gap-0.5
+BAR_COLORS = [QColor(99, 102, 241), QColor(168, 85, 247), QColor(236, 72, 153)]  # indigo/purple/pink-500
+BAR_DELAYS_S = [0.0, 0.1, 0.2]
+BAR_MIN_H, BAR_MAX_H = 4, 14                  # @keyframes waveform
+TITLE_COLOR = QColor(107, 114, 128)           # text-gray-500
+TEXT_COLOR = QColor(255, 255, 255, 230)       # text-white/90
+TEXT_MIN_W, TEXT_MAX_W = 100, 240             # min-w-[100px] max-w-[240px]
+FRAME_MS = 33
+
+class NativeOverlay(QWidget):
+    """
+    The dictation overlay drawn with QPainter: the same pill as the web
+    overlay without a Chromium view. set_state() takes the stage and text
+    directly and repaints; the waveform animates only while it's visible.
+    Long live text shows its most recent words.
+    """
+    painted = pyqtSignal()  # after each paint (benchmarks)
+
+    def __init__(self, width=340, height=80):
+        super().__init__()
+        self.resize(width, height)
+        self.setWindowTitle("Ghost Flow")
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
+        self.setWindowFlags(
+            Qt.WindowType.FramelessWindowHint |
+            Qt.WindowType.WindowStaysOnTopHint |
+            Qt.WindowType.ToolTip |
+            Qt.WindowType.WindowDoesNotAcceptFocus
+        )
+        self.setFocusPolicy(Qt.FocusPolicy.NoFocus)
+
+        self.stage = "idle"
+        self.text = ""
+        self._lines = []  # wrapped display text
+
+        self.title_font = QFont(self.font())
+        self.title_font.setPixelSize(10)
+        self.title_font.setBold(True)
+        self.title_font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 0.5)  # tracking-wider
+        self.text_font = QFont(self.font())
+        self.text_font.setPixelSize(12)
+
+        self._anim_start = time.perf_counter()
+        self._timer = QTimer(self)
+        self._timer.setInterval(FRAME_MS)
+        self._timer.timeout.connect(self.update)
+
+    def show_overlay(self):
+        # setVisible with WA_ShowWithoutActivating doesn't steal focus
+        self.setVisible(True)
+
+    def set_state(self, stage, text):
+        self.stage = stage
+        self.text = text or ""
+        self._lines = self._layout_text()
+        if self._active():
+            if not self._timer.isActive():
+                self._anim_start = time.perf_counter()
+                self._timer.start()
+        else:
+            self._timer.stop()
+        self.update()
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def showEvent(self, event):
+        if self._active():
+            self._timer.start()
+        super().showEvent(event)
+
+    def _active(self):
+        # The web overlay renders nothing for these either
+        return self.stage not in ("idle", "done")
+
+    def _display_text(self):
+        if self.text.strip():
+            return self.text.strip()
+        return "Processing..." if self.stage == "processing" else "Listening..."
+
+    def _max_lines(self):
+        line_h = QFontMetrics(self.text_font).lineSpacing()
+        title_h = QFontMetrics(self.title_font).lineSpacing()
+        return max(1, (self.height() - 2 * PAD_Y - title_h) // line_h)
+
+    def _layout_text(self):
+        """Word-wraps to TEXT_MAX_W; if that's more lines than fit, keeps the last ones, led by an ellipsis."""
+        fm = QFontMetrics(self.text_font)
+        lines = []
+        current = ""
+        for word in self._display_text().split():
+            candidate = f"{current} {word}" if current else word
+            if current and fm.horizontalAdvance(candidate) > TEXT_MAX_W:
+                lines.append(current)
+                current = word
+            else:
+                current = candidate
+        if current:
+            lines.append(current)
+        lines = [fm.elidedText(line, Qt.TextElideMode.ElideLeft, TEXT_MAX_W) for line in lines]
+        max_lines = self._max_lines()
+        if len(lines) > max_lines:
+            lines = lines[-max_lines:]
+            words = lines[0].split()
+            while len(words) > 1 and fm.horizontalAdvance("…" + " ".join(words)) > TEXT_MAX_W:
+                words.pop(0)
+            lines[0] = "…" + " ".join(words)
+        return lines
+
+    def paintEvent(self, event):
+        if not self._active():
+            self.painted.emit()
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        title_fm = QFontMetrics(self.title_font)
+        text_fm = QFontMetrics(self.text_font)
+        text_w = max([TEXT_MIN_W] + [text_fm.horizontalAdvance(line) for line in self._lines])
+        text_w = min(text_w, TEXT_MAX_W)
+        content_h = title_fm.lineSpacing() + text_fm.lineSpacing() * len(self._lines)
+        pill_w = PAD_X * 2 + ICON_SIZE + GAP + text_w
+        pill_h = PAD_Y * 2 + max(ICON_SIZE, content_h)
+        pill = QRectF((self.width() - pill_w) / 2, (self.height() - pill_h) / 2, pill_w, pill_h)
+
+        # Pill
+        painter.setPen(QPen(PILL_BORDER, 1))
+        painter.setBrush(PILL_BG)
+        painter.drawRoundedRect(pill.adjusted(0.5, 0.5, -0.5, -0.5), PILL_RADIUS, PILL_RADIUS)
+
+        # Waveform: three bars, each easing between BAR_MIN_H and BAR_MAX_H once a second
+        painter.setPen(Qt.PenStyle.NoPen)
+        elapsed = time.perf_counter() - self._anim_start
+        icon_cx = pill.left() + PAD_X + ICON_SIZE / 2
+        icon_cy = pill.center().y()
+        bars_w = 3 * BAR_WIDTH + 2 * BAR_GAP
+        for i, color in enumerate(BAR_COLORS):
+            phase = max(0.0, elapsed - BAR_DELAYS_S[i]) % 1.0
+            h = BAR_MIN_H + (BAR_MAX_H - BAR_MIN_H) * (1 - math.cos(2 * math.pi * phase)) / 2
+            x = icon_cx - bars_w / 2 + i * (BAR_WIDTH + BAR_GAP)
+            painter.setBrush(color)
+            painter.drawRoundedRect(QRectF(x, icon_cy - h / 2, BAR_WIDTH, h), BAR_WIDTH / 2, BAR_WIDTH / 2)
+
+        # Title and text
+        x = pill.left() + PAD_X + ICON_SIZE + GAP
+        y = pill.top() + (pill_h - content_h) / 2
+        painter.setFont(self.title_font)
+        painter.setPen(TITLE_COLOR)
+        painter.drawText(QRectF(x, y, text_w, title_fm.lineSpacing()), Qt.AlignmentFlag.AlignVCenter, "GHOST FLOW")
+        y += title_fm.lineSpacing()
+        painter.setFont(self.text_font)
+        painter.setPen(TEXT_COLOR)
+        for line in self._lines:
+            painter.drawText(QRectF(x, y, text_w, text_fm.lineSpacing()), Qt.AlignmentFlag.AlignVCenter, line)
+            y += text_fm.lineSpacing()
+        painter.end()
+        self.painted.emit()
@@ -1,11 +1,24 @@
 import os
 import sys
+import time
 from PyQt6.QtWidgets import QMainWindow
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineSettings
 from PyQt6.QtWebChannel import QWebChannel
 from PyQt6.QtCore import QUrl, Qt, QTimer
 
+UI_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../ui"))
+# Precompiled bundle from scripts/build_ui.py; app.html itself needs the network (CDN React, Babel, Tailwind)
+BUNDLE_HTML = os.path.join(UI_DIR, "dist", "app.html")
+SOURCE_HTML = os.path.join(UI_DIR, "app.html")
+
+def ui_html_path():
+    """The page to load: the local bundle if it has been built, otherwise the source page."""
+    if os.path.exists(BUNDLE_HTML):
+        return BUNDLE_HTML
+    print("WARNING: UI bundle not built (run scripts/build_ui.py). Loading app.html from CDN sources.")
+    return SOURCE_HTML
+
 # Custom Page to intercept Console Logs (Crucial for debugging blank screens)
 class WebPage(QWebEnginePage):
     def javaScriptConsoleMessage(self, level, message, lineNumber, sourceID):
@@ -13,10 +26,13 @@ class WebPage(QWebEnginePage):
         print(f"JS [{lineNumber}]: {message}")
 
 class WebWindow(QMainWindow):
-    def __init__(self, bridge, mode="settings", width=900, height=600):
+    def __init__(self, bridge, mode="settings", width=900, height=600, html_path=None):
         super().__init__()
         self.bridge = bridge
         self.mode = mode
+        self.created_at = time.perf_counter()
+        self.ready_after = None  # seconds from creation until the page's React app reported in
+        self.bridge.ui_loaded.connect(self._on_ui_loaded)
         
         # Window Setup
         self.resize(width, height)
@@ -68,8 +84,8 @@ class WebWindow(QMainWindow):
         self.page.setWebChannel(self.channel)
 
         # Load Content
-        html_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "../ui/app.html"))
-        
+        html_path = html_path or ui_html_path()
+
         if not os.path.exists(html_path):
             print(f"ERROR: HTML file not found at {html_path}")
         else:
@@ -81,6 +97,12 @@ class WebWindow(QMainWindow):
         
         self.setCentralWidget(self.webview)
 
+    def _on_ui_loaded(self, mode):
+        if mode != self.mode or self.ready_after is not None:
+            return
+        self.ready_after = time.perf_counter() - self.created_at
+        print(f"DEBUG: {self.mode} UI ready {self.ready_after:.2f}s after window creation")
+
     def show_overlay(self):
         """ Specialized show method for overlay to ensure no focus steal """
         if self.mode == "overlay":
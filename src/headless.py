@@ -0,0 +1,154 @@
+"""
+Ghost Flow without the GUI: the DictationCore on the microphone, or on a
+WAV file, with each result printed to stdout. Nothing here imports Qt,
+pynput or pyautogui, so it starts in a fraction of the app's time and runs
+on machines without a display.
+
+Usage (from the project root):
+    PYTHONPATH=. python src/headless.py                # Enter starts/stops a dictation
+    PYTHONPATH=. python src/headless.py --file a.wav   # transcribe a recording and exit
+    PYTHONPATH=. python src/headless.py --quiet        # only the transcripts on stdout
+
+The transcription mode, model and API key come from the same config as the app.
+"""
+import argparse
+import os
+import queue
+import sys
+import numpy as np
+
+# --quiet has to apply before the imports below print their DEBUG lines
+RESULTS = sys.stdout  # transcripts always go here
+if "--quiet" in sys.argv[1:]:
+    sys.stdout = open(os.devnull, "w")
+
+from src.config import current_config
+from src.core.dictation import DictationCore, DictationListener, LOCAL_MODEL
+from src.core.encoder import read_pcm16
+from src.core.model_manager import ModelManager, ModelDownloader
+from src.core.recorder import AudioRecorder
+from src.core.replay import ReplayInputStream
+from src.core.resampler import resample_pcm16
+
+class QueueListener(DictationListener):
+    """Hands each dictation's outcome, ("result" | "error", text), to the main thread."""
+
+    def __init__(self):
+        self.outcomes = queue.Queue()
+
+    def on_result(self, text, streaming):
+        self.outcomes.put(("result", text))
+
+    def on_error(self, message, streaming):
+        self.outcomes.put(("error", message))
+
+def ensure_local_model():
+    """Downloads the local model first if it's selected and missing. Returns False if that failed."""
+    if current_config.transcription_model != LOCAL_MODEL or ModelManager.is_model_ready():
+        return True
+    print("DEBUG: Local model missing. Downloading...")
+    outcome = {}
+    ModelDownloader(
+        on_progress=lambda msg: print(f"DEBUG: {msg}"),
+        on_finished=lambda success, msg: outcome.update(success=success, message=msg),
+    ).run()
+    if not outcome.get("success"):
+        print(f"ERROR: Model download failed: {outcome.get('message')}", file=sys.stderr)
+        return False
+    return True
+
+def file_recorder(path):
+    """An AudioRecorder that plays the WAV as fast as the pipeline takes it, and a dict that gets the stream."""
+    recorder = None
+    opened = {}
+
+    def open_stream(**kwargs):
+        pcm, rate = read_pcm16(path)
+        pcm = resample_pcm16(pcm, rate, recorder.sample_rate)
+        stream = ReplayInputStream(np.frombuffer(pcm, dtype=np.int16), speed=0,
+                                   can_write=lambda n: recorder.ring.free() >= n, **kwargs)
+        opened["stream"] = stream
+        return stream
+
+    recorder = AudioRecorder(stream_factory=open_stream)
+    return recorder, opened
+
+def finish_dictation(core, listener, out):
+    """Stops the running dictation and prints its text. Returns False on failure."""
+    try:
+        transcribing = core.stop()
+    except Exception as e:
+        print(f"ERROR: Recorder Stop Error: {e}", file=sys.stderr)
+        core.finish_session()
+        return False
+    if not transcribing:
+        core.finish_session()
+        return True
+    kind, text = listener.outcomes.get()
+    core.finish_session()
+    if kind == "error":
+        print(f"ERROR: {text}", file=sys.stderr)
+        return False
+    if text:
+        print(text, file=out, flush=True)
+    return True
+
+def run_file(core, listener, opened, out):
+    try:
+        core.start()
+    except Exception as e:
+        print(f"ERROR: Could not start: {e}", file=sys.stderr)
+        core.finish_session()
+        return False
+    opened["stream"].wait()
+    return finish_dictation(core, listener, out)
+
+def run_interactive(core, listener, out):
+    print("Press Enter to start dictating, Enter again to stop. Ctrl+D quits.", file=sys.stderr)
+    ok = True
+    while True:
+        if not sys.stdin.readline():
+            if core.recorder.is_recording:
+                ok = finish_dictation(core, listener, out) and ok
+            return ok
+        if not core.recorder.is_recording:
+            try:
+                core.start()
+            except Exception as e:
+                print(f"ERROR: Could not start recording: {e}", file=sys.stderr)
+                core.finish_session()
+                ok = False
+                continue
+            print("Recording... (Enter to stop)", file=sys.stderr)
+        else:
+            ok = finish_dictation(core, listener, out) and ok
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--file", help="Transcribe this 16-bit WAV instead of the microphone")
+    parser.add_argument("--quiet", action="store_true", help="Hide debug output; stdout only gets transcripts")
+    args = parser.parse_args()
+
+    out = RESULTS
+    if not ensure_local_model():
+        sys.exit(1)
+
+    listener = QueueListener()
+    opened = None
+    recorder = None
+    if args.file:
+        recorder, opened = file_recorder(args.file)
+    core = DictationCore(listener, recorder=recorder)
+    try:
+        if args.file:
+            ok = run_file(core, listener, opened, out)
+        else:
+            ok = run_interactive(core, listener, out)
+    except KeyboardInterrupt:
+        ok = False
+    finally:
+        core.close()
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
+import os
 import sys
-import json
 import time
-import queue
-import pyautogui
+# Taken before the GUI imports below so the startup log covers them
+LAUNCH_TIME = time.perf_counter()
 import pyperclip
 import ctypes
 import subprocess
@@ -13,253 +13,64 @@ from PyQt6.QtGui import QAction, QIcon, QPixmap, QPainter, QColor, QBrush, QRadi
 from PyQt6.QtCore import pyqtSlot, QThread, QTimer, Qt, QObject, pyqtSignal, QSize
 
 from src.config import current_config
-from src.core.recorder import AudioRecorder
-from src.core.ai import AIProcessor, is_whisper_model
-from src.core.history import HistoryManager
-
-# New modules for local inference
+from src.core.dictation import DictationCore, DictationListener, EngineLoadError, LOCAL_MODEL
 from src.core.model_manager import ModelManager, ModelDownloader
-from src.core.local_engine import LocalParakeetEngine
+from src.core.tracing import tracer
 
 # New GUI components
 from src.gui.bridge import UIBridge
+from src.gui.native_overlay import NativeOverlay
 from src.gui.web_window import WebWindow
 
-try:
-    import webrtcvad
-except Exception as e:
-    print(f"WARNING: Failed to import webrtcvad: {e}")
-    webrtcvad = None
+# Gap between consecutive early pastes so the target app has read the clipboard
+PASTE_SPACING_MS = 150
+# Set to quit as soon as the hotkey is live (scripts/bench_startup.py)
+EXIT_WHEN_READY_ENV = "GHOSTFLOW_EXIT_WHEN_READY"
 
-class TranscriptionWorker(QThread):
-    finished = pyqtSignal(str) 
-    error = pyqtSignal(str)
+def paste_shortcut():
+    """Sends Cmd+V. pyautogui is slow to import, so it's loaded on the first paste."""
+    import pyautogui
+    pyautogui.hotkey('command', 'v')
 
-    def __init__(self, audio_path):
-        super().__init__()
-        self.audio_path = audio_path
-        self.processor = AIProcessor()
+class CoreSignals(QObject, DictationListener):
+    """Re-emits DictationCore's callbacks as signals, so GhostApp's slots run on the GUI thread."""
+    partial_update = pyqtSignal(str, str)   # finalized_text, live_text
+    segment_finished = pyqtSignal(str)      # text of a completed cloud segment
+    refine_progress = pyqtSignal(str)       # refined text so far (streaming refine)
+    paste_ready = pyqtSignal(str)           # complete sentences that can be pasted early
+    result = pyqtSignal(str, bool)          # final text, streaming
+    error = pyqtSignal(str, bool)           # message, streaming
+    engine_error = pyqtSignal(str)          # the local engine's pre-warm failed
+    engine_loaded = pyqtSignal()            # a pre-warm waited on by after_engine_load() finished
 
-    def run(self):
-        print("DEBUG: TranscriptionWorker started")
-        try:
-            if not current_config.openai_api_key:
-                raise ValueError("No OpenAI API Key set.")
+    def on_partial(self, finalized_text, live_text):
+        self.partial_update.emit(finalized_text, live_text)
 
-            raw_text = self.processor.transcribe(self.audio_path)
-            print(f"DEBUG: Raw Transcribe Result: '{raw_text}'")
-            
-            if not raw_text or not raw_text.strip():
-                self.error.emit("No speech detected.")
-                return
+    def on_segment(self, text):
+        self.segment_finished.emit(text)
 
-            if is_whisper_model(current_config.transcription_model):
-                clean_text = self.processor.refine(raw_text)
-                print(f"DEBUG: Refined Text: '{clean_text}'")
-            else:
-                clean_text = raw_text
-            self.finished.emit(clean_text)
-        except Exception as e:
-            print(f"DEBUG: TranscriptionWorker Error: {e}")
-            self.error.emit(str(e))
+    def on_refine_progress(self, text):
+        self.refine_progress.emit(text)
 
-class StreamingTranscriptionWorker(QThread):
-    partial_update = pyqtSignal(str, str)   # finalized_text, live_text
-    session_finished = pyqtSignal(str)
-    error = pyqtSignal(str)
+    def on_early_paste(self, text):
+        self.paste_ready.emit(text)
 
-    def __init__(self, frame_queue, sample_rate, vad_silence_ms=600, vad_aggressiveness=2, min_segment_ms=300, local_engine=None):
-        super().__init__()
-        self.frame_queue = frame_queue
-        self.sample_rate = sample_rate
-        self.vad_silence_ms = vad_silence_ms
-        self.vad_aggressiveness = vad_aggressiveness
-        self.min_segment_ms = min_segment_ms
-        self.local_engine = local_engine # If provided, we use local parakeet
-        self._stop_requested = False
-        self._error_emitted = False
-        self.processor = AIProcessor()
-        self._finalized_segments = []
-
-    def request_stop(self):
-        self._stop_requested = True
-
-    def _finalized_text(self):
-        parts = [p.strip() for p in self._finalized_segments if p and p.strip()]
-        return " ".join(parts).strip()
-
-    def _frame_bytes(self, frame):
-        if hasattr(frame, "ndim") and frame.ndim > 1:
-            frame = frame[:, 0]
-        return frame.tobytes()
-
-    def _process_segment(self, frames_bytes, segment_ms):
-        if segment_ms < self.min_segment_ms:
-            return
-        pcm_bytes = b"".join(frames_bytes)
-        try:
-            text = self.processor.transcribe_pcm16(pcm_bytes, self.sample_rate)
-        except Exception as e:
-            self._error_emitted = True
-            self.error.emit(str(e))
-            return
-        if text and text.strip():
-            # Append raw segment text and emit immediate partial update.
-            self._finalized_segments.append(text.strip())
-            self.partial_update.emit(self._finalized_text(), text.strip())
-
-    def run_local(self):
-        """Logic for Local Parakeet Engine (No VAD segmentation needed for the engine itself)"""
-        print("DEBUG: StreamingTranscriptionWorker running in LOCAL mode")
-        if not self.local_engine:
-            self.error.emit("Local engine not initialized")
-            return
+    def on_result(self, text, streaming):
+        self.result.emit(text, streaming)
 
-        self.local_engine.start_stream()
-        
-        while True:
-            if self._stop_requested and self.frame_queue.empty():
-                break
-            try:
-                frame = self.frame_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-            if frame is None:
-                continue
-            
-            frame_bytes = self._frame_bytes(frame)
-            
-            # Feed to local engine
-            try:
-                partial = self.local_engine.process_audio(frame_bytes)
-                # For Parakeet, 'partial' is the full text so far for this stream.
-                # We map it to live_text. finalized_text stays empty until we stop.
-                self.partial_update.emit("", partial)
-            except Exception as e:
-                print(f"Error in local inference: {e}")
-                
-        # Final cleanup
-        final_text = ""
-        try:
-            self.local_engine.stop_stream()
-            # In local mode, the last partial is effectively the final result
-            # But let's re-read if possible or just use the last emitted value.
-            # LocalEngine.process_audio returns the cumulative text.
-            pass 
-        except Exception:
-            pass
-        
-        # We don't have the last partial stored here in a var, but the loop just finished.
-        # Actually, in streaming, we usually just want to emit the final "session finished".
-        # We rely on the session_finished emit from main app logic or we can track it here.
-        # Let's track last text.
-        
-    def run(self):
-        if self.local_engine:
-            # Use simplified local loop
-            print("DEBUG: StreamingTranscriptionWorker started (Local Mode)")
-            last_text = ""
-            self.local_engine.start_stream()
-            while True:
-                if self._stop_requested and self.frame_queue.empty():
-                    break
-                try:
-                    frame = self.frame_queue.get(timeout=0.1)
-                except queue.Empty:
-                    continue
-                
-                if frame is None:
-                    continue
-                    
-                frame_bytes = self._frame_bytes(frame)
-                try:
-                    text = self.local_engine.process_audio(frame_bytes)
-                    if text != last_text:
-                        last_text = text
-                        self.partial_update.emit("", text)
-                except Exception as e:
-                    self.error.emit(f"Local Engine Error: {e}")
-                    return
-            
-            try:
-                final_text = self.local_engine.stop_stream()
-                if final_text:
-                    last_text = final_text
-            except Exception:
-                pass
-            
-            self.session_finished.emit(last_text)
-            return
-
-        # --- OpenAI / Cloud Logic (Original) ---
-        print("DEBUG: StreamingTranscriptionWorker started (Cloud Mode)")
-        if webrtcvad is None:
-            self.error.emit("Streaming VAD not available.")
-            return
+    def on_error(self, message, streaming):
+        self.error.emit(message, streaming)
 
-        try:
-            vad = webrtcvad.Vad(self.vad_aggressiveness)
-        except Exception as e:
-            self.error.emit(str(e))
-            return
+    def on_engine_error(self, message):
+        self.engine_error.emit(message)
 
-        silence_ms = 0
-        current_frames = []
-        current_duration = 0
-        frame_ms = None
-        in_speech = False
+class ModelDownloadWorker(QThread):
+    """Runs the ModelDownloader off the GUI thread."""
+    progress_update = pyqtSignal(str)
+    download_finished = pyqtSignal(bool, str)
 
-        while True:
-            if self._stop_requested and self.frame_queue.empty():
-                break
-            try:
-                frame = self.frame_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-            if frame is None:
-                continue
-            if frame_ms is None:
-                frame_ms = int(1000 * frame.shape[0] / self.sample_rate)
-
-            frame_bytes = self._frame_bytes(frame)
-            is_speech = vad.is_speech(frame_bytes, self.sample_rate)
-
-            if is_speech:
-                if not in_speech:
-                    print("DEBUG: VAD speech start")
-                    in_speech = True
-                current_frames.append(frame_bytes)
-                current_duration += frame_ms
-                silence_ms = 0
-            else:
-                if current_frames:
-                    silence_ms += frame_ms
-                    if silence_ms >= self.vad_silence_ms:
-                        print(f"DEBUG: VAD silence reached ({silence_ms}ms). Closing segment ({current_duration}ms).")
-                        self._process_segment(current_frames, current_duration)
-                        if self._error_emitted:
-                            return
-                        current_frames = []
-                        current_duration = 0
-                        silence_ms = 0
-                        in_speech = False
-
-        if current_frames:
-            self._process_segment(current_frames, current_duration)
-            if self._error_emitted:
-                return
-
-        final_text = self._finalized_text()
-        if final_text and final_text.strip():
-            if is_whisper_model(current_config.transcription_model):
-                try:
-                    final_text = self.processor.refine(final_text.strip())
-                except Exception as e:
-                    self._error_emitted = True
-                    self.error.emit(str(e))
-                    return
-
-        self.session_finished.emit(final_text)
+    def run(self):
+        ModelDownloader(on_progress=self.progress_update.emit, on_finished=self.download_finished.emit).run()
 
 class GhostApp(QObject):
     start_rec_signal = pyqtSignal()
@@ -273,32 +84,49 @@ class GhostApp(QObject):
         self.permissions_granted = self.check_permissions()
         print(f"DEBUG: Accessibility Permissions Granted: {self.permissions_granted}")
         
-        # Core
-        self.recorder = AudioRecorder()
-        self.processing = False
-        self.streaming_worker = None
-        self.streaming_queue = None
+        # Core: recording, transcription, local engine and history run without Qt;
+        # its callbacks come back through CoreSignals onto this thread
+        self.core_signals = CoreSignals()
+        self.core = DictationCore(self.core_signals)
+        self.core_signals.partial_update.connect(self.on_stream_partial)
+        self.core_signals.segment_finished.connect(self.on_stream_segment)
+        self.core_signals.refine_progress.connect(self.on_refine_progress)
+        self.core_signals.paste_ready.connect(self.on_early_paste)
+        self.core_signals.result.connect(self.on_result)
+        self.core_signals.error.connect(self.on_error)
+        self.core_signals.engine_error.connect(self.on_engine_error)
+        self.core_signals.engine_loaded.connect(self.on_engine_loaded)
         self.streaming_stop_requested = False
-        
-        # Local Engine State
-        self.local_engine = None
-        self.download_worker = None
-        self.is_local_session = False
+        # Hotkey pressed while the local engine was still pre-warming; capture starts once it's loaded
+        self.start_pending = False
+        # Early paste (streaming refine): pasted so far, pending pastes, final clipboard
+        self.early_pasted = ""
+        self.paste_queue = []
+        self.paste_busy = False
+        self.final_clipboard = None
+        self.download_thread = None
         
         # State for Hybrid Trigger (Hold for PTT, Tap for Toggle)
         self.recording_start_time = 0.0
         self.recording_mode = None # None, 'evaluating', 'toggle'
         
+        # Connect Signals
+        self.start_rec_signal.connect(self.on_start_recording)
+        self.stop_rec_signal.connect(self.on_stop_recording)
+
+        # Keyboard Listener. Presses are queued until the event loop runs, so
+        # it can go live before the windows are built.
+        self.hotkey_pressed = False
+        self.listener = keyboard.Listener(on_press=self.on_key_press, on_release=self.on_key_release)
+        self.listener.start()
+
         # Bridge & Windows
         self.bridge = UIBridge(self)
+        # The Preferences window is built once the event loop is up (see _finish_startup)
+        self.main_window = None
         
-        # 1. Main Preferences Window
-        self.main_window = WebWindow(self.bridge, mode="settings", width=960, height=640)
-        self.main_window.show()
-        
-        # 2. Overlay Window (Hidden initially)
-        # Reduced height for a tighter fit
-        self.overlay_window = WebWindow(self.bridge, mode="overlay", width=340, height=80)
+        # Overlay Window (Hidden initially)
+        self.overlay_window = self._create_overlay()
         
         # Initial positioning
         self.reposition_overlay()
@@ -306,14 +134,43 @@ class GhostApp(QObject):
         # System Tray
         self.setup_tray()
 
-        # Connect Signals
-        self.start_rec_signal.connect(self.on_start_recording)
-        self.stop_rec_signal.connect(self.on_stop_recording)
+        QTimer.singleShot(0, self._finish_startup)
 
-        # Keyboard Listener
-        self.listener = keyboard.Listener(on_press=self.on_key_press, on_release=self.on_key_release)
-        self.listener.start()
-        self.hotkey_pressed = False
+    def _finish_startup(self):
+        """Runs on the first event loop pass, when a hotkey press would already be handled."""
+        print(f"DEBUG: Hotkey ready {time.perf_counter() - LAUNCH_TIME:.2f}s after launch")
+        if os.environ.get(EXIT_WHEN_READY_ENV):
+            self.quit_app()
+            return
+        self.show_settings()
+        # Load the local model now rather than on the first hotkey press
+        self.core.preload_local_engine()
+
+    def _create_overlay(self):
+        """The overlay for the configured renderer: native (QPainter) or web (a Chromium view)."""
+        # Reduced height for a tighter fit
+        if current_config.overlay_renderer == "web":
+            return WebWindow(self.bridge, mode="overlay", width=340, height=80)
+        return NativeOverlay(width=340, height=80)
+
+    def _apply_overlay_renderer(self):
+        """Swaps the overlay window if the renderer setting changed (between dictations only)."""
+        is_native = isinstance(self.overlay_window, NativeOverlay)
+        if is_native == (current_config.overlay_renderer != "web"):
+            return
+        if self.core.recorder.is_recording or self.core.processing:
+            return
+        print(f"DEBUG: Switching overlay renderer to {current_config.overlay_renderer}")
+        old = self.overlay_window
+        self.overlay_window = self._create_overlay()
+        old.hide()
+        old.deleteLater()
+        self.reposition_overlay()
+
+    def show_settings(self):
+        if self.main_window is None:
+            self.main_window = WebWindow(self.bridge, mode="settings", width=960, height=640)
+        self.main_window.show()
 
     def check_permissions(self):
         """Checks if the process is trusted by macOS Accessibility."""
@@ -420,7 +277,7 @@ class GhostApp(QObject):
         
         menu = QMenu()
         show_action = QAction("Show Settings", self)
-        show_action.triggered.connect(lambda: self.main_window.show())
+        show_action.triggered.connect(self.show_settings)
         menu.addAction(show_action)
         
         quit_action = QAction("Quit", self)
@@ -430,15 +287,21 @@ class GhostApp(QObject):
         self.tray_icon.setContextMenu(menu)
         self.tray_icon.show()
 
+    def on_settings_changed(self):
+        """Called by the bridge after preferences are saved."""
+        self.core.on_settings_changed()
+        self._apply_overlay_renderer()
+
     def quit_app(self):
         if self.listener:
             self.listener.stop()
+        self.core.close()
         self.app.quit()
         
     def reposition_overlay(self):
         """Calculates overlay position based on config."""
         pos = current_config.overlay_position
-        screen_geo = self.main_window.screen().availableGeometry()
+        screen_geo = (self.main_window or self.overlay_window).screen().availableGeometry()
         
         # Margins
         mx = 24
@@ -513,7 +376,7 @@ class GhostApp(QObject):
 
     # --- Interaction ---
     def on_key_press(self, key):
-        if self.processing: return
+        if self.core.processing: return
         
         target_key = self.get_configured_key()
         if key == target_key:
@@ -551,9 +414,9 @@ class GhostApp(QObject):
     # --- Logic ---
     @pyqtSlot()
     def on_start_recording(self):
-        if self.processing: return
+        if self.core.processing: return
         # Prevent double-start if already recording
-        if self.recorder.is_recording: return
+        if self.core.recorder.is_recording or self.start_pending: return
         
         print("DEBUG: Starting recording...")
         self.play_sound("start")
@@ -566,84 +429,69 @@ class GhostApp(QObject):
         self._update_overlay("listening", "")
 
         # --- Check Local Model ---
-        is_local = current_config.transcription_model == "local-parakeet"
-        self.is_local_session = is_local
-        if is_local:
-            if not ModelManager.is_model_ready():
-                print("DEBUG: Local model missing. Starting download...")
-                self._update_overlay("processing", "Downloading Model...")
-                
-                self.download_worker = ModelDownloader()
-                self.download_worker.progress_update.connect(
-                    lambda msg: self._update_overlay("processing", msg)
-                )
-                self.download_worker.finished.connect(self.on_download_finished)
-                
-                # We must start download in a separate thread so we don't block GUI
-                self.download_thread = QThread()
-                self.download_worker.moveToThread(self.download_thread)
-                self.download_thread.started.connect(self.download_worker.run)
-                self.download_thread.start()
-                return # Abort actual recording until download finishes
-            
-            # Initialize Engine if needed
-            if not self.local_engine:
-                try:
-                    self._update_overlay("processing", "Loading Engine...")
-                    QApplication.processEvents() # Force UI repaint
-                    self.local_engine = LocalParakeetEngine(ModelManager.get_model_paths())
-                    print("DEBUG: Local Parakeet Engine Loaded")
-                except Exception as e:
-                    print(f"Error loading local engine: {e}")
-                    self._update_overlay("done", "Engine Error")
-                    QTimer.singleShot(2000, self.reset_ui)
-                    return
-        
-        # --- Start Audio Capture ---
-        use_streaming = current_config.streaming_enabled or is_local
-        
-        # Force streaming ON for local model because it's designed for it
-        if is_local: 
-            use_streaming = True
+        if current_config.transcription_model == LOCAL_MODEL and not ModelManager.is_model_ready():
+            print("DEBUG: Local model missing. Starting download...")
+            self._update_overlay("processing", "Downloading Model...")
+
+            # We must start download in a separate thread so we don't block GUI
+            self.download_thread = ModelDownloadWorker()
+            self.download_thread.progress_update.connect(
+                lambda msg: self._update_overlay("processing", msg)
+            )
+            self.download_thread.download_finished.connect(self.on_download_finished)
+            self.download_thread.start()
+            return # Abort actual recording until download finishes
+
+        # --- Wait for a pre-warm in progress without blocking the event loop ---
+        if current_config.transcription_model == LOCAL_MODEL and \
+                self.core.after_engine_load(self.core_signals.engine_loaded.emit):
+            self.start_pending = True
+            self._show_engine_loading()
+            return
 
-        print(f"DEBUG: Streaming={use_streaming}, is_local={is_local}")
-        
-        if use_streaming and webrtcvad is None and not is_local:
-            print("WARNING: webrtcvad not available. Falling back to batch mode for Cloud.")
-            use_streaming = False
+        self._begin_capture()
+
+    @pyqtSlot()
+    def on_engine_loaded(self):
+        if not self.start_pending:
+            return  # cancelled while loading
+        self.start_pending = False
+        if self.core.local_engine is None:
+            # on_engine_error already reported why
+            self.play_sound("error")
+            self._update_overlay("done", "Engine Error")
+            QTimer.singleShot(2000, self.reset_ui)
+            return
+        self._begin_capture()
+
+    @pyqtSlot(str)
+    def on_engine_error(self, msg):
+        print(f"DEBUG: Engine Error Signal Received: {msg}")
+        self.tray_icon.showMessage("Ghost Flow", f"The local engine failed to load: {msg}",
+                                   QSystemTrayIcon.MessageIcon.Warning)
 
+    def _begin_capture(self):
+        # --- Start Audio Capture ---
+        self.streaming_stop_requested = False
         try:
-            if use_streaming:
-                print("DEBUG: Starting in streaming mode")
-                self.streaming_stop_requested = False
-                self.streaming_queue = queue.Queue(maxsize=200)
-                
-                # Pass local engine if applicable
-                self.streaming_worker = StreamingTranscriptionWorker(
-                    self.streaming_queue,
-                    self.recorder.sample_rate,
-                    vad_silence_ms=current_config.vad_silence_ms,
-                    vad_aggressiveness=current_config.vad_aggressiveness,
-                    local_engine=self.local_engine if is_local else None
-                )
-                self.streaming_worker.partial_update.connect(self.on_stream_partial)
-                self.streaming_worker.session_finished.connect(self.on_stream_final)
-                self.streaming_worker.error.connect(self.on_stream_error)
-                self.streaming_worker.start()
-                self.recorder.start_streaming(self.streaming_queue)
-                
-                if is_local:
-                     self._update_overlay("listening", "Local Mode Ready")
-            else:
-                print("DEBUG: Starting in batch mode")
-                self.recorder.start()
+            mode = self.core.start(on_loading=self._show_engine_loading)
+        except EngineLoadError:
+            self._update_overlay("done", "Engine Error")
+            QTimer.singleShot(2000, self.reset_ui)
+            return
         except Exception as e:
             print(f"Recorder Error: {e}")
             self._update_overlay("done", "Mic Error")
+            return
+        if mode == "local":
+            self._update_overlay("listening", "Local Mode Ready")
+
+    def _show_engine_loading(self):
+        self._update_overlay("processing", "Loading Engine...")
+        QApplication.processEvents() # Force UI repaint
 
     @pyqtSlot(bool, str)
     def on_download_finished(self, success, msg):
-        self.download_thread.quit()
         self.download_thread.wait()
         
         if success:
@@ -651,6 +499,7 @@ class GhostApp(QObject):
             self._update_overlay("done", "Model Ready")
             self.play_sound("success")
             QTimer.singleShot(1000, self.reset_ui)
+            self.core.preload_local_engine()
         else:
             print(f"Error downloading model: {msg}")
             self._update_overlay("done", "Download Failed")
@@ -659,66 +508,122 @@ class GhostApp(QObject):
 
     @pyqtSlot()
     def on_stop_recording(self):
+        if self.start_pending:
+            # Released (or tapped again) before the engine finished loading
+            print("DEBUG: Stopped while the engine was loading. Cancelling.")
+            self.start_pending = False
+            self.reset_ui()
+            return
         # Prevent stopping if not recording
-        if not self.recorder.is_recording: return
+        if not self.core.recorder.is_recording: return
         
         # If we were downloading, stopping does nothing but maybe cancel logic (not implemented)
-        if hasattr(self, 'download_thread') and self.download_thread.isRunning():
+        if self.download_thread is not None and self.download_thread.isRunning():
             return
 
         print("DEBUG: Stopping recording...")
         self.play_sound("stop")
-        self.processing = True
-        
-        if self.recorder.streaming:
-            try:
-                self.processing = True
-                self.streaming_stop_requested = True
-                self.recorder.stop_streaming()
-                if self.streaming_worker:
-                    self.streaming_worker.request_stop()
-                
-                # If local, we don't clear overlay immediately, we wait for session_finished
-                if not self.is_local_session:
-                    self._update_overlay("idle", "")
-            except Exception as e:
-                print(f"Recorder Stop Error: {e}")
-                self.reset_ui()
-            return
-
+        streaming = self.core.recorder.streaming
+        if streaming:
+            self.streaming_stop_requested = True
         try:
-            audio_path = self.recorder.stop()
+            transcribing = self.core.stop()
         except Exception as e:
             print(f"Recorder Stop Error: {e}")
             self.reset_ui()
             return
-        
-        if not audio_path:
-            print("DEBUG: No audio recorded (silent or empty).")
+
+        if streaming:
+            # If local, we don't clear overlay immediately, we wait for the final result
+            if not self.core.is_local_session:
+                self._update_overlay("idle", "")
+            return
+
+        if not transcribing:
             self._update_overlay("done", "No Audio")
             QTimer.singleShot(1500, self.reset_ui)
             return
 
         self._update_overlay("processing", "")
-        
-        self.worker = TranscriptionWorker(audio_path)
-        self.worker.finished.connect(self.on_ai_success)
-        self.worker.error.connect(self.on_ai_error)
-        self.worker.start()
 
     @pyqtSlot(str)
+    def on_refine_progress(self, text):
+        tracer.mark("first_text")
+        self._update_overlay("processing", text)
+
+    @pyqtSlot(str)
+    def on_early_paste(self, text):
+        self.early_pasted += text
+        self._queue_paste(text)
+
+    def _queue_paste(self, text):
+        self.paste_queue.append(text)
+        if not self.paste_busy:
+            self._paste_next()
+
+    def _paste_next(self):
+        """Pastes queued texts one at a time, leaving the target app time to read each from the clipboard."""
+        if not self.paste_queue:
+            self.paste_busy = False
+            if self.final_clipboard is not None:
+                # Leave the whole result on the clipboard, as a normal paste would
+                with tracer.span("clipboard"):
+                    pyperclip.copy(self.final_clipboard)
+                self.final_clipboard = None
+            return
+        self.paste_busy = True
+        with tracer.span("clipboard"):
+            pyperclip.copy(self.paste_queue.pop(0))
+        QTimer.singleShot(100, self._paste_and_continue)
+
+    def _paste_and_continue(self):
+        paste_shortcut()
+        tracer.mark("pasted", once=False)
+        QTimer.singleShot(PASTE_SPACING_MS, self._paste_next)
+
+    def _paste_clipboard(self):
+        paste_shortcut()
+        tracer.mark("pasted", once=False)
+
+    @pyqtSlot(str, bool)
+    def on_result(self, text, streaming):
+        if streaming:
+            self.on_stream_final(text)
+        else:
+            self.on_ai_success(text)
+
+    @pyqtSlot(str, bool)
+    def on_error(self, msg, streaming):
+        if streaming:
+            self.on_stream_error(msg)
+        else:
+            self.on_ai_error(msg)
+
     def on_ai_success(self, text):
-        print(f"DEBUG: Success Result: {text}")
-        
-        HistoryManager.add(text)
         self._update_overlay("done", text)
+
+        if self.early_pasted:
+            # Sentences already went out while refining; paste only what's left
+            pasted, self.early_pasted = self.early_pasted, ""
+            if text.startswith(pasted):
+                remainder = text[len(pasted):]
+            else:
+                print("DEBUG: Refined text diverged from the early paste; not pasting the rest")
+                remainder = ""
+            self.final_clipboard = text
+            if remainder:
+                self._queue_paste(remainder)
+            elif not self.paste_busy:
+                self._paste_next()
+            QTimer.singleShot(2500, self.reset_ui)
+            return
         
-        pyperclip.copy(text)
+        with tracer.span("clipboard"):
+            pyperclip.copy(text)
         QThread.msleep(100)
-        QTimer.singleShot(100, lambda: pyautogui.hotkey('command', 'v'))
+        QTimer.singleShot(100, self._paste_clipboard)
         QTimer.singleShot(2500, self.reset_ui)
 
-    @pyqtSlot(str)
     def on_ai_error(self, msg):
         print(f"DEBUG: AI Error Signal Received: {msg}")
         self.play_sound("error")
@@ -737,43 +642,47 @@ class GhostApp(QObject):
             return
             
         # For local, finalized_text is often empty until the end, live_text is the full buffer
-        if self.is_local_session:
+        if self.core.is_local_session:
+            if live_text:
+                tracer.mark("first_text")
             self._update_overlay("listening", live_text)
             return
             
-        # For Cloud/VAD
+        # For Cloud/VAD. Live transcription deltas land here too, so this
+        # only updates the overlay; pasting waits for on_stream_segment.
         payload_text = live_text or ""
         if payload_text:
+            tracer.mark("first_text")
             self._update_overlay("listening", payload_text, finalized=finalized_text, live=live_text)
-            # Experimental: Auto-paste chunks
-            paste_text = payload_text.strip()
-            if paste_text:
-                if not paste_text.endswith((" ", "\n", "\t")):
-                    paste_text += " "
-                pyperclip.copy(paste_text)
-                QTimer.singleShot(0, lambda: pyautogui.hotkey('command', 'v'))
 
     @pyqtSlot(str)
+    def on_stream_segment(self, segment_text):
+        if self.streaming_stop_requested:
+            return
+
+        # Experimental: Auto-paste chunks
+        paste_text = segment_text.strip()
+        if paste_text:
+            if not paste_text.endswith((" ", "\n", "\t")):
+                paste_text += " "
+            with tracer.span("clipboard"):
+                pyperclip.copy(paste_text)
+            QTimer.singleShot(0, self._paste_clipboard)
+
     def on_stream_final(self, final_text):
         if not final_text or not final_text.strip():
             self._update_overlay("done", "No Audio")
             QTimer.singleShot(1500, self.reset_ui)
             return
 
-        HistoryManager.add(final_text)
         self._update_overlay("done", final_text)
 
-        pyperclip.copy(final_text)
+        with tracer.span("clipboard"):
+            pyperclip.copy(final_text)
         QTimer.singleShot(2500, self.reset_ui)
 
-    @pyqtSlot(str)
     def on_stream_error(self, msg):
         print(f"DEBUG: Streaming Error Signal Received: {msg}")
-        if self.recorder.is_recording and self.recorder.streaming:
-            try:
-                self.recorder.stop_streaming()
-            except Exception:
-                pass
         self.play_sound("error")
         display_msg = "Error"
         if "API Key" in msg:
@@ -784,21 +693,25 @@ class GhostApp(QObject):
         QTimer.singleShot(2000, self.reset_ui)
 
     def reset_ui(self):
+        self.core.finish_session()
+        # A renderer change saved mid-dictation was deferred until now
+        self._apply_overlay_renderer()
         self.overlay_window.hide()
         self._update_overlay("idle", "")
-        self.processing = False
-        self.streaming_worker = None
-        self.streaming_queue = None
         self.streaming_stop_requested = False
-        self.is_local_session = False
+        self.early_pasted = ""
 
     def _update_overlay(self, stage, text, **extra):
         # Throttle log
         # print(f"DEBUG: _update_overlay called with stage={stage}, text={text}")
         payload = {"stage": stage, "text": text}
         payload.update(extra)
-        data = json.dumps(payload)
-        self.bridge.emit_overlay_update(data)
+        if isinstance(self.overlay_window, NativeOverlay):
+            self.overlay_window.set_state(stage, text)
+            # No per-partial push through QWebChannel; the settings footer polls for it
+            self.bridge.set_overlay_state(payload)
+        else:
+            self.bridge.emit_overlay_update(payload)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -0,0 +1,35 @@
+window.__GF_BOOTED__=true;window.dispatchEvent(new Event("gf:booted"));try{let OverlayWidget2=function({stage,text}){const isListening=stage==="listening"||stage==="processing";const displayText=text&&text.trim()?text:stage==="processing"?"Processing...":"Listening...";if(stage==="idle"||stage==="done")
+return null;return React.createElement("div",{className:`
+                        flex items-center gap-3 px-4 py-2.5 
+                        rounded-xl 
+                        bg-[#121212] 
+                        border border-white/5 
+                        shadow-none
+                        transition-all duration-300 ease-out transform scale-100 origin-center
+                    `},React.createElement("div",{className:"relative flex items-center justify-center w-6 h-6 shrink-0"},React.createElement("div",{className:"flex items-center gap-0.5 h-3"},React.createElement("div",{className:`w-1 bg-indigo-500 rounded-full ${isListening ? "animate-wave" : ""}`,style:{animationDelay:"0ms"}}),React.createElement("div",{className:`w-1 bg-purple-500 rounded-full ${isListening ? "animate-wave" : ""}`,style:{animationDelay:"100ms"}}),React.createElement("div",{className:`w-1 bg-pink-500 rounded-full ${isListening ? "animate-wave" : ""}`,style:{animationDelay:"200ms"}}))),React.createElement("div",{className:"flex flex-col justify-center min-w-[100px] max-w-[240px]"},React.createElement("span",{className:"text-[10px] font-bold uppercase tracking-wider mb-0 text-gray-500"},"Ghost Flow"),React.createElement("div",{className:"text-[12px] text-white/90 leading-tight"},displayText)));},useDebounce2=function(value,delay){const[debouncedValue,setDebouncedValue]=useState(value);useEffect(()=>{const handler=setTimeout(()=>{setDebouncedValue(value);},delay);return()=>clearTimeout(handler);},[value,delay]);return debouncedValue;},ReplacementsEditor2=function({value,onChange,loaded}){const[text,setText]=useState("");useEffect(()=>{if(loaded)
+setText(replacementsToText(value));},[loaded]);return React.createElement("textarea",{value:text,onChange:(e)=>{setText(e.target.value);onChange(textToReplacements(e.target.value));},placeholder:"ghost flow -> Ghost Flow\nk8s -> Kubernetes",className:"w-full h-24 bg-neutral-900 border border-white/10 rounded-lg p-4 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300 font-mono resize-none leading-relaxed"});},LatencyView2=function({bridge}){const[stats,setStats]=useState(null);const fetchStats=useCallback(()=>{if(!bridge||!bridge.get_latency_stats)
+return;bridge.get_latency_stats((jsonStr)=>{try{setStats(JSON.parse(jsonStr));}catch(e){console.error("Latency stats parse error",e);}});},[bridge]);useEffect(()=>{fetchStats();const interval=setInterval(fetchStats,5e3);return()=>clearInterval(interval);},[fetchStats]);if(!stats)
+return React.createElement("div",{className:"text-gray-500 text-sm p-4"},"Loading latency...");return React.createElement("div",{className:"space-y-6 max-w-3xl animate-in fade-in duration-300"},React.createElement("header",null,React.createElement("h1",{className:"text-2xl font-bold mb-1"},"Latency"),React.createElement("p",{className:"text-gray-400 text-sm"},"Per-stage timings over the last ",stats.ok_sessions," completed dictations (of ",stats.sessions," recorded).")),stats.stages.length===0?React.createElement("div",{className:"text-center py-20 text-gray-600 text-sm"},"No timings yet. Dictate something to collect them."):React.createElement("div",{className:"bg-white/5 rounded-xl border border-white/5 overflow-hidden"},React.createElement("table",{className:"w-full text-sm"},React.createElement("thead",{className:"text-xs text-gray-500 uppercase"},React.createElement("tr",{className:"border-b border-white/5"},React.createElement("th",{className:"text-left font-medium px-4 py-3"},"Stage"),React.createElement("th",{className:"text-right font-medium px-4 py-3"},"p50"),React.createElement("th",{className:"text-right font-medium px-4 py-3"},"p95"),React.createElement("th",{className:"text-right font-medium px-4 py-3"},"Samples"))),React.createElement("tbody",null,stats.stages.map((s)=>React.createElement("tr",{key:s.stage,className:"border-b border-white/5 last:border-0"},React.createElement("td",{className:"px-4 py-2.5 text-gray-300"},LATENCY_LABELS[s.stage]||s.stage),React.createElement("td",{className:"px-4 py-2.5 text-right font-mono text-gray-300"},formatMs(s.p50_ms)),React.createElement("td",{className:"px-4 py-2.5 text-right font-mono text-gray-400"},formatMs(s.p95_ms)),React.createElement("td",{className:"px-4 py-2.5 text-right text-gray-500"},s.count)))))));},HistoryView2=function({bridge}){const[history,setHistory]=useState([]);const[total,setTotal]=useState(0);const[loading,setLoading]=useState(true);const[query,setQuery]=useState("");const[fromDate,setFromDate]=useState("");const[toDate,setToDate]=useState("");const debouncedQuery=useDebounce2(query,200);const filtering=debouncedQuery.trim()!==""||fromDate!==""||toDate!=="";const filterGenRef=useRef(0);const replaceNextRef=useRef(true);const fetchPage=useCallback((offset)=>{if(!bridge)
+return;const gen=filterGenRef.current;const applyPage=(jsonStr,label)=>{if(gen!==filterGenRef.current)
+return;try{const data=JSON.parse(jsonStr);const ids=new Set(data.entries.map((e)=>e.id));if(offset===0&&replaceNextRef.current){replaceNextRef.current=false;setHistory(data.entries);}else if(offset===0){setHistory((prev)=>[...data.entries,...prev.filter((e)=>!ids.has(e.id))]);}else{setHistory((prev)=>[...prev.filter((e)=>!ids.has(e.id)),...data.entries]);}
+setTotal(data.total);}catch(e){console.error(label,e);}
+setLoading(false);};if(filtering&&bridge.search_history){const startTs=fromDate?(new Date(`${fromDate}T00:00:00`)).getTime()/1e3:0;const endTs=toDate?(new Date(`${toDate}T23:59:59.999`)).getTime()/1e3:0;bridge.search_history(debouncedQuery,offset,HISTORY_PAGE_SIZE,startTs,endTs,(jsonStr)=>applyPage(jsonStr,"History search parse error"));}else if(bridge.get_history_page){bridge.get_history_page(offset,HISTORY_PAGE_SIZE,(jsonStr)=>applyPage(jsonStr,"History parse error"));}else if(bridge.get_history&&offset===0){bridge.get_history((jsonStr)=>{try{const data=JSON.parse(jsonStr);setHistory(data);setTotal(data.length);}catch(e){console.error("History parse error",e);}
+setLoading(false);});}},[bridge,filtering,debouncedQuery,fromDate,toDate]);useEffect(()=>{filterGenRef.current+=1;replaceNextRef.current=true;},[debouncedQuery,fromDate,toDate]);useEffect(()=>{const refresh=()=>fetchPage(0);refresh();const interval=setInterval(refresh,3e3);return()=>clearInterval(interval);},[fetchPage]);const clearAll=()=>{if(confirm("Clear all history?")){bridge.clear_history();filterGenRef.current+=1;replaceNextRef.current=true;setHistory([]);setTotal(0);}};const copyText=(text)=>{navigator.clipboard.writeText(text).catch((e)=>console.error("Copy failed",e));};if(loading)
+return React.createElement("div",{className:"text-gray-500 text-sm p-4"},"Loading history...");return React.createElement("div",{className:"space-y-6 max-w-3xl animate-in fade-in duration-300"},React.createElement("header",{className:"flex items-center justify-between"},React.createElement("div",null,React.createElement("h1",{className:"text-2xl font-bold mb-1"},"History"),React.createElement("p",{className:"text-gray-400 text-sm"},"Recent transcriptions (stored locally).")),history.length>0&&React.createElement("button",{onClick:clearAll,className:"px-3 py-1.5 bg-red-500/10 hover:bg-red-500/20 text-red-400 text-xs rounded-lg border border-red-500/20 flex items-center gap-2 transition-colors"},React.createElement(Icons.Trash,{size:14})," Clear")),React.createElement("div",{className:"flex items-center gap-2"},React.createElement("input",{type:"text",value:query,onChange:(e)=>setQuery(e.target.value),placeholder:"Search history...",className:"flex-1 bg-neutral-900 border border-white/10 rounded-lg px-3 py-2 text-sm text-gray-300 placeholder-gray-600 focus:outline-none focus:border-indigo-500/50"}),React.createElement("input",{type:"date",value:fromDate,onChange:(e)=>setFromDate(e.target.value),title:"From",className:"bg-neutral-900 border border-white/10 rounded-lg px-2 py-2 text-xs text-gray-300 focus:outline-none focus:border-indigo-500/50"}),React.createElement("input",{type:"date",value:toDate,onChange:(e)=>setToDate(e.target.value),title:"To",className:"bg-neutral-900 border border-white/10 rounded-lg px-2 py-2 text-xs text-gray-300 focus:outline-none focus:border-indigo-500/50"})),history.length===0?filtering?React.createElement("div",{className:"text-center py-12 border border-white/5 rounded-xl border-dashed"},React.createElement("p",{className:"text-gray-500 text-sm"},"No matching transcriptions.")):React.createElement("div",{className:"text-center py-12 border border-white/5 rounded-xl border-dashed"},React.createElement("p",{className:"text-gray-500 text-sm"},"No history yet."),React.createElement("p",{className:"text-gray-600 text-xs mt-1"},"Record something to see it here.")):React.createElement("div",{className:"space-y-3"},history.map((item,idx)=>React.createElement("div",{key:item.id||idx,className:"group relative p-4 bg-white/5 rounded-xl border border-white/5 hover:border-white/10 transition-colors"},React.createElement("div",{className:"flex justify-between items-start mb-2"},React.createElement("span",{className:"text-xs text-gray-500 font-mono"},item.date_str),React.createElement("button",{onClick:()=>copyText(item.text),className:"opacity-0 group-hover:opacity-100 p-1.5 hover:bg-white/10 rounded-md text-gray-400 hover:text-white transition-all",title:"Copy"},React.createElement(Icons.Copy,{size:14}))),React.createElement("p",{className:"text-gray-200 text-sm leading-relaxed whitespace-pre-wrap"},item.text))),history.length<total&&React.createElement("button",{onClick:()=>fetchPage(history.length),className:"w-full py-2 text-xs text-gray-400 hover:text-white bg-white/5 hover:bg-white/10 rounded-lg border border-white/5 transition-colors"},"Load more (",total-history.length," ",filtering?"more matches":"older",")")));},Dashboard2=function({bridge,overlayState}){const[activeTab,setActiveTab]=useState("general");const[permissionsGranted,setPermissionsGranted]=useState(true);const[settingsLoaded,setSettingsLoaded]=useState(false);const skipNextSaveRef=useRef(true);const[settings,setSettings]=useState({openai_api_key:"",transcription_model:"whisper-1",model:"gpt-4o-mini",system_prompt:"",sound_feedback:true,overlay_position:"top-right",overlay_renderer:"native",streaming_enabled:false,vad_silence_ms:600,vad_aggressiveness:2,upload_encoding:"auto",refine_mode:"auto",refine_replacements:{},local_num_threads:0,local_provider:"cpu",local_decoding_method:"greedy_search",local_max_active_paths:4});const debouncedSettings=useDebounce2(settings,800);useEffect(()=>{if(!bridge)
+return;if(bridge.get_settings){bridge.get_settings((jsonStr)=>{console.log("JS [Dashboard]: Settings loaded",jsonStr);try{const data=JSON.parse(jsonStr);setSettings((prev)=>({...prev,...data}));setSettingsLoaded(true);skipNextSaveRef.current=true;if(data.permissions_granted===false)
+setPermissionsGranted(false);else
+setPermissionsGranted(true);}catch(e){console.error(e);}});}},[bridge]);useEffect(()=>{if(!bridge||!settingsLoaded)
+return;if(skipNextSaveRef.current){skipNextSaveRef.current=false;return;}
+console.log("JS: Saving settings (debounced)");bridge.save_settings(JSON.stringify(debouncedSettings));},[debouncedSettings,bridge,settingsLoaded]);const updateSetting=(key,value)=>{setSettings((prev)=>({...prev,[key]:value}));};const getStatusUI=()=>{if(!permissionsGranted){return{dot:"bg-red-500 animate-pulse",label:"System: Paused",sub:"Permissions Required",textClass:"text-red-400"};}
+const{stage,text}=overlayState||{stage:"idle"};if(stage==="listening"){return{dot:"bg-indigo-500 animate-pulse",label:"Listening...",sub:"Release F8 to finish",textClass:"text-indigo-400"};}
+if(stage==="processing"){return{dot:"bg-purple-500 animate-pulse",label:"Processing...",sub:text||"Ghost Flow is thinking",textClass:"text-purple-400"};}
+if(stage==="done"){return{dot:"bg-emerald-500",label:"Complete",sub:text||"Pasted to clipboard",textClass:"text-emerald-400"};}
+return{dot:"bg-emerald-500/50",label:"System: Online",sub:"Ready to record (F8)",textClass:"text-gray-500"};};const status=getStatusUI();return React.createElement("div",{className:"relative flex h-screen w-full bg-neutral-900 text-gray-100 font-sans selection:bg-indigo-500/30 overflow-hidden"},React.createElement("div",{className:"absolute top-0 left-0 w-full h-full overflow-hidden z-0 pointer-events-none"},React.createElement("div",{className:"absolute top-1/4 left-1/4 w-96 h-96 bg-indigo-600 rounded-full blur-[120px] opacity-10 animate-blob-1"}),React.createElement("div",{className:"absolute bottom-1/4 right-1/4 w-96 h-96 bg-purple-600 rounded-full blur-[120px] opacity-10 animate-blob-2"})),React.createElement("div",{className:"relative z-10 w-64 bg-black/20 border-r border-white/5 flex flex-col justify-between backdrop-blur-sm"},React.createElement("div",null,React.createElement("div",{className:"flex items-center gap-3 px-6 py-6 mb-2"},React.createElement("div",{className:"w-8 h-8 bg-gradient-to-br from-indigo-500 to-purple-600 rounded-lg flex items-center justify-center shadow-lg shadow-indigo-500/20"},React.createElement(Icons.Mic,{size:18,className:"text-white"})),React.createElement("span",{className:"font-bold text-lg tracking-tight"},"Ghost Flow")),React.createElement("nav",{className:"space-y-1 px-2"},React.createElement(NavItem2,{icon:React.createElement(Icons.Settings,{size:18}),label:"General",active:activeTab==="general",onClick:()=>setActiveTab("general")}),React.createElement(NavItem2,{icon:React.createElement(Icons.Keyboard,{size:18}),label:"Shortcuts",active:activeTab==="shortcuts",onClick:()=>setActiveTab("shortcuts")}),React.createElement(NavItem2,{icon:React.createElement(Icons.Cpu,{size:18}),label:"Models",active:activeTab==="models",onClick:()=>setActiveTab("models")}),React.createElement(NavItem2,{icon:React.createElement(Icons.Activity,{size:18}),label:"History",active:activeTab==="history",onClick:()=>setActiveTab("history")}),React.createElement(NavItem2,{icon:React.createElement(Icons.Clock,{size:18}),label:"Latency",active:activeTab==="latency",onClick:()=>setActiveTab("latency")}))),React.createElement("div",{className:"px-6 py-4 border-t border-white/5 bg-black/10 backdrop-blur-md"},React.createElement("div",{className:"flex items-start gap-3"},React.createElement("div",{className:`mt-1.5 w-2 h-2 rounded-full shrink-0 ${status.dot} shadow-sm`}),React.createElement("div",{className:"flex-1 overflow-hidden"},React.createElement("div",{className:`text-xs font-medium ${status.textClass}`},status.label),React.createElement("div",{className:"text-[10px] text-gray-500 truncate mt-0.5 leading-tight opacity-70",title:status.sub},status.sub))))),React.createElement("div",{className:"relative z-10 flex-1 p-10 overflow-y-auto custom-scrollbar bg-neutral-800/50"},!permissionsGranted&&React.createElement("div",{className:"mb-8 p-4 bg-red-500/10 border border-red-500/20 rounded-xl flex items-start gap-4 animate-in fade-in slide-in-from-top-4 duration-500"},React.createElement("div",{className:"p-2 bg-red-500/20 rounded-lg text-red-400 mt-1"},React.createElement(Icons.Alert,{size:20})),React.createElement("div",null,React.createElement("h3",{className:"text-red-400 font-bold text-sm uppercase tracking-wide mb-1"},"Accessibility Access Required"),React.createElement("p",{className:"text-gray-300 text-sm mb-3 leading-relaxed"},"Ghost Flow cannot listen for the activation key (F8) because macOS is blocking input monitoring."),React.createElement("div",{className:"text-xs text-gray-400 bg-black/20 p-3 rounded-lg border border-white/5 font-mono space-y-1.5"},React.createElement("p",null,"1. Open ",React.createElement("span",{className:"text-white"},"System Settings")," > ",React.createElement("span",{className:"text-white"},"Privacy & Security")," > ",React.createElement("span",{className:"text-white"},"Accessibility")),React.createElement("p",null,"2. Toggle ON for ",React.createElement("span",{className:"text-white"},"Terminal")," or ",React.createElement("span",{className:"text-white"},"Python")),React.createElement("p",null,"3. If already ON, toggle it OFF and ON again."),React.createElement("p",null,"4. ",React.createElement("span",{className:"text-white underline"},"Restart Ghost Flow")," to apply changes.")))),activeTab==="general"&&React.createElement("div",{className:"space-y-8 max-w-2xl animate-in fade-in slide-in-from-bottom-4 duration-500"},React.createElement("header",null,React.createElement("h1",{className:"text-2xl font-bold mb-1"},"General Settings"),React.createElement("p",{className:"text-gray-400 text-sm"},"Configure how Ghost Flow listens and behaves.")),React.createElement("section",{className:"space-y-4"},React.createElement("div",{className:"flex items-center justify-between p-4 bg-white/5 rounded-xl border border-white/5 hover:border-white/10 transition-colors"},React.createElement("div",{className:"space-y-1"},React.createElement("h3",{className:"font-medium"},"Sound Feedback"),React.createElement("p",{className:"text-xs text-gray-400"},"Play a subtle sound when recording starts/stops.")),React.createElement(Toggle2,{active:settings.sound_feedback,onClick:()=>updateSetting("sound_feedback",!settings.sound_feedback)})),React.createElement("div",{className:`p-4 bg-white/5 rounded-xl border border-white/5 hover:border-white/10 transition-colors ${isLocalModel(settings.transcription_model) ? "opacity-50 pointer-events-none" : ""}`},React.createElement("div",{className:"flex items-center justify-between"},React.createElement("div",{className:"space-y-1"},React.createElement("h3",{className:"font-medium"},"Streaming Mode"),React.createElement("p",{className:"text-xs text-gray-400"},"Show partial results while you speak (VAD-based).")),React.createElement(Toggle2,{active:settings.streaming_enabled,onClick:()=>updateSetting("streaming_enabled",!settings.streaming_enabled)})),React.createElement("div",{className:"mt-4 space-y-3"},React.createElement("div",null,React.createElement("div",{className:"flex items-center justify-between text-xs text-gray-400 mb-1"},React.createElement("span",null,"Silence Threshold"),React.createElement("span",null,settings.vad_silence_ms," ms")),React.createElement("input",{type:"range",min:"300",max:"1200",step:"50",value:settings.vad_silence_ms,onChange:(e)=>updateSetting("vad_silence_ms",parseInt(e.target.value,10)),className:"w-full accent-indigo-500"})),React.createElement("div",null,React.createElement("div",{className:"flex items-center justify-between text-xs text-gray-400 mb-1"},React.createElement("span",null,"VAD Aggressiveness"),React.createElement("span",null,settings.vad_aggressiveness)),React.createElement("input",{type:"range",min:"0",max:"3",step:"1",value:settings.vad_aggressiveness,onChange:(e)=>updateSetting("vad_aggressiveness",parseInt(e.target.value,10)),className:"w-full accent-indigo-500"}))),isLocalModel(settings.transcription_model)&&React.createElement("div",{className:"mt-2 text-[10px] text-indigo-400"},"Streaming is always enabled for local models.")),React.createElement("div",{className:"p-4 bg-white/5 rounded-xl border border-white/5 hover:border-white/10 transition-colors"},React.createElement("div",{className:"flex items-center gap-3 mb-3"},React.createElement(Icons.Layout,{size:18,className:"text-gray-400"}),React.createElement("h3",{className:"font-medium"},"Overlay Position")),React.createElement("div",{className:"grid grid-cols-2 gap-2"},OVERLAY_POSITIONS.map((pos)=>React.createElement("button",{key:pos.id,onClick:()=>updateSetting("overlay_position",pos.id),className:`text-left text-xs px-3 py-2 rounded-lg border transition-all ${settings.overlay_position === pos.id ? "bg-indigo-600/20 border-indigo-500/50 text-indigo-200" : "bg-black/20 border-transparent text-gray-400 hover:bg-white/5"}`},pos.label))),React.createElement("div",{className:"mt-4 mb-2 text-xs text-gray-400"},"Renderer"),React.createElement("div",{className:"grid grid-cols-2 gap-2"},OVERLAY_RENDERERS.map((r)=>React.createElement("button",{key:r.id,onClick:()=>updateSetting("overlay_renderer",r.id),className:`text-left text-xs px-3 py-2 rounded-lg border transition-all ${settings.overlay_renderer === r.id ? "bg-indigo-600/20 border-indigo-500/50 text-indigo-200" : "bg-black/20 border-transparent text-gray-400 hover:bg-white/5"}`},r.label)))))),activeTab==="models"&&React.createElement("div",{className:"space-y-8 max-w-2xl animate-in fade-in slide-in-from-bottom-4 duration-500"},React.createElement("header",null,React.createElement("h1",{className:"text-2xl font-bold mb-1"},"Models & API"),React.createElement("p",{className:"text-gray-400 text-sm"},"Connect your brains and ears.")),React.createElement("section",{className:"space-y-6"},React.createElement("div",null,React.createElement("label",{className:"block text-sm font-medium mb-2"},"Audio Input Model (Transcription)"),React.createElement("select",{value:settings.transcription_model,onChange:(e)=>updateSetting("transcription_model",e.target.value),className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-4 py-3 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300"},AUDIO_MODELS.map((m)=>React.createElement("option",{key:m.id,value:m.id},m.label))),isLocalModel(settings.transcription_model)&&React.createElement("div",{className:"mt-2 text-xs text-indigo-400 flex items-center gap-2"},React.createElement(Icons.Check,{size:12}),React.createElement("span",null,"Runs entirely offline on your CPU (via Sherpa-ONNX)."))),isLocalModel(settings.transcription_model)&&React.createElement("div",{className:"p-4 bg-white/5 rounded-xl border border-white/5 space-y-4"},React.createElement("div",{className:"space-y-1"},React.createElement("h3",{className:"font-medium"},"Local Engine Tuning"),React.createElement("p",{className:"text-xs text-gray-400"},"Run ",React.createElement("span",{className:"font-mono"},"scripts/bench_local_engine.py")," to find the fastest settings for this Mac.")),React.createElement("div",{className:"grid grid-cols-2 gap-3"},React.createElement("div",null,React.createElement("label",{className:"block text-xs text-gray-400 mb-1"},"CPU Threads"),React.createElement("select",{value:settings.local_num_threads,onChange:(e)=>updateSetting("local_num_threads",parseInt(e.target.value,10)),className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-3 py-2 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300"},LOCAL_THREAD_OPTIONS.map((t)=>React.createElement("option",{key:t.id,value:t.id},t.label)))),React.createElement("div",null,React.createElement("label",{className:"block text-xs text-gray-400 mb-1"},"Execution Provider"),React.createElement("select",{value:settings.local_provider,onChange:(e)=>updateSetting("local_provider",e.target.value),className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-3 py-2 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300"},LOCAL_PROVIDERS.map((p)=>React.createElement("option",{key:p.id,value:p.id},p.label)))),React.createElement("div",null,React.createElement("label",{className:"block text-xs text-gray-400 mb-1"},"Decoding"),React.createElement("select",{value:settings.local_decoding_method,onChange:(e)=>updateSetting("local_decoding_method",e.target.value),className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-3 py-2 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300"},LOCAL_DECODING_METHODS.map((d)=>React.createElement("option",{key:d.id,value:d.id},d.label)))),settings.local_decoding_method==="modified_beam_search"&&React.createElement("div",null,React.createElement("div",{className:"flex items-center justify-between text-xs text-gray-400 mb-1"},React.createElement("span",null,"Beam Width"),React.createElement("span",null,settings.local_max_active_paths)),React.createElement("input",{type:"range",min:"2",max:"10",step:"1",value:settings.local_max_active_paths,onChange:(e)=>updateSetting("local_max_active_paths",parseInt(e.target.value,10)),className:"w-full accent-indigo-500"})))),!isLocalModel(settings.transcription_model)&&React.createElement("div",null,React.createElement("label",{className:"block text-sm font-medium mb-2"},"OpenAI API Key"),React.createElement("div",{className:"relative"},React.createElement("input",{type:"password",value:settings.openai_api_key,onChange:(e)=>updateSetting("openai_api_key",e.target.value),placeholder:"sk-proj-...",className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-4 py-3 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300 font-mono"}))),isWhisperModel(settings.transcription_model)?React.createElement(React.Fragment,null,React.createElement("div",null,React.createElement("label",{className:"block text-sm font-medium mb-2"},"Audio Upload Format"),React.createElement("select",{value:settings.upload_encoding,onChange:(e)=>updateSetting("upload_encoding",e.target.value),className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-4 py-3 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300"},UPLOAD_ENCODINGS.map((m)=>React.createElement("option",{key:m.id,value:m.id},m.label)))),React.createElement("div",null,React.createElement("label",{className:"block text-sm font-medium mb-2"},"Refinement Model (Post-Processing)"),React.createElement("select",{value:settings.model,onChange:(e)=>updateSetting("model",e.target.value),className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-4 py-3 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300"},REFINEMENT_MODELS.map((m)=>React.createElement("option",{key:m.id,value:m.id},m.label)))),React.createElement("div",null,React.createElement("label",{className:"block text-sm font-medium mb-2"},"Refinement"),React.createElement("select",{value:settings.refine_mode,onChange:(e)=>updateSetting("refine_mode",e.target.value),className:"w-full bg-neutral-900 border border-white/10 rounded-lg px-4 py-3 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300"},REFINE_MODES.map((m)=>React.createElement("option",{key:m.id,value:m.id},m.label)))),React.createElement("div",null,React.createElement("label",{className:"block text-sm font-medium mb-2"},"System Prompt"),React.createElement("textarea",{value:settings.system_prompt,onChange:(e)=>updateSetting("system_prompt",e.target.value),className:"w-full h-32 bg-neutral-900 border border-white/10 rounded-lg p-4 text-sm focus:outline-none focus:border-indigo-500/50 text-gray-300 font-mono resize-none leading-relaxed"}))):React.createElement("div",{className:"text-xs text-gray-500 bg-black/20 border border-white/5 rounded-lg p-3"},isLocalModel(settings.transcription_model)?"Local models provide raw transcription. Advanced grammar refinement is disabled to keep it offline. Replacements still apply.":"Realtime transcription models return final text directly and skip post-processing. Replacements still apply."),React.createElement("div",null,React.createElement("label",{className:"block text-sm font-medium mb-2"},"Replacements"),React.createElement(ReplacementsEditor2,{value:settings.refine_replacements,onChange:(map)=>updateSetting("refine_replacements",map),loaded:settingsLoaded})))),activeTab==="shortcuts"&&React.createElement("div",{className:"space-y-8 max-w-2xl animate-in fade-in slide-in-from-bottom-4 duration-500"},React.createElement("header",null,React.createElement("h1",{className:"text-2xl font-bold mb-1"},"Keyboard Shortcuts"),React.createElement("p",{className:"text-gray-400 text-sm"},"Customize your global trigger key.")),React.createElement("div",{className:"p-6 bg-white/5 rounded-xl border border-white/5"},React.createElement("label",{className:"block text-sm font-medium mb-4"},"Global Trigger"),React.createElement("div",{className:"flex items-center gap-4"},React.createElement("div",{className:"h-14 flex-1 bg-neutral-900 rounded-lg border border-white/10 flex items-center px-4 justify-between group"},React.createElement("span",{className:"text-gray-400"},"Press combination..."),React.createElement("kbd",{className:"px-2 py-1 bg-white/10 rounded text-xs font-mono text-gray-300 border border-white/10 shadow-sm min-w-[24px] text-center"},"F8")),React.createElement("button",{className:"h-14 px-6 rounded-lg bg-white/5 border border-white/10 text-sm font-medium text-gray-400 cursor-not-allowed"},"Reset")),React.createElement("p",{className:"mt-3 text-xs text-gray-500"},"Hold this key to start recording. Release to process and paste."))),activeTab==="history"&&React.createElement(HistoryView2,{bridge}),activeTab==="latency"&&React.createElement(LatencyView2,{bridge})));},NavItem2=function({icon,label,active,onClick}){return React.createElement("button",{onClick,className:`w-full flex items-center gap-3 px-4 py-2.5 rounded-lg text-sm font-medium transition-all ${active ? "bg-white/10 text-white shadow-lg shadow-black/20" : "text-gray-400 hover:text-white hover:bg-white/5"}`},React.createElement("div",{className:`${active ? "text-indigo-400" : "text-gray-500"}`},icon),label);},Toggle2=function({active,onClick}){return React.createElement("div",{onClick,className:`w-11 h-6 rounded-full p-1 transition-colors cursor-pointer ${active ? "bg-indigo-600" : "bg-gray-700"}`},React.createElement("div",{className:`w-4 h-4 rounded-full bg-white shadow-sm transform transition-transform ${active ? "translate-x-5" : "translate-x-0"}`}));},App2=function(){const[viewMode,setViewMode]=useState("settings");const[overlayState,setOverlayState]=useState({stage:"idle",text:""});const[bridge,setBridge]=useState(null);const[bridgeError,setBridgeError]=useState(false);useEffect(()=>{const mode=window.location.hash.replace("#","");console.log("JS: Init App, mode:",mode);if(mode==="overlay")
+setViewMode("overlay");let attempts=0;let pollId=null;const connectBridge=()=>{if(window.qt&&window.qt.webChannelTransport){console.log("JS: Found qt.webChannelTransport, connecting...");try{new QWebChannel(window.qt.webChannelTransport,(channel)=>{console.log("JS: QWebChannel fully connected.");const pyBridge=channel.objects.pyBridge;setBridge(pyBridge);setBridgeError(false);if(pyBridge.ui_ready)
+pyBridge.ui_ready(mode||"settings");pyBridge.overlay_update.connect((jsonStr)=>{console.log("JS [Global]: overlay_update",jsonStr);const data=JSON.parse(jsonStr);setOverlayState(data);if(data.ack!==void 0&&pyBridge.overlay_rendered){requestAnimationFrame(()=>setTimeout(()=>pyBridge.overlay_rendered(data.ack),0));}});if(pyBridge.get_overlay_state){pyBridge.get_overlay_state((jsonStr)=>{try{const data=JSON.parse(jsonStr);setOverlayState(data);}catch(e){console.error("JS: get_overlay_state parse error",e);}});pollId=setInterval(()=>{pyBridge.get_overlay_state((jsonStr)=>{try{const data=JSON.parse(jsonStr);setOverlayState(data);}catch(e){console.error("JS: get_overlay_state poll parse error",e);}});},250);}});}catch(e){console.error("JS: QWebChannel creation failed:",e);setBridgeError(true);}}else{attempts++;if(attempts<20){console.log(`JS: Waiting for qt transport... (${attempts})`);setTimeout(connectBridge,100);}else{console.error("JS: Timeout waiting for qt.webChannelTransport");setBridgeError(true);}}};connectBridge();return()=>{if(pollId)
+clearInterval(pollId);};},[]);if(viewMode==="overlay"){if(bridgeError){return React.createElement("div",{className:"text-red-500 font-mono text-xs bg-black/80 p-2 rounded"},"Error: No Bridge");}
+if(!bridge&&overlayState.stage==="idle"){return null;}
+return React.createElement("div",{className:"flex items-center justify-center w-full h-full"},React.createElement(OverlayWidget2,{stage:overlayState.stage,text:overlayState.text}));}
+return React.createElement(Dashboard2,{bridge,overlayState});};var OverlayWidget=OverlayWidget2,useDebounce=useDebounce2,ReplacementsEditor=ReplacementsEditor2,LatencyView=LatencyView2,HistoryView=HistoryView2,Dashboard=Dashboard2,NavItem=NavItem2,Toggle=Toggle2,App=App2;const{useState,useEffect,useRef,useCallback}=React;const AUDIO_MODELS=[{id:"whisper-1",label:"Whisper-1 (OpenAI Cloud)"},{id:"gpt-4o-mini-transcribe-2025-12-15",label:"GPT-4o Mini Transcribe (Realtime Cloud)"},{id:"local-parakeet",label:"NVIDIA Parakeet (Local/Offline)"}];const REFINEMENT_MODELS=[{id:"gpt-5-nano-2025-08-07",label:"GPT-5 Nano (2025)"},{id:"gpt-4o-mini",label:"GPT-4o Mini (Standard)"},{id:"gpt-4o",label:"GPT-4o (High Intelligence)"}];const LOCAL_THREAD_OPTIONS=[{id:0,label:"Auto (physical cores)"},...[1,2,4,6,8,12,16].map((n)=>({id:n,label:`${n} threads`}))];const LOCAL_PROVIDERS=[{id:"cpu",label:"CPU"},{id:"coreml",label:"Core ML (Apple Silicon)"}];const LOCAL_DECODING_METHODS=[{id:"greedy_search",label:"Greedy (Fastest)"},{id:"modified_beam_search",label:"Beam Search (More Accurate)"}];const UPLOAD_ENCODINGS=[{id:"auto",label:"Auto (FLAC, Opus on slow connections)"},{id:"flac",label:"FLAC (Lossless, ~half size)"},{id:"opus",label:"Opus (Smallest upload)"},{id:"wav",label:"WAV (Uncompressed)"}];const REFINE_MODES=[{id:"auto",label:"Auto (Local for clean short text, AI otherwise)"},{id:"llm",label:"Always AI"},{id:"local",label:"Local only (No API call)"}];const isWhisperModel=(modelId)=>(modelId||"").toLowerCase().includes("whisper");const isLocalModel=(modelId)=>(modelId||"")==="local-parakeet";const OVERLAY_POSITIONS=[{id:"top-right",label:"Top Right"},{id:"top-left",label:"Top Left"},{id:"top-center",label:"Top Center"},{id:"bottom-right",label:"Bottom Right"},{id:"bottom-left",label:"Bottom Left"},{id:"bottom-center",label:"Bottom Center"},{id:"center",label:"Center Screen"}];const OVERLAY_RENDERERS=[{id:"native",label:"Native (lightweight)"},{id:"web",label:"Web (Chromium)"}];const Icons={Mic:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("path",{d:"M12 1a3 3 0 0 0-3 3v8a3 3 0 0 0 6 0V4a3 3 0 0 0-3-3z"}),React.createElement("path",{d:"M19 10v2a7 7 0 0 1-14 0v-2"}),React.createElement("line",{x1:"12",y1:"19",x2:"12",y2:"23"}),React.createElement("line",{x1:"8",y1:"23",x2:"16",y2:"23"})),Settings:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("path",{d:"M12.22 2h-.44a2 2 0 0 0-2 2v.18a2 2 0 0 1-1 1.73l-.43.25a2 2 0 0 1-2 0l-.15-.08a2 2 0 0 0-2.73.73l-.22.38a2 2 0 0 0 .73 2.73l.15.1a2 2 0 0 1 1 1.72v.51a2 2 0 0 1-1 1.74l-.15.09a2 2 0 0 0-.73 2.73l.22.38a2 2 0 0 0 2.73.73l.15-.08a2 2 0 0 1 2 0l.43.25a2 2 0 0 1 1 1.73V20a2 2 0 0 0 2 2h.44a2 2 0 0 0 2-2v-.18a2 2 0 0 1 1-1.73l.43-.25a2 2 0 0 1 2 0l.15.08a2 2 0 0 0 2.73-.73l.22-.39a2 2 0 0 0-.73-2.73l-.15-.09a2 2 0 0 1-1-1.74v-.47a2 2 0 0 1 1-1.74l.15-.09a2 2 0 0 0 .73-2.73l-.22-.39a2 2 0 0 0-2.73-.73l-.15.08a2 2 0 0 1-2 0l-.43-.25a2 2 0 0 1-1-1.73V4a2 2 0 0 0-2-2z"}),React.createElement("circle",{cx:"12",cy:"12",r:"3"})),Keyboard:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("rect",{x:"2",y:"4",width:"20",height:"16",rx:"2",ry:"2"}),React.createElement("line",{x1:"6",y1:"8",x2:"6",y2:"8"}),React.createElement("line",{x1:"10",y1:"8",x2:"10",y2:"8"}),React.createElement("line",{x1:"14",y1:"8",x2:"14",y2:"8"}),React.createElement("line",{x1:"18",y1:"8",x2:"18",y2:"8"}),React.createElement("line",{x1:"6",y1:"12",x2:"6",y2:"12"}),React.createElement("line",{x1:"10",y1:"12",x2:"10",y2:"12"}),React.createElement("line",{x1:"14",y1:"12",x2:"14",y2:"12"}),React.createElement("line",{x1:"18",y1:"12",x2:"18",y2:"12"}),React.createElement("line",{x1:"6",y1:"16",x2:"6",y2:"16"}),React.createElement("line",{x1:"10",y1:"16",x2:"15",y2:"16"})),Cpu:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("rect",{x:"4",y:"4",width:"16",height:"16",rx:"2",ry:"2"}),React.createElement("rect",{x:"9",y:"9",width:"6",height:"6"}),React.createElement("line",{x1:"9",y1:"1",x2:"9",y2:"4"}),React.createElement("line",{x1:"15",y1:"1",x2:"15",y2:"4"}),React.createElement("line",{x1:"9",y1:"20",x2:"9",y2:"23"}),React.createElement("line",{x1:"15",y1:"20",x2:"15",y2:"23"}),React.createElement("line",{x1:"20",y1:"9",x2:"23",y2:"9"}),React.createElement("line",{x1:"20",y1:"14",x2:"23",y2:"14"}),React.createElement("line",{x1:"1",y1:"9",x2:"4",y2:"9"}),React.createElement("line",{x1:"1",y1:"14",x2:"4",y2:"14"})),Activity:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("polyline",{points:"22 12 18 12 15 21 9 3 6 12 2 12"})),Clock:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("circle",{cx:"12",cy:"12",r:"10"}),React.createElement("polyline",{points:"12 6 12 12 16 14"})),Check:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"3",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("polyline",{points:"20 6 9 17 4 12"})),Play:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("polygon",{points:"5 3 19 12 5 21 5 3"})),Copy:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("rect",{x:"9",y:"9",width:"13",height:"13",rx:"2",ry:"2"}),React.createElement("path",{d:"M5 15H4a2 2 0 0 1-2-2V4a2 2 0 0 1 2-2h9a2 2 0 0 1 2 2v1"})),Alert:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("circle",{cx:"12",cy:"12",r:"10"}),React.createElement("line",{x1:"12",y1:"8",x2:"12",y2:"12"}),React.createElement("line",{x1:"12",y1:"16",x2:"12.01",y2:"16"})),Trash:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("polyline",{points:"3 6 5 6 21 6"}),React.createElement("path",{d:"M19 6v14a2 2 0 0 1-2 2H7a2 2 0 0 1-2-2V6m3 0V4a2 2 0 0 1 2-2h4a2 2 0 0 1 2 2v2"})),Layout:({size=18,className=""})=>React.createElement("svg",{width:size,height:size,viewBox:"0 0 24 24",fill:"none",stroke:"currentColor",strokeWidth:"2",strokeLinecap:"round",strokeLinejoin:"round",className},React.createElement("rect",{x:"3",y:"3",width:"18",height:"18",rx:"2",ry:"2"}),React.createElement("line",{x1:"3",y1:"9",x2:"21",y2:"9"}),React.createElement("line",{x1:"9",y1:"21",x2:"9",y2:"9"}))};const replacementsToText=(map)=>Object.entries(map||{}).map(([from,to])=>`${from} -> ${to}`).join("\n");const textToReplacements=(text)=>{const map={};text.split("\n").forEach((line)=>{const idx=line.indexOf("->");if(idx<0)
+return;const from=line.slice(0,idx).trim();if(from)
+map[from]=line.slice(idx+2).trim();});return map;};const LATENCY_LABELS={hotkey_to_first_audio:"Hotkey \u2192 first audio",release_to_first_text:"Release \u2192 first text",release_to_transcript:"Release \u2192 transcript",release_to_paste:"Release \u2192 paste",resample:"Resample",upload:"Upload",realtime_commit:"Realtime commit",segment:"VAD segment",transcribe:"Transcribe",refine:"Refine",clipboard:"Clipboard"};const formatMs=(ms)=>ms>=1e3?`${(ms / 1e3).toFixed(2)}s`:`${Math.round(ms)}ms`;const HISTORY_PAGE_SIZE=50;const root=ReactDOM.createRoot(document.getElementById("root"));root.render(React.createElement(App2,null));}catch(error){console.error("React Crash:",error);document.getElementById("root").innerHTML="<div style='color:red; padding:20px'>Critical UI Error: "+error.message+"</div>";}
\ No newline at end of file